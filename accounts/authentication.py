@@ -0,0 +1,127 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from job_portal.metrics import timed
+from job_portal.replicas import primary_reads, set_request_user
+
+from .models import EmployerProfile, User
+
+# Identities live in the IDENTITY_CACHE alias of CACHES, which every worker
+# must share so that saving a user (e.g. deactivating them) evicts the entry
+# everywhere; the timeout only bounds how long an entry is kept.
+IDENTITY_CACHE_TIMEOUT = 30
+# The User columns kept in the identity cache, in model field order as
+# Model.from_db expects; the rest load on first use.
+IDENTITY_FIELDS = ("is_superuser", "id", "email", "user_type", "is_active", "is_staff")
+
+USER_TYPE_CLAIM = "user_type"
+EMPLOYER_PROFILE_CLAIM = "employer_profile_id"
+
+
+def identity_cache_key(user_id):
+    return f"identity:{user_id}"
+
+
+def identity_cache():
+    return caches[settings.IDENTITY_CACHE]
+
+
+def invalidate_identity(*user_ids):
+    identity_cache().delete_many([identity_cache_key(user_id) for user_id in user_ids])
+
+
+def employer_profile_id(user):
+    """
+    Primary key of the user's EmployerProfile, or None. Users resolved by
+    CachedJWTAuthentication already carry it, so this is free on the hot path.
+    """
+    if not hasattr(user, "_employer_profile_id"):
+        user._employer_profile_id = (
+            EmployerProfile.objects.filter(user_id=user.pk).values_list("pk", flat=True).first()
+            if user.user_type == User.EMPLOYER else None
+        )
+    return user._employer_profile_id
+
+
+def get_identity(user_id):
+    """
+    The User for ``user_id``, built from the cache for IDENTITY_CACHE_TIMEOUT
+    seconds. Only IDENTITY_FIELDS are cached, not the password hash: the
+    user's ``_password_digest`` is the value access tokens are checked against.
+    """
+    key = identity_cache_key(user_id)
+    identity = identity_cache().get(key)
+    if identity is None:
+        # Cached for everyone, so never from a replica that may lag behind.
+        with primary_reads():
+            row = (
+                User.objects.filter(pk=user_id)
+                .values(*IDENTITY_FIELDS, "password", employer_profile_pk=F("employer_profile__pk"))
+                .first()
+            )
+        if row is None:
+            return None
+        identity = {
+            "fields": [row[name] for name in IDENTITY_FIELDS],
+            "employer_profile_id": row["employer_profile_pk"],
+            "password_digest": get_md5_hash_password(row["password"]),
+        }
+        identity_cache().set(key, identity, IDENTITY_CACHE_TIMEOUT)
+    user = User.from_db(DEFAULT_DB_ALIAS, IDENTITY_FIELDS, identity["fields"])
+    user._employer_profile_id = identity["employer_profile_id"]
+    user._password_digest = identity["password_digest"]
+    return user
+
+
+class PortalRefreshToken(RefreshToken):
+    """Refresh token whose access tokens also carry the user's type and employer profile."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[USER_TYPE_CLAIM] = user.user_type
+        token[EMPLOYER_PROFILE_CLAIM] = employer_profile_id(user)
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user through the identity cache
+    instead of a query per request. Saving the user drops the entry, so
+    password resets and deactivation apply at once in the saving process
+    and within IDENTITY_CACHE_TIMEOUT seconds everywhere else.
+    """
+
+    def authenticate(self, request):
+        with timed("auth"):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_identity(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != user._password_digest:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        if validated_token.get(EMPLOYER_PROFILE_CLAIM) is not None:
+            user._employer_profile_id = validated_token[EMPLOYER_PROFILE_CLAIM]
+        set_request_user(user.pk)
+        return user
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from job_portal.replicas import PROCESS_LOCAL_CACHES
+
+LOCAL_RATE_LIMIT_STORE = "accounts.throttling.LocalRateLimitStore"
+
+
+@register()
+def check_rate_limit_store(app_configs, **kwargs):
+    """Outside DEBUG, the per-process rate limit store lets N workers serve N times every limit."""
+    if settings.DEBUG or settings.RATE_LIMIT_STORE["BACKEND"] != LOCAL_RATE_LIMIT_STORE:
+        return []
+    return [
+        Warning(
+            "RATE_LIMIT_STORE counts requests per process, so each worker enforces the limits on its own.",
+            hint='Use "accounts.throttling.DatabaseRateLimitStore" or "accounts.throttling.RedisRateLimitStore" '
+                 'as the RATE_LIMIT_STORE backend when running more than one worker.',
+            id="accounts.W001",
+        )
+    ]
+
+
+@register()
+def check_identity_cache(app_configs, **kwargs):
+    """A per-process identity cache keeps honouring deactivated users in every worker but the one that saved them."""
+    if settings.DEBUG or settings.CACHES[settings.IDENTITY_CACHE]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"IDENTITY_CACHE ({settings.IDENTITY_CACHE!r}) is per process, so other workers only see "
+            "a user's deactivation or password change once their cached identity expires.",
+            hint="Point IDENTITY_CACHE at a CACHES alias shared by all workers.",
+            id="accounts.W002",
+        )
+    ]
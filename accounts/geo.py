@@ -0,0 +1,91 @@
+"""
+Offline geocoding of free-text locations, and the grid that indexes them.
+
+Locations are looked up in the bundled gazetteer (data/gazetteer.csv), so
+saving a job or profile never calls an external service. Coordinates are
+bucketed into GRID_CELL_DEGREES squares; a radius search first selects the
+few cells its circle touches through an index, then checks exact
+great-circle distances on those rows only.
+"""
+import csv
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GRID_CELL_DEGREES = 0.25
+GRID_ROWS = round(180 / GRID_CELL_DEGREES)
+GRID_COLUMNS = round(360 / GRID_CELL_DEGREES)
+
+
+def normalize_place(text):
+    """Lowercase ``text`` without accents, parenthesised notes and punctuation: "São Paulo (Hybrid)" -> "sao paulo"."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"\(.*?\)", " ", text.lower())
+    return " ".join(re.findall(r"\w+", text))
+
+
+@lru_cache(maxsize=None)
+def gazetteer():
+    """``{normalized name or alias: (latitude, longitude)}`` from the bundled CSV."""
+    places = {}
+    with open(GAZETTEER_PATH, encoding="utf-8", newline="") as handle:
+        rows = csv.DictReader(line for line in handle if not line.startswith("#"))
+        for row in rows:
+            point = (float(row["latitude"]), float(row["longitude"]))
+            for name in [row["name"], *row["aliases"].split("|")]:
+                if name.strip():
+                    places.setdefault(normalize_place(name), point)
+    return places
+
+
+def geocode(location):
+    """
+    ``(latitude, longitude)`` of a free-text location, or None when it is
+    not in the gazetteer (e.g. "Remote"). "Pune, Maharashtra" and
+    "Bangalore / Remote" match on their first known part.
+    """
+    places = gazetteer()
+    point = places.get(normalize_place(location or ""))
+    if point is None:
+        for part in re.split(r"[,/;|\-]", location or ""):
+            point = places.get(normalize_place(part))
+            if point is not None:
+                break
+    return point
+
+
+def grid_cell(latitude, longitude):
+    row = min(int((latitude + 90) // GRID_CELL_DEGREES), GRID_ROWS - 1)
+    column = int((longitude + 180) // GRID_CELL_DEGREES) % GRID_COLUMNS
+    return row * GRID_COLUMNS + column
+
+
+def cells_within(latitude, longitude, radius_km):
+    """Ids of every grid cell that intersects the circle of ``radius_km`` around the point."""
+    lat_span = radius_km / KM_PER_DEGREE
+    low, high = max(latitude - lat_span, -90.0), min(latitude + lat_span, 90.0)
+    # Longitude degrees shrink towards the poles; size the span for the widest row.
+    widest = math.cos(math.radians(min(max(abs(low), abs(high)), 89.9)))
+    lon_span = radius_km / (KM_PER_DEGREE * widest)
+    first_row, last_row = grid_cell(low, 0) // GRID_COLUMNS, grid_cell(high, 0) // GRID_COLUMNS
+    if lon_span >= 180:
+        columns = range(GRID_COLUMNS)
+    else:
+        first_column = int((longitude - lon_span + 180) // GRID_CELL_DEGREES)
+        last_column = int((longitude + lon_span + 180) // GRID_CELL_DEGREES)
+        columns = sorted({column % GRID_COLUMNS for column in range(first_column, last_column + 1)})
+    return [row * GRID_COLUMNS + column for row in range(first_row, last_row + 1) for column in columns]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
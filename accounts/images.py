@@ -0,0 +1,87 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .storage import is_content_addressed
+
+logger = logging.getLogger(__name__)
+
+# name -> bounding box; None keeps the original size (a WebP re-encode).
+IMAGE_VARIANTS = {
+    "thumb": (128, 128),
+    "medium": (512, 512),
+    "webp": None,
+}
+WEBP_QUALITY = 80
+
+
+def variant_name(name, variant):
+    root, _ = posixpath.splitext(name)
+    return f"{root}.{variant}.webp"
+
+
+def generate_variants(name):
+    """Write every missing variant of the stored image ``name``; returns the names written."""
+    from .storage import image_storage as storage
+
+    missing = {variant: size for variant, size in IMAGE_VARIANTS.items() if not storage.exists(variant_name(name, variant))}
+    if not missing:
+        return []
+    with storage.open(name) as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    written = []
+    for variant, size in missing.items():
+        resized = image.copy()
+        if size:
+            resized.thumbnail(size)
+        buffer = BytesIO()
+        resized.save(buffer, "WEBP", quality=WEBP_QUALITY)
+        written.append(storage.save_derived(variant_name(name, variant), ContentFile(buffer.getvalue())))
+    return written
+
+
+@lru_cache(maxsize=None)
+def _executor():
+    return ThreadPoolExecutor(max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variants")
+
+
+def _generate_logged(name):
+    try:
+        generate_variants(name)
+    except Exception:
+        logger.exception("Could not generate variants for %s", name)
+
+
+def schedule_variants(name):
+    """Generate variants for a newly stored image on the background pool (inline if it has no workers)."""
+    if settings.IMAGE_VARIANT_WORKERS:
+        _executor().submit(_generate_logged, name)
+    else:
+        _generate_logged(name)
+
+
+def variant_urls(field_file, request=None):
+    """
+    URLs of the variants of an image field value, derived from its name
+    without touching storage. Every content-addressed image gets all
+    IMAGE_VARIANTS when first stored (generate_image_variants fills any
+    gaps); legacy names have none until that command rehashes them.
+    """
+    if not field_file or not is_content_addressed(field_file.name):
+        return {}
+    storage = field_file.storage
+    urls = {}
+    for variant in IMAGE_VARIANTS:
+        url = storage.url(variant_name(field_file.name, variant))
+        urls[variant] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.otp_store import get_otp_store
+
+
+class Command(BaseCommand):
+    help = "Delete expired OTP codes and verification tokens from the configured OTP store."
+
+    def handle(self, *args, **options):
+        get_otp_store().clear_expired()
+        self.stdout.write(self.style.SUCCESS("Expired OTP entries cleared."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.throttling import get_rate_limit_store
+
+
+class Command(BaseCommand):
+    help = "Delete idle throttle keys from the configured rate limit store."
+
+    def handle(self, *args, **options):
+        get_rate_limit_store().clear_expired()
+        self.stdout.write(self.style.SUCCESS("Idle rate limit keys cleared."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.uploads import clear_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete chunked upload sessions that were abandoned before completion, along with their partial files."
+
+    def handle(self, *args, **options):
+        deleted = clear_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} stale upload session(s)."))
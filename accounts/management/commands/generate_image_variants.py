@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.images import generate_variants
+from accounts.models import EmployerProfile, User
+from accounts.storage import image_storage, is_content_addressed
+
+IMAGE_FIELDS = [(User, "profile_picture"), (EmployerProfile, "company_logo")]
+
+
+class Command(BaseCommand):
+    help = (
+        "Move legacy uploads to content-addressed names (dropping duplicates) and "
+        "generate any missing thumbnail/WebP variants on a worker pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=max(settings.IMAGE_VARIANT_WORKERS, 1))
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, field in IMAGE_FIELDS:
+            for name in model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True}).values_list(field, flat=True).distinct():
+                if not is_content_addressed(name):
+                    name = self.rehash(model, field, name)
+                if name:
+                    names.add(name)
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            written = sum(len(result) for result in pool.map(generate_variants, sorted(names)))
+        self.stdout.write(self.style.SUCCESS(f"{len(names)} images checked, {written} variants written."))
+
+    def rehash(self, model, field, name):
+        if not image_storage.exists(name):
+            self.stderr.write(f"Missing file {name}, skipped.")
+            return None
+        with image_storage.open(name) as content:
+            new_name = image_storage.save(name, content)
+        model.objects.filter(**{field: name}).update(**{field: new_name})
+        # The old copy can go once no row of either model points at it.
+        if not any(m.objects.filter(**{f: name}).exists() for m, f in IMAGE_FIELDS):
+            image_storage.delete(name)
+        return new_name
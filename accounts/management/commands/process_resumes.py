@@ -0,0 +1,29 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.resumes import process_pending_resumes
+
+
+class Command(BaseCommand):
+    help = "Extract text and skills from new or changed resumes on a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes; 0 extracts inline.")
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for new resumes.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when nothing is pending.")
+
+    def handle(self, *args, **options):
+        total = total_failed = 0
+        while True:
+            processed, failed = process_pending_resumes(options["batch_size"], options["workers"])
+            total += processed
+            total_failed += failed
+            if processed:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} resumes ({total_failed} failed)."))
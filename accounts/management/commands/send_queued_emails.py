@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import DEFAULT_BATCH_SIZE, drain_outbox, queue_depth
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails in batches. With --loop, keep polling the outbox as a worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for new emails.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = drain_outbox(options["batch_size"])
+            processed = stats["sent"] + stats["retried"] + stats["failed"]
+            if processed:
+                self.stdout.write(
+                    f"sent={stats['sent']} retried={stats['retried']} failed={stats['failed']} "
+                    f"send_seconds={stats['send_seconds']:.3f} queue_depth={queue_depth()}"
+                )
+            if not options["loop"]:
+                if processed == options["batch_size"]:
+                    continue  # drain everything that is due before exiting
+                break
+            if not processed:
+                time.sleep(options["interval"])
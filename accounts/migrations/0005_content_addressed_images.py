@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:36
+
+import accounts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employerprofile',
+            name='company_logo',
+            field=models.ImageField(blank=True, null=True, storage=accounts.storage.get_image_storage, upload_to='company_logos/'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=accounts.storage.get_image_storage, upload_to='profile_pics/'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:38
+
+import accounts.storage
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def queue_existing_resumes(apps, schema_editor):
+    JobSeekerProfile = apps.get_model('accounts', 'JobSeekerProfile')
+    JobSeekerProfile.objects.exclude(resume='').exclude(resume__isnull=True).update(resume_pending=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='resume_error',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='resume_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='resume_pending',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='resume_skills',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='resume_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='jobseekerprofile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=accounts.storage.get_resume_storage, upload_to='resumes/'),
+        ),
+        migrations.AddIndex(
+            model_name='jobseekerprofile',
+            index=models.Index(condition=models.Q(('resume_pending', True)), fields=['id'], name='profile_resume_pending_idx'),
+        ),
+        migrations.AddField(
+            model_name='resumeskill',
+            name='profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skill_tokens', to='accounts.jobseekerprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='resumeskill',
+            index=models.Index(fields=['token', 'profile'], name='resumeskill_token_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='resumeskill',
+            unique_together={('profile', 'token')},
+        ),
+        migrations.RunPython(queue_existing_resumes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:04
+
+from django.db import migrations, models
+
+from accounts.geo import geocode
+
+
+def locate_profiles(apps, schema_editor):
+    JobSeekerProfile = apps.get_model('accounts', 'JobSeekerProfile')
+    locations = JobSeekerProfile.objects.order_by().values_list('preferred_location', flat=True).distinct()
+    for location in locations:
+        point = geocode(location)
+        if point:
+            JobSeekerProfile.objects.filter(preferred_location=location).update(
+                preferred_latitude=point[0], preferred_longitude=point[1],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='preferred_latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='preferred_longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(locate_profiles, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,8 @@ from django.db import models
 from django.contrib.auth.models import (
     AbstractBaseUser, PermissionsMixin, BaseUserManager
 )
+from .geo import geocode
+from .storage import get_image_storage, get_resume_storage
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -50,7 +52,7 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     date_joined = models.DateTimeField(auto_now_add=True)
 
-    profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
+    profile_picture = models.ImageField(upload_to='profile_pics/', storage=get_image_storage, null=True, blank=True)
 
     objects = UserManager()
 
@@ -72,16 +74,71 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 class JobSeekerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="jobseeker_profile")
-    resume = models.FileField(upload_to="resumes/", null=True, blank=True)
+    resume = models.FileField(upload_to="resumes/", storage=get_resume_storage, null=True, blank=True)
     skills = models.TextField(blank=True)  # comma-separated list
     education = models.TextField(blank=True)
     experience = models.TextField(blank=True)
     expected_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     preferred_location = models.CharField(max_length=255, blank=True)
+    # Derived from preferred_location on save, see accounts.geo.
+    preferred_latitude = models.FloatField(null=True, blank=True, editable=False)
+    preferred_longitude = models.FloatField(null=True, blank=True, editable=False)
+
+    # Filled in by the process_resumes worker, see accounts.resumes.
+    resume_text = models.TextField(blank=True, editable=False)
+    resume_skills = models.TextField(blank=True, editable=False)  # comma-separated list
+    resume_hash = models.CharField(max_length=64, blank=True, editable=False)
+    resume_error = models.TextField(blank=True, editable=False)
+    resume_pending = models.BooleanField(default=False, editable=False)
+
+    _loaded_resume_name = None
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(resume_pending=True), name="profile_resume_pending_idx"),
+        ]
 
     def __str__(self):
         return f"JobSeekerProfile({self.user.email})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "resume" in field_names:
+            instance._loaded_resume_name = values[field_names.index("resume")] or None
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.resume and not self.resume._committed:
+            # Store the upload first: the content-addressed name tells whether it changed.
+            self.resume.save(self.resume.name, self.resume.file, save=False)
+        name = self.resume.name or None
+        if name != self._loaded_resume_name:
+            self.resume_pending = name is not None
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "resume_pending"}
+        if kwargs.get("update_fields") is None or "preferred_location" in kwargs["update_fields"]:
+            self.preferred_latitude, self.preferred_longitude = geocode(self.preferred_location) or (None, None)
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "preferred_latitude", "preferred_longitude"}
+        super().save(*args, **kwargs)
+        self._loaded_resume_name = name
+
+
+class ResumeSkill(models.Model):
+    """Searchable index of skills detected in a profile's resume."""
+    profile = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name="resume_skill_tokens")
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ["profile", "token"]
+        indexes = [
+            models.Index(fields=["token", "profile"], name="resumeskill_token_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.profile_id}"
+
 
 class EmployerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="employer_profile")
@@ -90,7 +147,92 @@ class EmployerProfile(models.Model):
     company_website = models.URLField(blank=True)
     company_size = models.CharField(max_length=100, blank=True)
     industry = models.CharField(max_length=100, blank=True)
-    company_logo = models.ImageField(upload_to="company_logos/", null=True, blank=True)
+    company_logo = models.ImageField(upload_to="company_logos/", storage=get_image_storage, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"EmployerProfile({self.user.email})"
+
+
+class OneTimeCode(models.Model):
+    """Backing table for accounts.otp_store.DatabaseOTPStore."""
+    key = models.CharField(max_length=255, unique=True)
+    value_hash = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.key
+
+
+class RateLimitBucket(models.Model):
+    """Backing table for accounts.throttling.DatabaseRateLimitStore."""
+    key = models.CharField(max_length=255, unique=True)
+    # GCRA theoretical arrival time, in Unix seconds.
+    tat = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return self.key
+
+
+class OutboundEmail(models.Model):
+    """Durable queue of emails, drained by the send_queued_emails command."""
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
+
+
+class UploadSession(models.Model):
+    """A resumable, chunked upload that is attached to a profile file field when completed."""
+    TARGET_RESUME = "resume"
+    TARGET_PROFILE_PICTURE = "profile_picture"
+    TARGET_COMPANY_LOGO = "company_logo"
+    TARGET_CHOICES = [
+        (TARGET_RESUME, "Resume"),
+        (TARGET_PROFILE_PICTURE, "Profile picture"),
+        (TARGET_COMPANY_LOGO, "Company logo"),
+    ]
+
+    STATUS_OPEN = "open"
+    STATUS_COMPLETED = "completed"
+    STATUS_CHOICES = [
+        (STATUS_OPEN, "Open"),
+        (STATUS_COMPLETED, "Completed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="upload_sessions")
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_OPEN)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.target} upload {self.id} ({self.received}/{self.size})"
@@ -0,0 +1,151 @@
+import hashlib
+import hmac
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import F
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+MAX_FAILED_ATTEMPTS = 5
+
+
+def _digest(value: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+class BaseOTPStore:
+    """
+    Stores short-lived secrets (OTP codes, verification tokens) shared by all
+    worker processes. Values are only ever checked, never read back.
+    """
+
+    def __init__(self, max_attempts=MAX_FAILED_ATTEMPTS, **options):
+        self.max_attempts = max_attempts
+
+    def set(self, key: str, value: str, timeout: int):
+        """Store ``value`` under ``key`` for ``timeout`` seconds, resetting failed attempts."""
+        raise NotImplementedError
+
+    def consume(self, key: str, value: str) -> bool:
+        """
+        Atomically check ``value`` against ``key`` and delete it on a match.
+        A mismatch counts as a failed attempt; after ``max_attempts`` failures
+        the key is discarded.
+        """
+        raise NotImplementedError
+
+    def clear_expired(self):
+        """Drop expired entries, for backends that do not expire them on their own."""
+
+
+class LocalOTPStore(BaseOTPStore):
+    """In-process store, for tests and single-process development only."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = [_digest(value), 0, time.monotonic() + timeout]
+
+    def consume(self, key, value):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                self._data.pop(key, None)
+                return False
+            if hmac.compare_digest(entry[0], _digest(value)):
+                del self._data[key]
+                return True
+            entry[1] += 1
+            if entry[1] >= self.max_attempts:
+                del self._data[key]
+            return False
+
+
+class DatabaseOTPStore(BaseOTPStore):
+    """Store backed by the OneTimeCode table; a match is consumed by a single DELETE."""
+
+    def set(self, key, value, timeout):
+        from .models import OneTimeCode
+
+        OneTimeCode.objects.bulk_create(
+            [OneTimeCode(key=key, value_hash=_digest(value), expires_at=timezone.now() + timedelta(seconds=timeout))],
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=["value_hash", "attempts", "expires_at"],
+        )
+
+    def consume(self, key, value):
+        from .models import OneTimeCode
+
+        deleted, _ = OneTimeCode.objects.filter(
+            key=key, value_hash=_digest(value), expires_at__gt=timezone.now()
+        ).delete()
+        if deleted:
+            return True
+        OneTimeCode.objects.filter(key=key).update(attempts=F("attempts") + 1)
+        OneTimeCode.objects.filter(key=key, attempts__gte=self.max_attempts).delete()
+        return False
+
+    def clear_expired(self):
+        from .models import OneTimeCode
+
+        OneTimeCode.objects.filter(expires_at__lte=timezone.now()).delete()
+
+
+class RedisOTPStore(BaseOTPStore):
+    """Store backed by Redis; check, delete and attempt counting run as one Lua script."""
+
+    CONSUME_SCRIPT = """
+    local stored = redis.call('GET', KEYS[1])
+    if not stored then
+        return 0
+    end
+    if stored == ARGV[1] then
+        redis.call('DEL', KEYS[1], KEYS[2])
+        return 1
+    end
+    local attempts = redis.call('INCR', KEYS[2])
+    redis.call('PEXPIRE', KEYS[2], redis.call('PTTL', KEYS[1]))
+    if attempts >= tonumber(ARGV[2]) then
+        redis.call('DEL', KEYS[1], KEYS[2])
+    end
+    return 0
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", **options):
+        import redis  # optional dependency, only needed for this backend
+
+        super().__init__(**options)
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(self.CONSUME_SCRIPT)
+
+    def set(self, key, value, timeout):
+        pipe = self._client.pipeline()
+        pipe.set(key, _digest(value), ex=timeout)
+        pipe.delete(f"{key}:attempts")
+        pipe.execute()
+
+    def consume(self, key, value):
+        return bool(self._consume(keys=[key, f"{key}:attempts"], args=[_digest(value), self.max_attempts]))
+
+
+@lru_cache(maxsize=None)
+def get_otp_store() -> BaseOTPStore:
+    config = settings.OTP_STORE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def _reset_otp_store(setting, **kwargs):
+    if setting == "OTP_STORE":
+        get_otp_store.cache_clear()
@@ -0,0 +1,81 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_SEND_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 30  # doubled after every failed attempt
+DEFAULT_BATCH_SIZE = 100
+
+
+def enqueue_email(subject, message, from_email, recipient_list):
+    """Queue an email for background delivery instead of sending it in the request."""
+    return OutboundEmail.objects.create(subject=subject, body=message, from_email=from_email, to=list(recipient_list))
+
+
+def queue_depth():
+    return OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING).count()
+
+
+def drain_outbox(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Send one batch of due emails over a single mail connection.
+
+    Rows are locked with SKIP LOCKED, so several workers can drain the queue
+    concurrently without sending anything twice. Returns a stats dict.
+    """
+    stats = {"sent": 0, "retried": 0, "failed": 0, "send_seconds": 0.0, "max_queue_seconds": 0.0}
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if not batch:
+            return stats
+
+        sent, failed = [], []
+        started = time.monotonic()
+        with get_connection(fail_silently=False) as connection:
+            for email in batch:
+                message = EmailMessage(email.subject, email.body, email.from_email, email.to, connection=connection)
+                try:
+                    # One message per call so a bad recipient cannot fail the batch;
+                    # the connection stays open across calls.
+                    connection.send_messages([message])
+                except Exception as exc:
+                    email.last_error = f"{type(exc).__name__}: {exc}"
+                    failed.append(email)
+                else:
+                    sent.append(email.pk)
+        stats["send_seconds"] = time.monotonic() - started
+
+        sent_at = timezone.now()
+        OutboundEmail.objects.filter(pk__in=sent).update(
+            status=OutboundEmail.STATUS_SENT, sent_at=sent_at, last_error=""
+        )
+        for email in failed:
+            email.attempts += 1
+            if email.attempts >= MAX_SEND_ATTEMPTS:
+                email.status = OutboundEmail.STATUS_FAILED
+                stats["failed"] += 1
+            else:
+                email.next_attempt_at = sent_at + timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (email.attempts - 1))
+                stats["retried"] += 1
+        OutboundEmail.objects.bulk_update(failed, ["attempts", "status", "next_attempt_at", "last_error"])
+
+    stats["sent"] = len(sent)
+    stats["max_queue_seconds"] = max((sent_at - email.created_at).total_seconds() for email in batch)
+    logger.info(
+        "outbox batch: sent=%d retried=%d failed=%d send_seconds=%.3f max_queue_seconds=%.1f",
+        stats["sent"], stats["retried"], stats["failed"], stats["send_seconds"], stats["max_queue_seconds"],
+    )
+    return stats
@@ -0,0 +1,13 @@
+from rest_framework import permissions
+
+from .models import User
+
+
+class IsEmployer(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.user_type == User.EMPLOYER
+
+
+class IsCandidate(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.user_type == User.CANDIDATE
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .images import variant_urls
 from .models import JobSeekerProfile, EmployerProfile
 
 class JobSeekerProfileSerializer(serializers.ModelSerializer):
@@ -27,9 +28,32 @@ class JobSeekerProfileSerializer(serializers.ModelSerializer):
 
 
 class EmployerProfileSerializer(serializers.ModelSerializer):
+    company_logo_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = EmployerProfile
         fields = [
             'company_name', 'company_description', 'company_website',
-            'company_size', 'industry', 'company_logo'
+            'company_size', 'industry', 'company_logo', 'company_logo_variants'
+        ]
+
+    def get_company_logo_variants(self, obj):
+        return variant_urls(obj.company_logo, self.context.get('request'))
+
+
+class CandidateSearchSerializer(serializers.ModelSerializer):
+    user_id = serializers.UUIDField(source='user.id', read_only=True)
+    email = serializers.EmailField(source='user.email', read_only=True)
+    full_name = serializers.CharField(source='user.full_name', read_only=True)
+    resume_skills = serializers.SerializerMethodField()
+    matched_skills = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = JobSeekerProfile
+        fields = [
+            'user_id', 'email', 'full_name', 'preferred_location',
+            'expected_salary', 'resume_skills', 'matched_skills'
         ]
+
+    def get_resume_skills(self, obj):
+        return obj.resume_skills.split(',') if obj.resume_skills else []
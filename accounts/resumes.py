@@ -0,0 +1,184 @@
+import hashlib
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from xml.etree import ElementTree
+
+from django.db import models, transaction
+
+from .models import JobSeekerProfile, ResumeSkill
+from .skills import normalize_skill
+
+SKILL_VOCABULARY_PATH = Path(__file__).resolve().parent / "data" / "skills.txt"
+MAX_RESUME_TEXT_LENGTH = 100_000
+MAX_SKILL_WORDS = 3
+DOCX_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ResumeExtractionError(Exception):
+    pass
+
+
+def _extract_pdf(data):
+    try:
+        from pypdf import PdfReader  # optional dependency, only needed for PDF resumes
+    except ImportError:
+        raise ResumeExtractionError("PDF extraction requires the 'pypdf' package.")
+    reader = PdfReader(BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx(data):
+    try:
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ResumeExtractionError(f"Unreadable DOCX file: {exc}")
+    paragraphs = []
+    for paragraph in root.iter(f"{DOCX_NAMESPACE}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{DOCX_NAMESPACE}t")))
+    return "\n".join(paragraphs)
+
+
+def _extract_txt(data):
+    return data.decode("utf-8", errors="replace")
+
+
+EXTRACTORS = {
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+    ".txt": _extract_txt,
+}
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", " ", text).strip()[:MAX_RESUME_TEXT_LENGTH]
+
+
+@lru_cache(maxsize=None)
+def skill_vocabulary():
+    with open(SKILL_VOCABULARY_PATH, encoding="utf-8") as handle:
+        entries = (line.strip() for line in handle)
+        return frozenset(normalize_skill(entry) for entry in entries if entry and not entry.startswith("#"))
+
+
+def detect_skills(text):
+    """Skills from the bundled vocabulary mentioned in ``text``, in order of first mention."""
+    vocabulary = skill_vocabulary()
+    words = normalize_skill(text).split()
+    found = []
+    for start in range(len(words)):
+        for size in range(1, MAX_SKILL_WORDS + 1):
+            phrase = " ".join(words[start:start + size])
+            if phrase in vocabulary and phrase not in found:
+                found.append(phrase)
+    return found
+
+
+def extract_resume(data, extension):
+    """
+    Turn raw resume bytes into ``(text, skills)``. Pure function of its
+    arguments so it can run in a worker process.
+    """
+    extractor = EXTRACTORS.get(extension.lower())
+    if extractor is None:
+        raise ResumeExtractionError(f"Unsupported resume type '{extension}'.")
+    text = normalize_text(extractor(data))
+    return text, detect_skills(text)
+
+
+def _extract_in_worker(job):
+    data, extension = job
+    try:
+        return extract_resume(data, extension), None
+    except Exception as exc:
+        return None, str(exc) or type(exc).__name__
+
+
+def process_pending_resumes(batch_size=50, workers=None):
+    """
+    Extract text and skills for one batch of profiles whose resume changed.
+
+    Rows are locked with SKIP LOCKED, so several workers never extract the
+    same profile. Files whose content hash matches the last processed one
+    are skipped. Extraction runs on a process pool; ``workers=0`` runs it
+    inline. Returns ``(processed, failed)``.
+    """
+    with transaction.atomic():
+        batch = list(
+            JobSeekerProfile.objects.select_for_update(skip_locked=True)
+            .filter(resume_pending=True).order_by("pk")[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+
+        jobs, to_extract, unreadable = [], [], []
+        for profile in batch:
+            profile.resume_error = ""
+            try:
+                with profile.resume.open("rb") as handle:
+                    data = handle.read()
+            except OSError as exc:
+                # E.g. the file is missing from storage; recorded like an
+                # extraction failure so one bad row cannot stall the queue.
+                profile.resume_text, profile.resume_skills, profile.resume_hash = "", "", ""
+                profile.resume_error = f"Could not read the resume: {exc}"
+                unreadable.append(profile)
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if digest == profile.resume_hash:
+                continue
+            profile.resume_hash = digest
+            jobs.append((data, Path(profile.resume.name).suffix))
+            to_extract.append(profile)
+
+        if workers == 0 or len(jobs) <= 1:
+            results = map(_extract_in_worker, jobs)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_extract_in_worker, jobs))
+
+        failed = len(unreadable)
+        for profile, (result, error) in zip(to_extract, results):
+            if error:
+                failed += 1
+                profile.resume_text, profile.resume_skills, profile.resume_error = "", "", error
+            else:
+                profile.resume_text, skills = result
+                profile.resume_skills = ",".join(skills)
+
+        # Only a profile still holding the file that was read leaves the
+        # queue; one whose resume was replaced meanwhile stays pending.
+        done = set()
+        for profile in batch:
+            updated = JobSeekerProfile.objects.filter(pk=profile.pk, resume=profile.resume.name).update(
+                resume_text=profile.resume_text, resume_skills=profile.resume_skills, resume_hash=profile.resume_hash,
+                resume_error=profile.resume_error, resume_pending=False,
+            )
+            if updated:
+                done.add(profile.pk)
+        reindexed = [profile for profile in to_extract + unreadable if profile.pk in done]
+        ResumeSkill.objects.filter(profile__in=reindexed).delete()
+        ResumeSkill.objects.bulk_create([
+            ResumeSkill(profile=profile, token=token)
+            for profile in reindexed
+            for token in profile.resume_skills.split(",") if token
+        ])
+    return len(batch), failed
+
+
+def search_candidates(skills, queryset=None):
+    """
+    Profiles whose resume mentions any of ``skills``, annotated with
+    ``matched_skills`` and ordered by it.
+    """
+    tokens = [normalize_skill(skill) for skill in skills if normalize_skill(skill)]
+    queryset = queryset if queryset is not None else JobSeekerProfile.objects.all()
+    return (
+        queryset.filter(resume_skill_tokens__token__in=tokens)
+        .annotate(matched_skills=models.Count("resume_skill_tokens"))
+        .order_by("-matched_skills", "pk")
+    )
@@ -1,11 +1,13 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
-from django.core.cache import cache
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.urls import reverse
-from .models import JobSeekerProfile, EmployerProfile
+from .models import JobSeekerProfile, EmployerProfile, UploadSession
 from .profile_serializers import JobSeekerProfileSerializer, EmployerProfileSerializer
+from .authentication import PortalRefreshToken
+from .images import variant_urls
+from .services import consume_verification_token
+from .uploads import UPLOAD_CHUNK_SIZE, UPLOAD_EXTENSIONS, UPLOAD_SIZE_LIMITS, target_instance
 
 User = get_user_model()
 
@@ -36,10 +38,7 @@ class SignupSerializer(serializers.ModelSerializer):
         token = attrs.get("verification_token")
         email = attrs.get("email")
 
-        cache_key = f"verified:register:{token}"
-        cached_email = cache.get(cache_key)
-
-        if not cached_email or cached_email != email:
+        if not consume_verification_token(token, email, "register"):
             raise ValidationError({"verification_token": "Invalid or expired token."})
 
         return attrs
@@ -78,7 +77,7 @@ class LoginSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         user = validated_data["user"]
-        refresh = RefreshToken.for_user(user)
+        refresh = PortalRefreshToken.for_user(user)
         return {
             "user": {
                 "id": str(user.id),
@@ -104,10 +103,7 @@ class ResetPasswordSerializer(serializers.Serializer):
         email = attrs.get("email")
         token = attrs.get("verification_token")
 
-        cache_key = f"verified:reset:{token}"
-        cached_email = cache.get(cache_key)
-
-        if not cached_email or cached_email != email:
+        if not consume_verification_token(token, email, "reset"):
             raise serializers.ValidationError({"verification_token": "Invalid or expired token."})
 
         return attrs
@@ -129,30 +125,38 @@ class ResetPasswordSerializer(serializers.Serializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     user_type_display = serializers.CharField(source="get_user_type_display", read_only=True)
     profile_picture = serializers.ImageField(required=False, allow_null=True)
+    profile_picture_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = (
             "id", "email", "first_name", "last_name",
             "phone_number", "user_type", "user_type_display",
-            "date_joined", "profile_picture"
+            "date_joined", "profile_picture", "profile_picture_variants"
         )
         read_only_fields = ("id", "email", "date_joined", "user_type_display")
 
+    def get_profile_picture_variants(self, obj):
+        return variant_urls(obj.profile_picture, self.context.get("request"))
+
 class FullProfileSerializer(serializers.ModelSerializer):
     profile = serializers.SerializerMethodField()
     user_type_display = serializers.CharField(source="get_user_type_display", read_only=True)
     profile_picture = serializers.ImageField(required=False, allow_null=True)
+    profile_picture_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = (
             "id", "email", "first_name", "last_name", "phone_number",
-            "user_type", "user_type_display", "profile_picture", "date_joined",
-            "profile"
+            "user_type", "user_type_display", "profile_picture", "profile_picture_variants",
+            "date_joined", "profile"
         )
         read_only_fields = ("id", "email", "date_joined", "user_type_display")
 
+    def get_profile_picture_variants(self, obj):
+        return variant_urls(obj.profile_picture, self.context.get("request"))
+
     def get_profile(self, obj):
         if obj.user_type == User.CANDIDATE and hasattr(obj, "jobseeker_profile"):
             return JobSeekerProfileSerializer(obj.jobseeker_profile).data
@@ -179,3 +183,30 @@ class FullProfileSerializer(serializers.ModelSerializer):
             serializer.save()
 
         return instance
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ("id", "target", "filename", "size", "received", "status", "chunk_size", "created_at")
+        read_only_fields = ("id", "received", "status", "created_at")
+
+    def get_chunk_size(self, obj):
+        return UPLOAD_CHUNK_SIZE
+
+    def validate_filename(self, value):
+        return value.replace("\\", "/").rsplit("/", 1)[-1]
+
+    def validate(self, data):
+        target, size = data["target"], data["size"]
+        limit = UPLOAD_SIZE_LIMITS[target]
+        if size <= 0 or size > limit:
+            raise ValidationError({"size": f"Size must be between 1 and {limit} bytes."})
+        extension = "." + data["filename"].rsplit(".", 1)[-1].lower() if "." in data["filename"] else ""
+        if extension not in UPLOAD_EXTENSIONS[target]:
+            raise ValidationError({"filename": f"Allowed extensions: {', '.join(sorted(UPLOAD_EXTENSIONS[target]))}."})
+        if target_instance(self.context["request"].user, target) is None:
+            raise ValidationError({"target": "This account cannot hold that file."})
+        return data
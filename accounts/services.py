@@ -1,34 +1,41 @@
-from django.core.cache import cache
+import uuid
 from django.conf import settings
-from django.core.mail import send_mail
-from datetime import timedelta
+from .otp_store import get_otp_store
+from .outbox import enqueue_email
 from .utils import generate_otp
 
 OTP_EXPIRE_SECONDS = 300  # 5 minutes
+VERIFICATION_TOKEN_EXPIRE_SECONDS = 600  # 10 minutes
 
 def send_otp_email(email: str, purpose: str):
     """
-    Generate and send OTP to email.
+    Generate an OTP and queue the email carrying it.
     Purpose: 'register' or 'reset'
     """
     otp = generate_otp()
-    cache_key = f"otp:{purpose}:{email}"
-    cache.set(cache_key, otp, OTP_EXPIRE_SECONDS)
+    get_otp_store().set(f"otp:{purpose}:{email}", otp, OTP_EXPIRE_SECONDS)
 
     subject = f"Your {purpose.capitalize()} OTP Code"
     message = f"Your OTP code is: {otp}. It is valid for 5 minutes."
     from_email = settings.DEFAULT_FROM_EMAIL
 
-    send_mail(subject, message, from_email, [email])
+    enqueue_email(subject, message, from_email, [email])
 
     return otp  # for debugging/testing
 
 
 def verify_otp(email: str, otp: str, purpose: str) -> bool:
-    """Check OTP validity."""
-    cache_key = f"otp:{purpose}:{email}"
-    cached_otp = cache.get(cache_key)
-    if cached_otp and cached_otp == otp:
-        cache.delete(cache_key)  # prevent reuse
-        return True
-    return False
+    """Check and consume an OTP; a used or wrong code can never match again."""
+    return get_otp_store().consume(f"otp:{purpose}:{email}", otp)
+
+
+def issue_verification_token(email: str, purpose: str) -> str:
+    """Issue a short-lived token proving `email` passed OTP verification."""
+    token = str(uuid.uuid4())
+    get_otp_store().set(f"verified:{purpose}:{token}", email, VERIFICATION_TOKEN_EXPIRE_SECONDS)
+    return token
+
+
+def consume_verification_token(token: str, email: str, purpose: str) -> bool:
+    """Check and consume a verification token issued for `email`."""
+    return get_otp_store().consume(f"verified:{purpose}:{token}", email)
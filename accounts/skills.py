@@ -0,0 +1,24 @@
+import re
+
+# Keeps skill spellings such as "c++", "c#", "node.js" and "asp.net" intact.
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def skill_words(text):
+    """Lowercase words of ``text`` the way skills are matched, e.g. "Node.js." -> ["node.js"]."""
+    return [word.rstrip(".") for word in TOKEN_RE.findall(text.lower())]
+
+
+def normalize_skill(skill):
+    """Normalise a skill phrase the same way job text is tokenised."""
+    return " ".join(word for word in skill_words(skill) if word)
+
+
+def parse_skills(skills):
+    """Split a comma-separated skills string into unique normalised tokens."""
+    tokens = []
+    for skill in skills.split(","):
+        token = normalize_skill(skill)
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
@@ -0,0 +1,64 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+def is_content_addressed(name):
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    return len(stem) == 64 and all(c in "0123456789abcdef" for c in stem)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file under the SHA-256 of its bytes, e.g.
+    ``profile_pics/3f/3fa9...c1.png``; uploading identical bytes again
+    reuses the existing file instead of writing a copy.
+    """
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+
+        extension = os.path.splitext(name)[1].lower()
+        name = posixpath.join(posixpath.dirname(name), digest[:2], f"{digest}{extension}")
+        if not self.exists(name):
+            name = super().save(name, content, max_length=max_length)
+            self.file_stored(name)
+        return name
+
+    def file_stored(self, name):
+        """Hook called once per distinct file, right after its first write."""
+
+    def save_derived(self, name, content):
+        """Save a file derived from a stored one (e.g. a thumbnail) under the exact name given."""
+        if self.exists(name):
+            return name
+        return super().save(name, content)
+
+
+class ImageStorage(ContentAddressedStorage):
+    """Content-addressed storage that also builds thumbnail/WebP variants of new images."""
+
+    def file_stored(self, name):
+        from .images import schedule_variants
+
+        schedule_variants(name)
+
+
+image_storage = ImageStorage()
+resume_storage = ContentAddressedStorage()
+
+
+def get_image_storage():
+    return image_storage
+
+
+def get_resume_storage():
+    return resume_storage
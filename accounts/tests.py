@@ -1,3 +1,557 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import employer_profile_id, get_identity, identity_cache, identity_cache_key
+from .models import User, EmployerProfile, JobSeekerProfile, OneTimeCode, OutboundEmail, RateLimitBucket, ResumeSkill, UploadSession
+from .services import issue_verification_token
+from .outbox import MAX_SEND_ATTEMPTS, drain_outbox, enqueue_email, queue_depth
+from .checks import check_identity_cache, check_rate_limit_store
+from .otp_store import DatabaseOTPStore, LocalOTPStore
+from .images import variant_name, variant_urls
+from . import resumes
+from .resumes import extract_resume, process_pending_resumes
+from .storage import image_storage
+from .throttling import DatabaseRateLimitStore, LocalRateLimitStore, get_rate_limit_store
+from .uploads import UPLOAD_SIZE_LIMITS, part_path
+
+
+class ProfileQueryCountTests(TestCase):
+    def setUp(self):
+        get_rate_limit_store.cache_clear()
+        self.candidate = User.objects.create_user(email="candidate@example.com", password="pass1234")
+        JobSeekerProfile.objects.create(user=self.candidate, skills="python,django")
+        self.employer = User.objects.create_user(email="employer@example.com", password="pass1234", user_type=User.EMPLOYER)
+        EmployerProfile.objects.create(user=self.employer, company_name="Acme")
+        self.client = APIClient()
+        # A fresh instance, as the authentication backend would load it.
+        self.client.force_authenticate(User.objects.get(pk=self.candidate.pk))
+
+    def test_own_profile(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.data["profile"]["skills"], ["python", "django"])
+
+    def test_public_profiles(self):
+        for user in (self.candidate, self.employer):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse("user-profile-detail", kwargs={"id": user.id}))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("profile", response.data)
+            self.assertEqual(len(ctx.captured_queries), 1)
+
+
+class OTPStoreContract:
+    """Behaviour every OTP store backend must provide."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.make_store()
+
+    def test_consume_matches_once(self):
+        self.store.set("otp:register:a@example.com", "123456", 60)
+        self.assertTrue(self.store.consume("otp:register:a@example.com", "123456"))
+        self.assertFalse(self.store.consume("otp:register:a@example.com", "123456"))
+
+    def test_wrong_value_does_not_consume(self):
+        self.store.set("otp:register:a@example.com", "123456", 60)
+        self.assertFalse(self.store.consume("otp:register:a@example.com", "000000"))
+        self.assertTrue(self.store.consume("otp:register:a@example.com", "123456"))
+
+    def test_too_many_failures_discard_the_code(self):
+        self.store.set("otp:register:a@example.com", "123456", 60)
+        for _ in range(self.store.max_attempts):
+            self.assertFalse(self.store.consume("otp:register:a@example.com", "000000"))
+        self.assertFalse(self.store.consume("otp:register:a@example.com", "123456"))
+
+    def test_set_resets_attempts(self):
+        self.store.set("otp:register:a@example.com", "123456", 60)
+        for _ in range(self.store.max_attempts - 1):
+            self.store.consume("otp:register:a@example.com", "000000")
+        self.store.set("otp:register:a@example.com", "654321", 60)
+        self.store.consume("otp:register:a@example.com", "000000")
+        self.assertTrue(self.store.consume("otp:register:a@example.com", "654321"))
+
+    def test_expired_value_never_matches(self):
+        self.store.set("otp:register:a@example.com", "123456", 0)
+        self.assertFalse(self.store.consume("otp:register:a@example.com", "123456"))
+
+
+class LocalOTPStoreTests(OTPStoreContract, TestCase):
+    def make_store(self):
+        return LocalOTPStore()
+
+
+class DatabaseOTPStoreTests(OTPStoreContract, TestCase):
+    def make_store(self):
+        return DatabaseOTPStore()
+
+    def test_clear_expired(self):
+        self.store.set("otp:register:a@example.com", "123456", 0)
+        self.store.set("otp:register:b@example.com", "123456", 60)
+        self.store.clear_expired()
+        self.assertEqual(list(OneTimeCode.objects.values_list("key", flat=True)), ["otp:register:b@example.com"])
+
+
+@override_settings(OTP_STORE={"BACKEND": "accounts.otp_store.LocalOTPStore"})
+class SignupFlowTests(TestCase):
+    def setUp(self):
+        get_rate_limit_store.cache_clear()
+        self.client = APIClient()
+
+    def request_otp(self, email, purpose):
+        with mock.patch("accounts.services.generate_otp", return_value="246810"):
+            response = self.client.post(reverse("request-otp"), {"email": email, "purpose": purpose})
+        self.assertEqual(response.status_code, 200)
+        return "246810"
+
+    def test_signup_with_verified_email(self):
+        otp = self.request_otp("new@example.com", "register")
+        response = self.client.post(reverse("verify-otp"), {"email": "new@example.com", "purpose": "register", "otp": otp})
+        self.assertEqual(response.status_code, 200)
+        token = response.data["verification_token"]
+
+        payload = {"email": "new@example.com", "password": "secret123", "verification_token": token}
+        self.assertEqual(self.client.post(reverse("signup"), payload).status_code, 201)
+        self.assertTrue(JobSeekerProfile.objects.filter(user__email="new@example.com").exists())
+
+        # The token is single-use.
+        payload["email"] = "other@example.com"
+        self.assertEqual(self.client.post(reverse("signup"), payload).status_code, 400)
+
+    def test_otp_cannot_be_replayed(self):
+        otp = self.request_otp("new@example.com", "register")
+        data = {"email": "new@example.com", "purpose": "register", "otp": otp}
+        self.assertEqual(self.client.post(reverse("verify-otp"), data).status_code, 200)
+        self.assertEqual(self.client.post(reverse("verify-otp"), data).status_code, 400)
+
+
+@override_settings(OTP_STORE={"BACKEND": "accounts.otp_store.LocalOTPStore"})
+class TokenIdentityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_rate_limit_store.cache_clear()
+        self.employer = User.objects.create_user(email="employer@example.com", password="pass1234", user_type=User.EMPLOYER)
+        self.employer_profile = EmployerProfile.objects.create(user=self.employer, company_name="Acme")
+        response = APIClient().post(reverse("login"), {"email": "employer@example.com", "password": "pass1234"})
+        self.access = AccessToken(response.data["access"])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_claims_and_cached_identity(self):
+        self.assertEqual(self.access["user_type"], User.EMPLOYER)
+        self.assertEqual(self.access["employer_profile_id"], self.employer_profile.pk)
+
+        self.assertEqual(self.client.get(reverse("job-list")).status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(reverse("job-list")).status_code, 200)
+        self.assertFalse([query for query in ctx.captured_queries if "accounts_user" in query["sql"]])
+
+    def test_cached_identity_leaves_out_the_password_hash(self):
+        self.assertEqual(self.client.get(reverse("profile")).status_code, 200)
+        cached = identity_cache().get(identity_cache_key(self.employer.pk))
+        self.assertNotIn(self.employer.password, repr(cached))
+        user = get_identity(self.employer.pk)
+        self.assertEqual(user.email, "employer@example.com")
+        self.assertEqual(employer_profile_id(user), self.employer_profile.pk)
+        self.assertEqual(user.get_deferred_fields(), {"password", "last_login", "first_name", "last_name",
+                                                      "phone_number", "date_joined", "profile_picture"})
+
+    def test_deactivation_invalidates_identity(self):
+        self.assertEqual(self.client.get(reverse("profile")).status_code, 200)
+        self.employer.is_active = False
+        self.employer.save()
+        self.assertEqual(self.client.get(reverse("profile")).status_code, 401)
+
+    def test_password_reset_invalidates_identity(self):
+        self.assertEqual(self.client.get(reverse("profile")).status_code, 200)
+        self.assertIsNotNone(identity_cache().get(identity_cache_key(self.employer.pk)))
+
+        payload = {
+            "email": "employer@example.com",
+            "verification_token": issue_verification_token("employer@example.com", "reset"),
+            "new_password": "changed123",
+        }
+        self.assertEqual(APIClient().post(reverse("reset-password"), payload).status_code, 200)
+        self.assertIsNone(identity_cache().get(identity_cache_key(self.employer.pk)))
+
+    def test_per_process_identity_cache_is_flagged_outside_debug(self):
+        self.assertEqual(check_identity_cache(None), [])
+        with self.settings(DEBUG=False, IDENTITY_CACHE="default"):
+            self.assertEqual([warning.id for warning in check_identity_cache(None)], ["accounts.W002"])
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        get_rate_limit_store.cache_clear()
+
+    def test_token_bucket_store(self):
+        for store_class in (LocalRateLimitStore, DatabaseRateLimitStore):
+            with self.subTest(store_class.__name__):
+                self.check_token_bucket(store_class)
+
+    def check_token_bucket(self, store_class):
+        now = [1000.0]
+        store = store_class(timer=lambda: now[0])
+        self.assertEqual([store.hit("k", 5, 60) for _ in range(5)], [0] * 5)
+        self.assertAlmostEqual(store.hit("k", 5, 60), 12)
+        now[0] += 6
+        self.assertAlmostEqual(store.hit("k", 5, 60), 6)
+        now[0] += 6
+        self.assertEqual(store.hit("k", 5, 60), 0)
+        self.assertEqual(store.hit("other", 5, 60), 0)
+
+    def test_database_store_clears_idle_keys(self):
+        now = [1000.0]
+        store = DatabaseRateLimitStore(timer=lambda: now[0])
+        store.hit("idle", 60, 60)
+        now[0] += 30
+        store.hit("busy", 1, 60)
+        store.clear_expired()
+        self.assertEqual(list(RateLimitBucket.objects.values_list("key", flat=True)), ["busy"])
+
+    @override_settings(RATE_LIMIT_STORE={"BACKEND": "accounts.throttling.LocalRateLimitStore"})
+    def test_scoped_throttle_reports_retry_after(self):
+        client = APIClient()
+        for index in range(5):
+            response = client.post(reverse("request-otp"), {"email": f"user{index}@example.com", "purpose": "register"})
+            self.assertEqual(response.status_code, 200)
+        response = client.post(reverse("request-otp"), {"email": "late@example.com", "purpose": "register"})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response["Retry-After"], {"11", "12"})
+
+    def test_per_process_store_is_flagged_outside_debug(self):
+        with self.settings(DEBUG=False):
+            self.assertEqual([warning.id for warning in check_rate_limit_store(None)], ["accounts.W001"])
+        with self.settings(DEBUG=False, RATE_LIMIT_STORE={"BACKEND": "accounts.throttling.RedisRateLimitStore"}):
+            self.assertEqual(check_rate_limit_store(None), [])
+
+
+class EmailOutboxTests(TestCase):
+    def test_request_otp_only_enqueues(self):
+        response = APIClient().post(reverse("request-otp"), {"email": "a@example.com", "purpose": "register"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(queue_depth(), 1)
+
+        call_command("send_queued_emails", stdout=mock.MagicMock())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["a@example.com"])
+        self.assertEqual(queue_depth(), 0)
+
+    def test_batch_reuses_one_connection(self):
+        for index in range(3):
+            enqueue_email("Hi", "Body", "no-reply@example.com", [f"user{index}@example.com"])
+        with mock.patch("accounts.outbox.get_connection", wraps=mail.get_connection) as get_connection:
+            stats = drain_outbox()
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(stats["sent"], 3)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_failures_back_off_then_give_up(self):
+        email = enqueue_email("Hi", "Body", "no-reply@example.com", ["a@example.com"])
+        with mock.patch.object(mail.get_connection().__class__, "send_messages", side_effect=OSError("relay down")):
+            self.assertEqual(drain_outbox()["retried"], 1)
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, 1)
+            self.assertIn("relay down", email.last_error)
+            # Not due again until the backoff expires.
+            self.assertEqual(drain_outbox()["retried"], 0)
+
+            for _ in range(MAX_SEND_ATTEMPTS - 1):
+                OutboundEmail.objects.update(next_attempt_at=email.created_at)
+                drain_outbox()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+        self.assertEqual(queue_depth(), 0)
+
+
+class TemporaryMediaMixin:
+    def setUp(self):
+        super().setUp()
+        get_rate_limit_store.cache_clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.settings_override = self.settings(MEDIA_ROOT=media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+
+class ContentAddressedImageTests(TemporaryMediaMixin, TestCase):
+
+    def image(self, name="avatar.png", color="red"):
+        buffer = BytesIO()
+        Image.new("RGB", (800, 600), color).save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def upload_picture(self, user, image):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.patch(reverse("profile"), {"profile_picture": image}, format="multipart")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_identical_uploads_share_one_file_with_variants(self):
+        first = User.objects.create_user(email="a@example.com", password="pass1234")
+        second = User.objects.create_user(email="b@example.com", password="pass1234")
+        response = self.upload_picture(first, self.image("one.png"))
+        self.upload_picture(second, self.image("two.png"))
+        first.refresh_from_db()
+        second.refresh_from_db()
+
+        self.assertEqual(first.profile_picture.name, second.profile_picture.name)
+        directory = first.profile_picture.name.rsplit("/", 1)[0]
+        self.assertEqual(len(image_storage.listdir(directory)[1]), 1 + 3)  # original + variants
+
+        variants = response.data["profile_picture_variants"]
+        self.assertEqual(set(variants), {"thumb", "medium", "webp"})
+        with image_storage.open(variant_name(first.profile_picture.name, "thumb")) as thumb:
+            self.assertEqual(Image.open(thumb).size, (128, 96))
+
+    def test_variant_urls_do_not_touch_storage(self):
+        user = User.objects.create_user(email="a@example.com", password="pass1234")
+        self.upload_picture(user, self.image())
+        user.refresh_from_db()
+        with mock.patch.object(type(image_storage), "exists") as exists:
+            urls = variant_urls(user.profile_picture)
+        exists.assert_not_called()
+        self.assertEqual(urls["thumb"], image_storage.url(variant_name(user.profile_picture.name, "thumb")))
+
+        User.objects.filter(pk=user.pk).update(profile_picture="profile_pics/legacy.png")
+        user.refresh_from_db()
+        self.assertEqual(variant_urls(user.profile_picture), {})
+
+    def test_different_images_are_stored_separately(self):
+        first = User.objects.create_user(email="a@example.com", password="pass1234")
+        second = User.objects.create_user(email="b@example.com", password="pass1234")
+        self.upload_picture(first, self.image(color="red"))
+        self.upload_picture(second, self.image(color="blue"))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertNotEqual(first.profile_picture.name, second.profile_picture.name)
+
+    def test_legacy_uploads_are_rehashed(self):
+        legacy = FileSystemStorage()
+        content = self.image().read()
+        names = [legacy.save(f"profile_pics/legacy_{index}.png", SimpleUploadedFile("x.png", content)) for index in range(2)]
+        users = [User.objects.create_user(email=f"u{index}@example.com", password="pass1234") for index in range(2)]
+        for user, name in zip(users, names):
+            User.objects.filter(pk=user.pk).update(profile_picture=name)
+
+        call_command("generate_image_variants", stdout=mock.MagicMock())
+        stored = set(User.objects.filter(pk__in=[u.pk for u in users]).values_list("profile_picture", flat=True))
+        self.assertEqual(len(stored), 1)
+        self.assertFalse(any(legacy.exists(name) for name in names))
+        self.assertTrue(image_storage.exists(variant_name(stored.pop(), "webp")))
+
+
+def make_docx(*paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+    return buffer.getvalue()
+
+
+class ResumeExtractionTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="candidate@example.com", password="pass1234")
+        self.profile = JobSeekerProfile.objects.create(user=self.user)
+
+    def upload(self, name, content):
+        self.profile.resume = SimpleUploadedFile(name, content)
+        self.profile.save()
+
+    def test_extract_formats(self):
+        self.assertEqual(
+            extract_resume(make_docx("Senior engineer", "Skills: Python, React Native, C++"), ".docx"),
+            ("Senior engineer Skills: Python, React Native, C++", ["python", "react", "react native", "c++"]),
+        )
+        self.assertEqual(extract_resume(b"Go-getter who likes Django\n\n", ".TXT")[1], ["django"])
+
+    def test_pending_resume_is_processed_once_per_content(self):
+        self.upload("cv.txt", b"Built APIs with Django and PostgreSQL on AWS.")
+        self.assertTrue(self.profile.resume_pending)
+        self.assertEqual(process_pending_resumes(workers=0), (1, 0))
+
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.resume_pending)
+        self.assertEqual(self.profile.resume_skills, "django,postgresql,aws")
+        self.assertEqual(len(self.profile.resume_hash), 64)
+
+        # Same bytes under a new file name: nothing to reprocess.
+        self.upload("cv-copy.txt", b"Built APIs with Django and PostgreSQL on AWS.")
+        self.assertFalse(self.profile.resume_pending)
+        # Editing other fields does not queue the resume either.
+        self.profile.skills = "python"
+        self.profile.save()
+        self.assertFalse(self.profile.resume_pending)
+
+        self.upload("cv.txt", b"Now doing Kubernetes.")
+        self.assertTrue(self.profile.resume_pending)
+        call_command("process_resumes", "--workers", "0", stdout=mock.MagicMock())
+        self.assertEqual(list(ResumeSkill.objects.values_list("token", flat=True)), ["kubernetes"])
+
+    def test_unsupported_files_record_an_error(self):
+        self.upload("cv.odt", b"whatever")
+        self.assertEqual(process_pending_resumes(workers=0), (1, 1))
+        self.profile.refresh_from_db()
+        self.assertIn("Unsupported", self.profile.resume_error)
+        self.assertFalse(self.profile.resume_pending)
+
+    def test_resume_replaced_during_extraction_stays_pending(self):
+        self.upload("cv.txt", b"Python")
+        real_extract = resumes._extract_in_worker
+
+        def extract_while_replaced(job):
+            JobSeekerProfile.objects.filter(pk=self.profile.pk).update(resume="resumes/newer.txt")
+            return real_extract(job)
+
+        with mock.patch("accounts.resumes._extract_in_worker", extract_while_replaced):
+            self.assertEqual(process_pending_resumes(workers=0), (1, 0))
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.resume_pending)
+        self.assertEqual(self.profile.resume_skills, "")
+        self.assertFalse(ResumeSkill.objects.exists())
+
+    def test_missing_file_records_an_error_and_the_batch_goes_on(self):
+        other = JobSeekerProfile.objects.create(
+            user=User.objects.create_user(email="other@example.com", password="pass1234")
+        )
+        self.upload("cv.txt", b"Python and Docker")
+        other.resume = SimpleUploadedFile("cv.txt", b"Django")
+        other.save()
+        self.profile.resume.storage.delete(self.profile.resume.name)
+
+        self.assertEqual(process_pending_resumes(workers=0), (2, 1))
+        self.profile.refresh_from_db()
+        other.refresh_from_db()
+        self.assertFalse(self.profile.resume_pending)
+        self.assertIn("Could not read", self.profile.resume_error)
+        self.assertEqual(other.resume_skills, "django")
+        self.assertEqual(process_pending_resumes(workers=0), (0, 0))
+
+    def test_employers_search_resume_skills(self):
+        other = JobSeekerProfile.objects.create(
+            user=User.objects.create_user(email="other@example.com", password="pass1234")
+        )
+        self.upload("cv.txt", b"Python, Django, Docker")
+        other.resume = SimpleUploadedFile("cv.txt", b"Python only")
+        other.save()
+        process_pending_resumes(workers=0)
+
+        employer = User.objects.create_user(email="employer@example.com", password="pass1234", user_type=User.EMPLOYER)
+        client = APIClient()
+        client.force_authenticate(employer)
+        response = client.get(reverse("candidate-search") + "?skills=python,docker")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["email"], row["matched_skills"]) for row in response.data],
+            [("candidate@example.com", 2), ("other@example.com", 1)],
+        )
+
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get(reverse("candidate-search") + "?skills=python").status_code, 403)
+
+
+class ChunkedUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="candidate@example.com", password="pass1234")
+        self.profile = JobSeekerProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def initiate(self, target="resume", filename="cv.txt", size=0):
+        return self.client.post(reverse("upload-create"), {"target": target, "filename": filename, "size": size})
+
+    def put_part(self, session_id, data, start, size):
+        return self.client.generic(
+            "PUT", reverse("upload-detail", args=[session_id]), data,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{start + len(data) - 1}/{size}",
+        )
+
+    def test_resumable_upload_attaches_resume(self):
+        content = b"Django and PostgreSQL engineer. " * 100
+        response = self.initiate(size=len(content))
+        self.assertEqual(response.status_code, 201, response.content)
+        session_id = response.data["id"]
+
+        self.assertEqual(self.put_part(session_id, content[:1000], 0, len(content)).data["received"], 1000)
+        # A retried or out-of-order part is rejected with the offset to resume from.
+        conflict = self.put_part(session_id, content[1500:], 1500, len(content))
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.data["received"], 1000)
+        self.assertEqual(self.client.get(reverse("upload-detail", args=[session_id])).data["received"], 1000)
+
+        incomplete = self.client.post(reverse("upload-complete", args=[session_id]))
+        self.assertEqual(incomplete.status_code, 400)
+
+        self.assertEqual(self.put_part(session_id, content[1000:], 1000, len(content)).status_code, 200)
+        response = self.client.post(reverse("upload-complete", args=[session_id]))
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.resume_pending)
+        with self.profile.resume.open("rb") as handle:
+            self.assertEqual(handle.read(), content)
+        session = UploadSession.objects.get(pk=session_id)
+        self.assertEqual(session.status, UploadSession.STATUS_COMPLETED)
+        self.assertFalse(os.path.exists(part_path(session)))
+
+    def test_limits_are_enforced_before_writing(self):
+        too_big = self.initiate(size=UPLOAD_SIZE_LIMITS["resume"] + 1)
+        self.assertEqual(too_big.status_code, 400)
+        self.assertIn("size", too_big.data)
+        self.assertIn("filename", self.initiate(filename="cv.exe", size=10).data)
+        # Candidates have no company logo to attach to.
+        self.assertIn("target", self.initiate(target="company_logo", filename="logo.png", size=10).data)
+
+        session_id = self.initiate(size=10).data["id"]
+        overflow = self.put_part(session_id, b"x" * 20, 0, 10)
+        self.assertEqual(overflow.status_code, 400)
+        self.assertFalse(os.path.exists(part_path(UploadSession.objects.get(pk=session_id))))
+
+        malformed = self.client.generic(
+            "PUT", reverse("upload-detail", args=[session_id]), b"x" * 10,
+            content_type="application/octet-stream", HTTP_CONTENT_RANGE="bytes 0-9/10", CONTENT_LENGTH="ten",
+        )
+        self.assertEqual(malformed.status_code, 400)
+
+    def test_invalid_image_is_not_attached(self):
+        session_id = self.initiate(target="profile_picture", filename="me.png", size=8).data["id"]
+        self.put_part(session_id, b"notapng!", 0, 8)
+        response = self.client.post(reverse("upload-complete", args=[session_id]))
+        self.assertEqual(response.status_code, 400)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_picture)
+
+    def test_sessions_are_private(self):
+        session_id = self.initiate(size=10).data["id"]
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user(email="other@example.com", password="pass1234"))
+        self.assertEqual(other.get(reverse("upload-detail", args=[session_id])).status_code, 404)
@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+
+logger = logging.getLogger(__name__)
+
+
+class BaseRateLimitStore:
+    """
+    Keeps one GCRA (token bucket) timestamp per throttle key. Each check is
+    a single atomic operation that both decides and records the request.
+    """
+
+    def hit(self, key: str, limit: int, period: float) -> float:
+        """
+        Count a request against ``limit`` requests per ``period`` seconds.
+        Returns 0 when allowed, otherwise the seconds until the next request
+        would be allowed.
+        """
+        raise NotImplementedError
+
+    def clear_expired(self):
+        """Drop idle keys, for backends that do not expire them on their own."""
+
+
+class DummyRateLimitStore(BaseRateLimitStore):
+    """Never limits; for benchmarks and load tests."""
+
+    def __init__(self, **options):
+        pass
+
+    def hit(self, key, limit, period):
+        return 0
+
+
+class LocalRateLimitStore(BaseRateLimitStore):
+    """In-process store, for tests and single-process development, and the fallback when Redis is down."""
+
+    max_entries = 10000
+
+    def __init__(self, timer=time.time, **options):
+        self.timer = timer
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def hit(self, key, limit, period):
+        interval = period / limit
+        with self._lock:
+            now = self.timer()
+            tat = max(self._data.get(key, now), now) + interval
+            wait = tat - now - period
+            if wait > 0:
+                return wait
+            if len(self._data) >= self.max_entries:
+                self._data = {k: v for k, v in self._data.items() if v > now}
+            self._data[key] = tat
+            return 0
+
+
+class DatabaseRateLimitStore(BaseRateLimitStore):
+    """
+    Store shared by all workers through the RateLimitBucket table. An
+    allowed request is recorded by one conditional UPDATE, so concurrent
+    workers never both take the last slot.
+    """
+
+    def __init__(self, timer=time.time, **options):
+        self.timer = timer
+
+    def hit(self, key, limit, period):
+        from .models import RateLimitBucket
+
+        interval = period / limit
+        buckets = RateLimitBucket.objects.filter(key=key)
+        while True:
+            now = self.timer()
+            # max(tat, now) + interval - now <= period  <=>  tat <= now + period - interval
+            if buckets.filter(tat__lte=now + period - interval).update(tat=Greatest(F("tat"), Value(now)) + interval):
+                return 0
+            tat = buckets.values_list("tat", flat=True).first()
+            if tat is None:
+                try:
+                    with transaction.atomic():
+                        RateLimitBucket.objects.create(key=key, tat=now + interval)
+                    return 0
+                except IntegrityError:
+                    continue  # another worker created the bucket first
+            wait = max(tat, now) + interval - now - period
+            if wait > 0:
+                return wait
+            # The bucket drained between the UPDATE and the read; try again.
+
+    def clear_expired(self):
+        from .models import RateLimitBucket
+
+        RateLimitBucket.objects.filter(tat__lt=self.timer()).delete()
+
+
+class RedisRateLimitStore(BaseRateLimitStore):
+    """
+    Store shared by all workers. The GCRA check runs as one Lua script on
+    Redis' own clock; if Redis is unreachable, limits fall back to a
+    per-process store rather than failing requests.
+    """
+
+    HIT_SCRIPT = """
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local interval = tonumber(ARGV[2]) / tonumber(ARGV[1])
+    local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+    if tat < now then
+        tat = now
+    end
+    tat = tat + interval
+    local wait = tat - now - tonumber(ARGV[2])
+    if wait > 0 then
+        return tostring(wait)
+    end
+    redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+    return '0'
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", key_prefix="throttle:", **options):
+        import redis  # optional dependency, only needed for this backend
+
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1)
+        self._hit = self._client.register_script(self.HIT_SCRIPT)
+        self._fallback = LocalRateLimitStore()
+        self.key_prefix = key_prefix
+
+    def hit(self, key, limit, period):
+        try:
+            return float(self._hit(keys=[self.key_prefix + key], args=[limit, period]))
+        except self._errors:
+            logger.warning("Rate limit store unavailable, using the local fallback", exc_info=True)
+            return self._fallback.hit(key, limit, period)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limit_store() -> BaseRateLimitStore:
+    config = settings.RATE_LIMIT_STORE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def _reset_rate_limit_store(setting, **kwargs):
+    if setting == "RATE_LIMIT_STORE":
+        get_rate_limit_store.cache_clear()
+
+
+class SharedRateThrottle(throttling.SimpleRateThrottle):
+    """
+    SimpleRateThrottle that counts requests in the configured rate limit
+    store instead of a timestamp list in the cache.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.retry_after = get_rate_limit_store().hit(self.key, self.num_requests, self.duration)
+        if self.retry_after:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, SharedRateThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, SharedRateThrottle):
+    pass
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, SharedRateThrottle):
+    pass
@@ -0,0 +1,119 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+from rest_framework import serializers
+
+from .models import UploadSession, User
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # suggested part size, also the read buffer
+STREAM_BUFFER_SIZE = 64 * 1024
+UPLOAD_SESSION_TTL = timedelta(days=1)
+
+UPLOAD_SIZE_LIMITS = {
+    UploadSession.TARGET_RESUME: 10 * 1024 * 1024,
+    UploadSession.TARGET_PROFILE_PICTURE: 5 * 1024 * 1024,
+    UploadSession.TARGET_COMPANY_LOGO: 2 * 1024 * 1024,
+}
+UPLOAD_EXTENSIONS = {
+    UploadSession.TARGET_RESUME: {".pdf", ".docx", ".txt"},
+    UploadSession.TARGET_PROFILE_PICTURE: {".png", ".jpg", ".jpeg", ".gif", ".webp"},
+    UploadSession.TARGET_COMPANY_LOGO: {".png", ".jpg", ".jpeg", ".gif", ".webp"},
+}
+
+
+class UploadConflict(Exception):
+    """A part does not start where the previous one ended."""
+
+
+def part_path(session):
+    return os.path.join(settings.MEDIA_ROOT, "chunked_uploads", f"{session.pk}.part")
+
+
+def target_instance(user, target):
+    """The model instance whose file field ``target`` an upload is attached to, or None."""
+    if target == UploadSession.TARGET_PROFILE_PICTURE:
+        return user
+    if target == UploadSession.TARGET_RESUME and user.user_type == User.CANDIDATE:
+        return getattr(user, "jobseeker_profile", None)
+    if target == UploadSession.TARGET_COMPANY_LOGO and user.user_type == User.EMPLOYER:
+        return getattr(user, "employer_profile", None)
+    return None
+
+
+def write_part(session_id, user, start, length, stream):
+    """
+    Append ``length`` bytes from ``stream`` at offset ``start``, reading in
+    small buffers so memory stays bounded. The session row is locked for the
+    duration, so concurrent retries of the same part cannot interleave.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id, user=user)
+        if session.status != UploadSession.STATUS_OPEN:
+            raise serializers.ValidationError({"detail": "Upload is already completed."})
+        if start != session.received:
+            raise UploadConflict(session.received)
+        if length <= 0 or start + length > session.size:
+            raise serializers.ValidationError({"detail": f"Part exceeds the declared size of {session.size} bytes."})
+
+        path = part_path(session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        written = 0
+        with open(path, "r+b" if os.path.exists(path) else "wb") as handle:
+            handle.seek(start)
+            handle.truncate()  # drop leftovers of an interrupted earlier attempt
+            while written < length:
+                chunk = stream.read(min(STREAM_BUFFER_SIZE, length - written))
+                if not chunk:
+                    break
+                handle.write(chunk)
+                written += len(chunk)
+        if written != length:
+            raise serializers.ValidationError({"detail": "Part body is shorter than its Content-Length."})
+
+        session.received = start + written
+        session.save(update_fields=["received", "updated_at"])
+        return session
+
+
+def complete_upload(session_id, user):
+    """Attach a fully received upload to its target field and discard the part file."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id, user=user)
+        if session.status != UploadSession.STATUS_OPEN:
+            raise serializers.ValidationError({"detail": "Upload is already completed."})
+        if session.received != session.size:
+            raise serializers.ValidationError(
+                {"detail": f"Upload is incomplete: {session.received} of {session.size} bytes received."}
+            )
+        instance = target_instance(user, session.target)
+        if instance is None:
+            raise serializers.ValidationError({"target": "This account cannot hold that file."})
+
+        path = part_path(session)
+        with open(path, "rb") as handle:
+            if session.target != UploadSession.TARGET_RESUME:
+                try:
+                    Image.open(handle).verify()
+                except Exception:
+                    raise serializers.ValidationError({"detail": "Uploaded file is not a valid image."})
+                handle.seek(0)
+            getattr(instance, session.target).save(session.filename, File(handle), save=True)
+
+        session.status = UploadSession.STATUS_COMPLETED
+        session.save(update_fields=["status", "updated_at"])
+    os.remove(path)
+    return session, instance
+
+
+def clear_stale_uploads():
+    """Delete sessions left open past UPLOAD_SESSION_TTL together with their part files."""
+    stale = UploadSession.objects.filter(status=UploadSession.STATUS_OPEN, updated_at__lt=timezone.now() - UPLOAD_SESSION_TTL)
+    for session in stale:
+        if os.path.exists(part_path(session)):
+            os.remove(part_path(session))
+    return stale.delete()[0]
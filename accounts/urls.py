@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import RequestOTPView, VerifyOTPView, SignupView, LoginView, ResetPasswordView, ProfileView, UserPublicProfileView
+from .views import RequestOTPView, VerifyOTPView, SignupView, LoginView, ResetPasswordView, ProfileView, UserPublicProfileView, CandidateSearchView, \
+    UploadSessionCreateView, UploadSessionDetailView, UploadSessionCompleteView
 
 urlpatterns = [
     path("auth/request-otp/", RequestOTPView.as_view(), name="request-otp"),
@@ -9,4 +10,8 @@ urlpatterns = [
     path("auth/reset-password/", ResetPasswordView.as_view(), name="reset-password"),
     path("profile/", ProfileView.as_view(), name="profile"),
     path("profile/<uuid:id>/", UserPublicProfileView.as_view(), name="user-profile-detail"),
+    path("candidates/search/", CandidateSearchView.as_view(), name="candidate-search"),
+    path("uploads/", UploadSessionCreateView.as_view(), name="upload-create"),
+    path("uploads/<uuid:pk>/", UploadSessionDetailView.as_view(), name="upload-detail"),
+    path("uploads/<uuid:pk>/complete/", UploadSessionCompleteView.as_view(), name="upload-complete"),
 ]
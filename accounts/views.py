@@ -2,14 +2,15 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.permissions import IsAuthenticated
-from django.core.cache import cache
 from django.core.files.storage import default_storage
-import uuid
-from rest_framework_simplejwt.tokens import RefreshToken
-from .serializers import RequestOTPSerializer, VerifyOTPSerializer, SignupSerializer, LoginSerializer, ResetPasswordSerializer, UserProfileSerializer, FullProfileSerializer
+from .authentication import PortalRefreshToken
+from .permissions import IsEmployer
+from .serializers import RequestOTPSerializer, VerifyOTPSerializer, SignupSerializer, LoginSerializer, ResetPasswordSerializer, UserProfileSerializer, FullProfileSerializer, UploadSessionSerializer
 from .profile_serializers import *
-from .services import send_otp_email, verify_otp
-from .models import User
+from .services import send_otp_email, verify_otp, issue_verification_token
+from .resumes import search_candidates
+from .uploads import UploadConflict, write_part, complete_upload
+from .models import User, JobSeekerProfile, UploadSession
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -43,10 +44,7 @@ class VerifyOTPView(generics.GenericAPIView):
         purpose = serializer.validated_data["purpose"]
 
         if verify_otp(email, otp, purpose):
-            # generate short-lived token (UUID stored in cache)
-            token = str(uuid.uuid4())
-            cache_key = f"verified:{purpose}:{token}"
-            cache.set(cache_key, email, 600)  # valid 10 min
+            token = issue_verification_token(email, purpose)
 
             return Response(
                 {
@@ -69,7 +67,7 @@ class SignupView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = PortalRefreshToken.for_user(user)
         data = {
             "user": {
                 "id": str(user.id),
@@ -130,7 +128,7 @@ class ProfileView(generics.RetrieveUpdateAPIView):
 
 
 class UserPublicProfileView(generics.RetrieveAPIView):
-    queryset = User.objects.all()
+    queryset = User.objects.select_related("jobseeker_profile", "employer_profile")
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
@@ -145,3 +143,73 @@ class UserPublicProfileView(generics.RetrieveAPIView):
             data["profile"] = EmployerProfileSerializer(user.employer_profile).data
 
         return Response(data)
+
+
+class CandidateSearchView(generics.ListAPIView):
+    serializer_class = CandidateSearchSerializer
+    permission_classes = [IsAuthenticated, IsEmployer]
+    max_results = 50
+
+    def get_queryset(self):
+        skills = [skill for skill in self.request.query_params.get("skills", "").split(",") if skill.strip()]
+        if not skills:
+            return JobSeekerProfile.objects.none()
+        queryset = JobSeekerProfile.objects.select_related("user").defer("resume_text")
+        return search_candidates(skills, queryset)[:self.max_results]
+
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class UploadSessionDetailView(generics.RetrieveAPIView):
+    """
+    GET reports how many bytes were received so a client can resume.
+    PUT appends one part; the body is streamed to disk and must carry a
+    ``Content-Range: bytes <start>-<end>/<size>`` header.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = []
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def put(self, request, *args, **kwargs):
+        session = self.get_object()
+        try:
+            unit, _, spec = request.headers.get("Content-Range", "").partition(" ")
+            span, _, total = spec.partition("/")
+            start, _, end = span.partition("-")
+            start, end, total = int(start), int(end), int(total)
+            content_length = int(request.headers.get("Content-Length") or 0)
+        except ValueError:
+            return Response({"detail": "A Content-Range header of the form 'bytes start-end/size' is required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        length = end - start + 1
+        if unit != "bytes" or total != session.size or length != content_length:
+            return Response({"detail": "Content-Range does not match the upload or the request body."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            session = write_part(session.pk, request.user, start, length, request._request)
+        except UploadConflict as exc:
+            return Response({"detail": "Part does not start at the received offset.", "received": exc.args[0]},
+                            status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(session).data)
+
+
+class UploadSessionCompleteView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        session = self.get_object()
+        session, instance = complete_upload(session.pk, request.user)
+        field_file = getattr(instance, session.target)
+        return Response({"id": session.id, "target": session.target, "url": request.build_absolute_uri(field_file.url)})
@@ -0,0 +1,150 @@
+"""
+In-process request metrics, exposed in the Prometheus text format.
+
+Aggregates live in each worker process, like prometheus_client without its
+multiprocess mode: scrape every worker, or sum across them in the query.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Timings of the request being handled, for code outside the middleware
+# (e.g. authentication) to report into.
+current_request_timings = ContextVar("current_request_timings", default=None)
+# Key of the running SQL total in the timings, kept by the middleware, so
+# phases can leave their queries out.
+SQL_TIMING = "sql"
+
+
+@contextmanager
+def timed(phase):
+    """Add the wall time of the block, less its SQL, to ``phase`` of the current request, if any."""
+    timings = current_request_timings.get()
+    if timings is None:
+        yield
+        return
+    start, sql_start = time.perf_counter(), timings.get(SQL_TIMING, 0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (timings.get(SQL_TIMING, 0.0) - sql_start)
+        timings[phase] = timings.get(phase, 0.0) + elapsed
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, [list(counts), total, count]) for labels, (counts, total, count) in self._series.items())
+        for label_values, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labels, label_values, [("le", _format_number(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines.extend(f"{self.name}{_format_labels(self.labels, labels)} {_format_number(value)}" for labels, value in values)
+        return lines
+
+
+REQUEST_LABELS = ("url_name", "method")
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time spent handling the request.", REQUEST_LABELS, DURATION_BUCKETS)
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL queries per request.", REQUEST_LABELS, DURATION_BUCKETS)
+request_db_queries = Histogram(
+    "http_request_db_queries", "SQL queries executed per request.", REQUEST_LABELS, QUERY_COUNT_BUCKETS)
+request_phase_duration = Histogram(
+    "http_request_phase_duration_seconds",
+    "Time spent per request outside SQL: authentication, the view (including serialization) and rendering.",
+    REQUEST_LABELS + ("phase",), DURATION_BUCKETS)
+response_size = Histogram(
+    "http_response_size_bytes", "Size of the response body.", REQUEST_LABELS, SIZE_BUCKETS)
+responses = Counter("http_responses_total", "Responses by status code.", REQUEST_LABELS + ("status",))
+
+REGISTRY = [request_duration, request_db_duration, request_db_queries, request_phase_duration, response_size, responses]
+
+
+def record_request(url_name, method, status, duration, db_duration, db_queries, size, phases=None):
+    labels = (url_name, method)
+    request_duration.observe(labels, duration)
+    request_db_duration.observe(labels, db_duration)
+    request_db_queries.observe(labels, db_queries)
+    for phase, phase_duration in (phases or {}).items():
+        request_phase_duration.observe(labels + (phase,), phase_duration)
+    if size is not None:
+        response_size.observe(labels, size)
+    responses.inc(labels + (str(status),))
+
+
+def expose_metrics(extra_gauges=()):
+    """Render the registry, plus ``(name, documentation, value)`` gauges, as Prometheus text."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    for name, documentation, value in extra_gauges:
+        lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {_format_number(value)}"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+import heapq
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import SQL_TIMING, current_request_timings, record_request
+from .replicas import (
+    REPLICA_PIN_COOKIE, SAFE_METHODS, RequestRouting, check_pin_cache, current_routing, pin_cache, pin_cache_key,
+)
+
+logger = logging.getLogger("job_portal.slow_requests")
+
+SLOW_REQUEST_SQL_STATEMENTS = 5
+PHASES = ("auth", "view", "serialize", "render")
+
+
+class QueryRecorder:
+    """
+    execute_wrapper that counts queries, sums their time and keeps the
+    slowest few. The running total is also kept in ``timings``, so request
+    phases can leave out their SQL.
+    """
+
+    def __init__(self, timings=None, keep=SLOW_REQUEST_SQL_STATEMENTS):
+        self.timings = {} if timings is None else timings
+        self.keep = keep
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.timings[SQL_TIMING] = self.duration
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, (elapsed, self.count, sql))
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, self.count, sql))
+
+
+class RequestMetricsMiddleware:
+    """
+    Times each request: SQL (count and duration), and, less the SQL they
+    ran, authentication, the view, serialization (blocks timed as
+    "serialize") and response rendering. The breakdown is returned in a Server-Timing header,
+    aggregated per URL name for the metrics endpoint, and requests slower
+    than SLOW_REQUEST_THRESHOLD_MS are logged with their worst SQL.
+
+    Keep this first in MIDDLEWARE so the total covers the other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        timings = {}
+        token = current_request_timings.set(timings)
+        recorder = QueryRecorder(timings)
+        request._metrics_timings = timings
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            current_request_timings.reset(token)
+        total = time.perf_counter() - start
+
+        sql = timings.pop(SQL_TIMING, 0.0)
+        view_start = timings.pop("view_start", None)
+        if view_start is not None:
+            view_start_sql = timings.pop("view_start_sql")
+            view_end, view_end_sql = timings.pop("view_end", None), timings.pop("view_end_sql", sql)
+            if view_end is None:
+                view_end = time.perf_counter()
+            timings["view"] = (
+                view_end - view_start - (view_end_sql - view_start_sql)
+                - timings.get("auth", 0.0) - timings.get("serialize", 0.0)
+            )
+            render_end = timings.pop("render_end", None)
+            if render_end is not None:
+                timings["render"] = render_end - view_end - (timings.pop("render_end_sql") - view_end_sql)
+
+        size = None if response.streaming else len(response.content)
+        match = request.resolver_match
+        url_name = (match.view_name if match else None) or "unmatched"
+        record_request(
+            url_name, request.method, response.status_code, total, recorder.duration, recorder.count, size, timings,
+        )
+
+        entries = [f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"']
+        entries.extend(f"{phase};dur={timings[phase] * 1000:.2f}" for phase in PHASES if phase in timings)
+        entries.append(f"total;dur={total * 1000:.2f}")
+        response["Server-Timing"] = ", ".join(entries)
+
+        if total * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            logger.warning(
+                "Slow request %s %s (%s) %.1fms status=%s size=%s queries=%d sql=%.1fms timings=%s\n%s",
+                request.method, request.path, url_name, total * 1000, response.status_code, size,
+                recorder.count, recorder.duration * 1000,
+                {phase: round(value * 1000, 1) for phase, value in timings.items()},
+                "\n".join(f"  {elapsed * 1000:.1f}ms {sql}" for elapsed, _, sql in sorted(recorder.slowest, reverse=True)),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = request._metrics_timings
+        timings["view_start"], timings["view_start_sql"] = time.perf_counter(), timings.get(SQL_TIMING, 0.0)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook; the view has finished.
+        timings = request._metrics_timings
+        timings["view_end"], timings["view_end_sql"] = time.perf_counter(), timings.get(SQL_TIMING, 0.0)
+
+        def rendered(response):
+            timings["render_end"], timings["render_end_sql"] = time.perf_counter(), timings.get(SQL_TIMING, 0.0)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes the reads of each request (see job_portal.replicas) and pins the
+    user to the primary after a request that wrote. Does nothing unless
+    DATABASE_REPLICAS is set.
+    """
+
+    def __init__(self, get_response):
+        check_pin_cache()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        routing = RequestRouting(
+            primary=request.method not in SAFE_METHODS or REPLICA_PIN_COOKIE in request.COOKIES,
+        )
+        token = current_routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        if routing.wrote:
+            if routing.user_id is not None:
+                pin_cache().set(pin_cache_key(routing.user_id), True, settings.REPLICA_PIN_SECONDS)
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, "1", max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax",
+            )
+        return response
@@ -0,0 +1,121 @@
+"""
+Read replica routing with read-your-writes.
+
+Reads made while handling a GET/HEAD/OPTIONS request go to one of the
+DATABASE_REPLICAS aliases; everything else (writes, unsafe requests,
+management commands) uses the primary. A request that
+writes pins its user to the primary for REPLICA_PIN_SECONDS, so replica
+lag never shows that user the state from before their own write. Users
+are pinned by id through REPLICA_PIN_CACHE, which every worker must share
+(token clients), and by a cookie (browsers, anonymous requests); see
+ReplicaRoutingMiddleware. Pins are looked up on every safe request of a
+signed-in user, so that cache must not be served by the database either.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_PIN_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+DATABASE_CACHE = "django.core.cache.backends.db.DatabaseCache"
+# Bookkeeping tables, as (app_label, model_name): DatabaseCache's, whose pins
+# must never be read from a replica, and the rate limit counters. Reads use
+# the primary and writes do not pin the user.
+BOOKKEEPING_TABLES = {("django_cache", "cacheentry"), ("accounts", "ratelimitbucket")}
+
+# Routing state of the request being handled; None outside requests.
+current_routing = ContextVar("current_routing", default=None)
+
+
+def pin_cache_key(user_id):
+    return f"db:primary:{user_id}"
+
+
+def pin_cache():
+    return caches[settings.REPLICA_PIN_CACHE]
+
+
+def check_pin_cache():
+    """
+    Refuse to route to replicas when a pin would only be seen by the worker
+    that set it, or when looking one up would itself query the primary.
+    """
+    if not settings.DATABASE_REPLICAS:
+        return
+    backend = settings.CACHES[settings.REPLICA_PIN_CACHE]["BACKEND"]
+    if backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f"REPLICA_PIN_CACHE ({settings.REPLICA_PIN_CACHE!r}) must be shared by all workers when DATABASE_REPLICAS is set."
+        )
+    if backend == DATABASE_CACHE:
+        raise ImproperlyConfigured(
+            f"REPLICA_PIN_CACHE ({settings.REPLICA_PIN_CACHE!r}) must not be a DatabaseCache: every safe request "
+            "of a signed-in user reads a pin, which would then query the primary."
+        )
+
+
+class RequestRouting:
+    def __init__(self, primary):
+        # Whether reads must use the primary for the rest of the request.
+        self.primary = primary
+        self.wrote = False
+        self.user_id = None
+
+
+@contextmanager
+def primary_reads():
+    """Send the reads of the block to the primary, e.g. to fill a cache shared by all users."""
+    routing = current_routing.get()
+    if routing is None or routing.primary:
+        yield
+        return
+    routing.primary = True
+    try:
+        yield
+    finally:
+        routing.primary = routing.wrote
+
+
+def set_request_user(user_id):
+    """Record who the current request is for; their pin, if any, applies from now on."""
+    routing = current_routing.get()
+    if routing is None or not settings.DATABASE_REPLICAS:
+        return
+    routing.user_id = user_id
+    if not routing.primary and pin_cache().get(pin_cache_key(user_id)):
+        routing.primary = True
+
+
+def _is_bookkeeping(model):
+    return (model._meta.app_label, model._meta.model_name) in BOOKKEEPING_TABLES
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        if (
+            routing is None or routing.primary or not settings.DATABASE_REPLICAS
+            or _is_bookkeeping(model)
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        # E.g. setting or culling a pin, or counting a request, is not the user's write.
+        if routing is not None and not _is_bookkeeping(model):
+            routing.primary = routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
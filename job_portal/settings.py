@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
@@ -44,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'job_portal.middleware.RequestMetricsMiddleware',
+    'job_portal.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,6 +91,36 @@ DATABASES = {
     }
 }
 
+# Read replicas of 'default', e.g. DJANGO_DB_REPLICA_HOSTS="10.0.0.2,10.0.0.3".
+# Reads of safe requests go to them (see job_portal.replicas); after a write
+# the user reads from the primary for REPLICA_PIN_SECONDS, which should
+# comfortably exceed the replication lag. Pins are kept in the
+# REPLICA_PIN_CACHE alias of CACHES, which every worker must share and which
+# must not be the database (set REPLICA_PIN_CACHE_URL to a Redis server).
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get("DJANGO_DB_REPLICA_HOSTS", "").split(",")), start=1):
+    DATABASES[f"replica{index}"] = {**DATABASES["default"], "HOST": host.strip(), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica{index}")
+DATABASE_ROUTERS = ["job_portal.replicas.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 10))
+REPLICA_PIN_CACHE = "pins"
+
+# Local test runs use SQLite so the suite does not need a Postgres server.
+# Postgres-only features (e.g. full-text search) ship a SQLite fallback.
+if "test" in sys.argv or os.environ.get("DJANGO_DB_ENGINE") == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        },
+        # A separate database standing in for a lagging replica in routing tests.
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db-replica.sqlite3',
+        },
+    }
+    DATABASE_REPLICAS = []
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -106,6 +140,12 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+if "test" in sys.argv:
+    # Fixture-heavy tests create many users; skip the deliberately slow hasher.
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    # The test run is a single process; the local rate limit store is exact.
+    SILENCED_SYSTEM_CHECKS = ["accounts.W001"]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -124,6 +164,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Threads generating thumbnails/WebP variants of uploaded images in the
+# background; 0 generates them inline (used by the tests).
+IMAGE_VARIANT_WORKERS = 0 if "test" in sys.argv else 2
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -131,15 +175,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.ScopedRateThrottle",
+        "accounts.throttling.AnonRateThrottle",
+        "accounts.throttling.UserRateThrottle",
+        "accounts.throttling.ScopedRateThrottle",
     ),
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",
@@ -170,7 +214,51 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "job-portal-cache",
-    }
+    },
+    # Entries every worker process must see, e.g. cached identities. The table is
+    # created by "manage.py createcachetable"; Redis works too:
+    # {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://..."}.
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "portal_shared_cache",
+    },
+    # Replica pins, read on every safe request; only used when DATABASE_REPLICAS is set.
+    "pins": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REPLICA_PIN_CACHE_URL", "redis://localhost:6379/1"),
+    },
 }
 
 AUTH_USER_MODEL = "accounts.User"
+
+# Users resolved from access tokens are cached here; it must be shared by all
+# workers so that deactivating a user or changing their password takes effect
+# everywhere at once (system check accounts.W002).
+IDENTITY_CACHE = "shared"
+
+# OTP codes and verification tokens must be visible to every worker process,
+# so they live in a shared store rather than the per-process cache above.
+# accounts.otp_store.RedisOTPStore takes OPTIONS {"url": "redis://..."}.
+OTP_STORE = {
+    "BACKEND": "accounts.otp_store.DatabaseOTPStore",
+}
+
+# DRF throttle counters, shared by all workers through the database (run
+# "manage.py clear_expired_rate_limits" periodically to drop idle keys).
+# accounts.throttling.RedisRateLimitStore takes OPTIONS {"url": "redis://..."}.
+# LocalRateLimitStore limits each process separately, so with N workers every
+# limit is effectively N times its rate (system check accounts.W001); tests
+# use it anyway to keep throttle writes out of their query counts.
+RATE_LIMIT_STORE = {
+    "BACKEND": "accounts.throttling.LocalRateLimitStore" if "test" in sys.argv
+    else "accounts.throttling.DatabaseRateLimitStore",
+}
+
+# New jobs expire after this many days unless the employer sets expires_at;
+# run "manage.py expire_jobs --loop" to deactivate them when they do.
+JOB_LIFETIME_DAYS = 60
+
+# Requests slower than this are logged to "job_portal.slow_requests" with their slowest SQL.
+SLOW_REQUEST_THRESHOLD_MS = 500
+# /metrics/ requires "Authorization: Bearer <token>"; without a token it is only served in DEBUG.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
@@ -17,9 +17,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from .views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("accounts.urls")),
     path("api/jobs/", include("jobs.urls")),
     path("api-auth/", include("rest_framework.urls")),
+    path("metrics/", metrics, name="metrics"),
 ]
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from accounts.models import JobSeekerProfile
+from accounts.outbox import queue_depth
+from jobs.models import Application
+
+from .metrics import expose_metrics
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint; requires ``Authorization: Bearer <METRICS_TOKEN>``.
+    Without a METRICS_TOKEN it is only served in DEBUG.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden()
+
+    # Backlogs of the background workers; each count is served by a partial or status index.
+    gauges = [
+        ("outbound_email_queue_depth", "Emails waiting to be sent.", queue_depth()),
+        ("resume_extraction_queue_depth", "Resumes waiting for text extraction.",
+         JobSeekerProfile.objects.filter(resume_pending=True).count()),
+        ("stale_match_scores", "Applications whose match score needs a refresh.",
+         Application.objects.filter(match_score_stale=True).count()),
+    ]
+    return HttpResponse(expose_metrics(gauges), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,52 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Application, Job
+
+
+class DuplicateApplication(Exception):
+    pass
+
+
+def _is_duplicate(error):
+    """Whether ``error`` violates the unique (job, applicant) constraint rather than, e.g., a foreign key."""
+    message = str(error)
+    cause = error.__cause__
+    sqlstate = getattr(cause, 'sqlstate', None) or getattr(cause, 'pgcode', None)
+    if sqlstate is not None:
+        # PostgreSQL: "... violates unique constraint ... Key (job_id, applicant_id)=..."
+        return sqlstate == '23505' and 'applicant_id' in message
+    # SQLite: "UNIQUE constraint failed: jobs_application.job_id, jobs_application.applicant_id"
+    return 'UNIQUE' in message and f'{Application._meta.db_table}.applicant_id' in message
+
+
+def submit_application(serializer, job, applicant, **fields):
+    """
+    Save an application through ``serializer`` in a transaction of its own.
+    The unique (job, applicant) constraint is the duplicate check, so two
+    concurrent submits cannot both succeed; the post_save counter UPDATE is
+    the last statement, keeping the lock on a busy job's row until commit only.
+    """
+    try:
+        with transaction.atomic():
+            return serializer.save(job=job, applicant=applicant, **fields)
+    except IntegrityError as error:
+        # Anything else (e.g. the job was deleted meanwhile) is a real error.
+        if not _is_duplicate(error):
+            raise
+        raise DuplicateApplication
+
+
+def adjust_applications_count(job_id, delta):
+    Job.objects.filter(pk=job_id).update(applications_count=F('applications_count') + delta)
+
+
+def recount_applications(jobs=None):
+    """Recompute applications_count from the Application table; returns the number of jobs updated."""
+    counts = (
+        Application.objects.filter(job=OuterRef('pk'))
+        .order_by().values('job').annotate(total=Count('pk')).values('total')
+    )
+    queryset = Job.objects.all() if jobs is None else jobs
+    return queryset.update(applications_count=Coalesce(Subquery(counts), Value(0)))
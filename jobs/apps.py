@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        post_migrate.connect(_ensure_sqlite_search_index, sender=self)
+        from . import signals  # noqa: F401
+
+
+def _ensure_sqlite_search_index(using, **kwargs):
+    from django.db import connections
+    from .search import install_sqlite_fts
+
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and 'jobs_job' in connection.introspection.table_names():
+        install_sqlite_fts(connection)
@@ -0,0 +1,76 @@
+"""
+Archival of applications to long-closed jobs.
+
+Applications whose job was closed (deactivated by hand or by expire_jobs)
+more than ARCHIVE_AFTER_DAYS ago are copied to ApplicationArchive and
+deleted from Application in batches, one transaction each, so the hot
+table only holds applications someone may still act on.
+"""
+from datetime import timedelta
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import Application, ApplicationArchive, Job
+from .stats import rebuild_job_stats
+
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVED_FIELDS = (
+    'id', 'job_id', 'job__title', 'applicant_id', 'applicant__email', 'cover_letter',
+    'status', 'match_score', 'applied_at', 'updated_at',
+)
+
+
+def delete_applications(ids):
+    """
+    Delete applications with one plain DELETE. Nothing references them, and
+    skipping the per-row signal handlers is the point: they would adjust
+    counters one application at a time.
+    """
+    connection = connections[router.db_for_write(Application)]
+    opts, quote = Application._meta, connection.ops.quote_name
+    params = [opts.pk.get_db_prep_value(pk, connection) for pk in ids]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(opts.db_table)} WHERE {quote(opts.pk.column)} IN ({', '.join(['%s'] * len(params))})",
+            params,
+        )
+
+
+def archivable_applications(closed_before):
+    return Application.objects.filter(job__is_active=False, job__closed_at__lt=closed_before)
+
+
+def archive_applications(closed_days=ARCHIVE_AFTER_DAYS, batch_size=1000):
+    """
+    Move applications of jobs closed more than ``closed_days`` ago to the
+    archive. A generator: the archived rows of each batch are yielded once
+    that batch is committed, so callers can stream them out as they go.
+    """
+    closed_before = timezone.now() - timedelta(days=closed_days)
+    while True:
+        with transaction.atomic():
+            rows = list(
+                archivable_applications(closed_before)
+                .select_for_update(skip_locked=True, of=('self',))
+                .order_by('pk')
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return
+            archived = [
+                ApplicationArchive(
+                    id=row['id'], job_id=row['job_id'], job_title=row['job__title'],
+                    applicant_id=row['applicant_id'], applicant_email=row['applicant__email'],
+                    cover_letter=row['cover_letter'], status=row['status'], match_score=row['match_score'],
+                    applied_at=row['applied_at'], updated_at=row['updated_at'],
+                )
+                for row in rows
+            ]
+            # Rows copied by an interrupted earlier run are not duplicated.
+            ApplicationArchive.objects.bulk_create(archived, ignore_conflicts=True)
+            # rebuild_job_stats below fixes the counters per job.
+            delete_applications([row['id'] for row in rows])
+            rebuild_job_stats(Job.objects.filter(pk__in={row['job_id'] for row in rows}))
+        for archive in archived:
+            yield {field.attname: getattr(archive, field.attname) for field in ApplicationArchive._meta.concrete_fields}
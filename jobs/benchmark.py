@@ -0,0 +1,204 @@
+"""
+Endpoint benchmarks against synthetic data (see jobs.synthetic).
+
+Every request runs inside a transaction that is rolled back afterwards,
+so write endpoints can be measured repeatedly without changing the data.
+"""
+import io
+import statistics
+import time
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.authentication import PortalRefreshToken
+from accounts.models import UploadSession, User
+from accounts.otp_store import get_otp_store
+from accounts.services import issue_verification_token
+from .models import Application, Job
+from .synthetic import SYNTHETIC_EMAIL_DOMAIN, SYNTHETIC_PASSWORD, synthetic_email
+
+BENCHMARK_OTP = "246810"
+IMPORT_CSV = "title,description,requirements,location,job_type,salary\n" + "".join(
+    f"Benchmark Engineer {index},Imported role,\"Python, Django\",Pune,full_time,900000\n" for index in range(50)
+)
+
+
+class BenchmarkDataMissing(Exception):
+    pass
+
+
+class Endpoint:
+    """
+    One benchmarked request. ``prepare(i)`` runs inside the per-request
+    transaction but outside the timed section and returns the request kwargs.
+    """
+
+    def __init__(self, label, method, role, prepare):
+        self.label = label
+        self.method = method
+        self.role = role
+        self.prepare = prepare
+
+
+def fixtures():
+    candidate = User.objects.filter(email=synthetic_email("candidate", 0)).first()
+    employer = User.objects.select_related("employer_profile").filter(email=synthetic_email("employer", 0)).first()
+    own_job = employer and Job.objects.filter(employer__user=employer).first()
+    open_job = candidate and (
+        Job.objects.filter(is_active=True)
+        .exclude(Exists(Application.objects.filter(job=OuterRef("pk"), applicant=candidate)))
+        .first()
+    )
+    if not (candidate and employer and own_job and open_job):
+        raise BenchmarkDataMissing("Synthetic data not found; run generate_synthetic_data first.")
+    return candidate, employer, own_job, open_job
+
+
+def build_endpoints():
+    candidate, employer, own_job, open_job = fixtures()
+
+    def new_email(i):
+        return f"bench{i}@{SYNTHETIC_EMAIL_DOMAIN}"
+
+    def verify_otp(i):
+        get_otp_store().set(f"otp:register:{new_email(i)}", BENCHMARK_OTP, 300)
+        return {"path": reverse("verify-otp"), "data": {"email": new_email(i), "purpose": "register", "otp": BENCHMARK_OTP}}
+
+    def signup(i):
+        return {"path": reverse("signup"), "data": {
+            "email": new_email(i), "password": SYNTHETIC_PASSWORD,
+            "verification_token": issue_verification_token(new_email(i), "register"),
+        }}
+
+    def reset_password(i):
+        return {"path": reverse("reset-password"), "data": {
+            "email": candidate.email, "new_password": SYNTHETIC_PASSWORD,
+            "verification_token": issue_verification_token(candidate.email, "reset"),
+        }}
+
+    def upload_detail(i):
+        session = UploadSession.objects.create(user=candidate, target=UploadSession.TARGET_RESUME, filename="cv.txt", size=1000)
+        return {"path": reverse("upload-detail", args=[session.pk])}
+
+    def job_import(i):
+        upload = io.BytesIO(IMPORT_CSV.encode())
+        upload.name = "jobs.csv"
+        return {"path": reverse("job-import"), "data": {"file": upload}, "format": "multipart"}
+
+    def static(url_name, *args, query="", **kwargs):
+        path = reverse(url_name, args=args) + query
+        return lambda i: {"path": path, **kwargs}
+
+    # Chunk PUT and upload completion are left out: they write files, which a rollback cannot undo.
+    return [
+        Endpoint("request-otp", "post", None, lambda i: {
+            "path": reverse("request-otp"), "data": {"email": new_email(i), "purpose": "register"}}),
+        Endpoint("verify-otp", "post", None, verify_otp),
+        Endpoint("signup", "post", None, signup),
+        Endpoint("login", "post", None, static("login", data={"email": candidate.email, "password": SYNTHETIC_PASSWORD})),
+        Endpoint("reset-password", "post", None, reset_password),
+        Endpoint("profile", "get", candidate, static("profile")),
+        Endpoint("user-profile-detail", "get", candidate, static("user-profile-detail", employer.pk)),
+        Endpoint("candidate-search", "get", employer, static("candidate-search", query="?skills=python,django")),
+        Endpoint("upload-create", "post", candidate, static(
+            "upload-create", data={"target": "resume", "filename": "cv.txt", "size": 1000})),
+        Endpoint("upload-detail", "get", candidate, upload_detail),
+        Endpoint("job-list", "get", candidate, static("job-list")),
+        Endpoint("job-list:employer", "get", employer, static("job-list")),
+        Endpoint("job-list:search", "get", candidate, static("job-list", query="?q=python")),
+        Endpoint("job-list:filtered", "get", candidate, static("job-list", query="?location=Pune&job_type=full_time")),
+        Endpoint("job-list:near", "get", candidate, static("job-list", query="?near=18.52,73.86&radius_km=25")),
+        Endpoint("job-list:create", "post", employer, static("job-list", data={
+            "title": "Benchmark Engineer", "description": "Benchmark", "requirements": "Python",
+            "location": "Pune", "job_type": "full_time"}, format="json")),
+        Endpoint("job-import", "post", employer, job_import),
+        Endpoint("job-recommendations", "get", candidate, static("job-recommendations")),
+        Endpoint("job-detail", "get", candidate, static("job-detail", open_job.pk)),
+        Endpoint("job-detail:update", "patch", employer, static(
+            "job-detail", own_job.pk, data={"title": "Benchmark Engineer"}, format="json")),
+        Endpoint("apply-job", "post", candidate, static("apply-job", open_job.pk, data={"cover_letter": "Hello"}, format="json")),
+        Endpoint("my-applications", "get", candidate, static("my-applications")),
+        Endpoint("employer-applications", "get", employer, static("employer-applications")),
+        Endpoint("employer-dashboard", "get", employer, static("employer-dashboard")),
+        Endpoint("employer-applications-status", "post", employer, static(
+            "employer-applications-status", data={"status": "reviewed", "job": str(own_job.pk)}, format="json")),
+    ]
+
+
+def client_for(user):
+    client = APIClient(SERVER_NAME="localhost")
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {PortalRefreshToken.for_user(user).access_token}")
+    return client
+
+
+def percentile(sorted_values, fraction):
+    index = fraction * (len(sorted_values) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (index - lower)
+
+
+def run_endpoint(endpoint, iterations=50, warmup=5):
+    client = client_for(endpoint.role)
+    send = getattr(client, endpoint.method)
+    latencies, queries, statuses = [], [], set()
+    for i in range(warmup + iterations):
+        with transaction.atomic():
+            kwargs = endpoint.prepare(i)
+            path = kwargs.pop("path")
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = send(path, **kwargs)
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(len(ctx.captured_queries))
+            statuses.add(response.status_code)
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "status": sorted(statuses),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_queries": round(statistics.fmean(queries), 2),
+        "max_queries": max(queries),
+        "throughput_rps": round(1000 * len(latencies) / sum(latencies), 1),
+    }
+
+
+def run_benchmarks(iterations=50, warmup=5, only=None):
+    return {
+        endpoint.label: run_endpoint(endpoint, iterations, warmup)
+        for endpoint in build_endpoints()
+        if not only or endpoint.label in only
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compare results with a stored baseline. An endpoint regresses when its
+    p95 grows by more than ``threshold`` or it runs more queries than before.
+    """
+    rows = []
+    for label, current in results.items():
+        previous = baseline.get(label)
+        if previous is None:
+            rows.append({"label": label, "p95_change": None, "query_change": None, "regressed": False})
+            continue
+        p95_change = (current["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] if previous["p95_ms"] else 0.0
+        query_change = current["max_queries"] - previous["max_queries"]
+        rows.append({
+            "label": label,
+            "p95_change": round(p95_change, 3),
+            "query_change": query_change,
+            "regressed": p95_change > threshold or query_change > 0,
+        })
+    return rows
@@ -0,0 +1,47 @@
+import hashlib
+
+from django.core.cache import cache
+
+from job_portal.replicas import primary_reads
+
+from .models import Job
+
+JOB_DETAIL_CACHE_TIMEOUT = 600  # 10 minutes
+
+
+def _validators_key(job_id):
+    return f"job-detail:{job_id}:validators"
+
+
+def get_job_validators(job_id):
+    """
+    Return ``(etag, last_modified)`` for a job, or ``None`` if it does not
+    exist. Both derive from Job.updated_at and EmployerProfile.updated_at,
+    so answering a conditional GET never needs the full row.
+    """
+    key = _validators_key(job_id)
+    validators = cache.get(key)
+    if validators is None:
+        with primary_reads():
+            row = (
+                Job.objects.filter(pk=job_id)
+                .values_list('updated_at', 'employer__updated_at').first()
+            )
+        if row is None:
+            return None
+        job_updated, employer_updated = row
+        version = f"{job_id}:{job_updated.isoformat()}:{employer_updated.isoformat()}"
+        etag = '"%s"' % hashlib.md5(version.encode()).hexdigest()
+        validators = (etag, max(job_updated, employer_updated))
+        cache.set(key, validators, JOB_DETAIL_CACHE_TIMEOUT)
+    return validators
+
+
+def job_detail_payload_key(job_id, etag, host):
+    # The ETag versions the key, so stale payloads are never read back; the
+    # host is included because file fields render as absolute URLs.
+    return f"job-detail:{job_id}:payload:{hashlib.md5(f'{etag}:{host}'.encode()).hexdigest()}"
+
+
+def invalidate_job_detail(*job_ids):
+    cache.delete_many([_validators_key(job_id) for job_id in job_ids])
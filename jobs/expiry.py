@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .detail_cache import invalidate_job_detail
+from .facets import invalidate_job_facets
+from .models import Job
+
+
+def expire_jobs(batch_size=500, now=None):
+    """
+    Deactivate one batch of active jobs whose expires_at has passed; returns
+    how many. Batches are claimed with SKIP LOCKED, so several sweepers can
+    run at once and none holds locks on more than ``batch_size`` rows.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        job_ids = list(
+            Job.objects.filter(is_active=True, expires_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by('expires_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not job_ids:
+            return 0
+        Job.objects.filter(pk__in=job_ids).update(is_active=False, closed_at=now, updated_at=now)
+    # update() sends no post_save signals.
+    invalidate_job_facets()
+    invalidate_job_detail(*job_ids)
+    return len(job_ids)
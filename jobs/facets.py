@@ -0,0 +1,51 @@
+import hashlib
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count
+
+FACETS_CACHE_TIMEOUT = 300  # 5 minutes
+FACETS_VERSION_KEY = "job-facets:version"
+TOP_LOCATIONS = 10
+
+
+def facets_version():
+    cache.add(FACETS_VERSION_KEY, 1, None)
+    return cache.get(FACETS_VERSION_KEY, 1)
+
+
+def invalidate_job_facets():
+    """Bump the facet cache version; old entries are simply never read again."""
+    cache.add(FACETS_VERSION_KEY, 1, None)
+    cache.incr(FACETS_VERSION_KEY)
+
+
+def compute_job_facets(queryset):
+    """
+    Count jobs per job_type and per location for ``queryset`` in a single
+    GROUP BY query.
+    """
+    job_types = Counter()
+    locations = Counter()
+    rows = queryset.order_by().values_list('job_type', 'location').annotate(count=Count('id'))
+    for job_type, location, count in rows:
+        job_types[job_type] += count
+        locations[location] += count
+    return {
+        "job_type": dict(job_types),
+        "location": dict(locations.most_common(TOP_LOCATIONS)),
+    }
+
+
+def get_job_facets(queryset, scope, params):
+    """
+    Return facet counts for ``queryset``, cached per ``scope`` (who is asking)
+    and normalised filter ``params`` until the next Job write.
+    """
+    fingerprint = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    cache_key = f"job-facets:{facets_version()}:{scope}:{fingerprint}"
+    facets = cache.get(cache_key)
+    if facets is None:
+        facets = compute_job_facets(queryset)
+        cache.set(cache_key, facets, FACETS_CACHE_TIMEOUT)
+    return facets
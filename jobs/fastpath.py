@@ -0,0 +1,166 @@
+"""
+Read-only fast path for list endpoints.
+
+Instead of loading model instances and running a ModelSerializer per row,
+a page is read with ``values_list()`` and each tuple is turned into the
+same dict the serializer would produce. The mapping from serializer fields
+to query paths and converters is compiled once per serializer class and
+field set; serializers it cannot reproduce exactly (nested serializers,
+method fields, nullable relations, ...) fall back to the normal path.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from job_portal.metrics import timed
+
+from .fieldsets import SparseFieldsetMixin
+from .renderers import FastJSONRenderer
+
+
+def _values_path(model, source):
+    """The values() lookup for a dotted serializer source, or None if it is not a plain column."""
+    parts = source.split('.')
+    for position, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        last = position == len(parts) - 1
+        if field.is_relation:
+            # Only follow forward, non-null foreign keys: DRF skips or nulls
+            # the field when a relation is missing, values() cannot tell.
+            if not (field.many_to_one or field.one_to_one) or not field.concrete or field.null:
+                return None
+            model = field.related_model
+        elif not last:
+            return None
+    return '__'.join(parts)
+
+
+def _converter(field):
+    """A callable giving ``field.to_representation(value)`` for a values() value; None means unchanged."""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # values() already returns the related primary key.
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, serializers.UUIDField):
+        return str if field.uuid_format == 'hex_verbose' else field.to_representation
+    if isinstance(field, serializers.ChoiceField):
+        return field.to_representation
+    if isinstance(field, serializers.CharField):
+        return str
+    if isinstance(field, serializers.BooleanField):
+        return bool
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.FloatField):
+        return float
+    if isinstance(field, serializers.ReadOnlyField):
+        return None
+    return field.to_representation
+
+
+class ValuesRowSerializer:
+    """Serializes ``values_list()`` tuples exactly like a compiled serializer class serializes instances."""
+
+    def __init__(self, columns, paths):
+        # (field name, index into the row, converter) per output field.
+        self.columns = columns
+        self.paths = paths
+
+    def values(self, queryset):
+        # Named rows expose attributes such as ``created_at`` to the cursor paginator.
+        return queryset.values_list(*self.paths, named=True)
+
+    def to_representation(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, index, convert in self.columns:
+                value = row[index]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=256)
+def compile_row_serializer(serializer_class, names=None, extra=()):
+    """
+    Map the fields ``names`` (all fields when None) of ``serializer_class``
+    to query paths. ``extra`` paths are loaded too, e.g. for the paginator.
+    Returns None when the serializer cannot be reproduced from values().
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    paths, columns = list(extra), []
+    for name, field in serializer.fields.items():
+        if field.write_only or (names is not None and name not in names):
+            continue
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField,
+                              serializers.HiddenField, serializers.ManyRelatedField)):
+            return None
+        if isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None
+        path = _values_path(model, field.source) if field.source != '*' else None
+        if path is None:
+            return None
+        if path not in paths:
+            paths.append(path)
+        columns.append((name, paths.index(path), _converter(field)))
+    return ValuesRowSerializer(tuple(columns), tuple(paths))
+
+
+class ValuesListMixin(SparseFieldsetMixin):
+    """
+    List views whose GET responses are built from ``values_list()`` rows
+    and rendered with FastJSONRenderer. Responses are byte-identical to
+    the serializer's; ``values_fast_path = False`` turns the fast path off.
+    """
+    values_fast_path = True
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_row_serializer(self):
+        if not self.values_fast_path:
+            return None
+        names = self.get_requested_fields()
+        return compile_row_serializer(
+            self.get_serializer_class(), None if names is None else frozenset(names), tuple(self.always_loaded),
+        )
+
+    def paginate_keys_first(self):
+        """
+        Whether to paginate over the ``always_loaded`` columns alone and load
+        full rows for the chosen page only. Worth it when many matching rows
+        must be sorted before the page is cut, e.g. by relevance or within a
+        radius, so the sort does not carry every selected column.
+        """
+        return False
+
+    def serialize_list(self, queryset):
+        """Paginate and serialize ``queryset`` the way ListModelMixin.list does."""
+        row_serializer = self.get_row_serializer()
+        if row_serializer is not None and self.paginator is not None and self.paginate_keys_first():
+            keys = self.paginate_queryset(queryset.values_list(*self.always_loaded, named=True))
+            if keys is not None:
+                # always_loaded starts with the primary key, as do the rows.
+                rows = row_serializer.values(queryset.model._base_manager.filter(pk__in=[key[0] for key in keys]))
+                rows_by_pk = {row[0]: row for row in rows}
+                with timed("serialize"):
+                    data = row_serializer.to_representation(rows_by_pk[key[0]] for key in keys if key[0] in rows_by_pk)
+                return self.get_paginated_response(data)
+        if row_serializer is not None:
+            queryset = row_serializer.values(queryset)
+        page = self.paginate_queryset(queryset)
+        objects = queryset if page is None else page
+        with timed("serialize"):
+            if row_serializer is not None:
+                data = row_serializer.to_representation(objects)
+            else:
+                data = self.get_serializer(objects, many=True).data
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+    def list(self, request, *args, **kwargs):
+        return self.serialize_list(self.filter_queryset(self.get_queryset()))
@@ -0,0 +1,70 @@
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+VIEW_PARAM = 'view'
+COMPACT_VIEW = 'compact'
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializer that keeps only the fields named in its ``fields`` context entry, when one is given."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested is not None:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """
+    List views accepting ``?fields=a,b`` or ``?view=compact``. The requested
+    fields limit the serializer output and, through ``sparse_queryset``,
+    which columns the queryset loads, so unused text columns are never read.
+    """
+    compact_fields = ()
+    # Columns needed regardless of the fields requested, e.g. by the paginator.
+    always_loaded = ('id',)
+
+    def get_requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            params = self.request.query_params
+            names = None
+            if self.request.method == 'GET':
+                view = params.get(VIEW_PARAM)
+                if view is not None and view != COMPACT_VIEW:
+                    raise serializers.ValidationError({VIEW_PARAM: f"Unknown view; the only one is '{COMPACT_VIEW}'."})
+                if FIELDS_PARAM in params:
+                    names = [name.strip() for name in params[FIELDS_PARAM].split(',') if name.strip()]
+                    if not names:
+                        raise serializers.ValidationError({FIELDS_PARAM: "Name at least one field."})
+                elif view == COMPACT_VIEW:
+                    names = list(self.compact_fields)
+            if names is not None:
+                unknown = set(names) - set(self.get_serializer_class()().fields)
+                if unknown:
+                    raise serializers.ValidationError({FIELDS_PARAM: f"Unknown fields: {', '.join(sorted(unknown))}."})
+            self._requested_fields = names
+        return self._requested_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        return context
+
+    def sparse_queryset(self, queryset):
+        names = self.get_requested_fields()
+        if names is None:
+            return queryset
+        fields = self.get_serializer_class()().fields
+        paths = set(self.always_loaded)
+        for name in names:
+            source = fields[name].source
+            if source == '*':
+                return queryset
+            path = source.replace('.', '__')
+            if path.split('__')[0] not in queryset.query.annotations:
+                paths.add(path)
+        # Join only the relations the remaining fields read from.
+        related = {path.rsplit('__', 1)[0] for path in paths if '__' in path}
+        return queryset.select_related(None).select_related(*related).only(*paths)
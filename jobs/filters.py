@@ -0,0 +1,72 @@
+import math
+from datetime import timedelta
+
+from django.db.models.functions import Cos, Power, Radians, Sin
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.geo import EARTH_RADIUS_KM, cells_within
+from .models import Job
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 200
+
+
+class JobFilterSerializer(serializers.Serializer):
+    job_type = serializers.ChoiceField(choices=Job.JOB_TYPE_CHOICES, required=False)
+    location = serializers.CharField(max_length=255, required=False)
+    salary__gte = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    salary__lte = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    created_at__gte = serializers.DateTimeField(required=False)
+    created_at__lte = serializers.DateTimeField(required=False)
+    posted_within_days = serializers.IntegerField(min_value=1, max_value=365, required=False)
+    near = serializers.CharField(required=False, help_text="Latitude and longitude, e.g. 18.52,73.86.")
+    radius_km = serializers.FloatField(min_value=0.1, max_value=MAX_RADIUS_KM, required=False)
+
+    def validate_near(self, value):
+        try:
+            latitude, longitude = (float(part) for part in value.split(','))
+        except ValueError:
+            raise serializers.ValidationError("Must be 'latitude,longitude'.")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise serializers.ValidationError("Coordinates out of range.")
+        return (latitude, longitude)
+
+    def validate(self, attrs):
+        low, high = attrs.get('salary__gte'), attrs.get('salary__lte')
+        if low is not None and high is not None and low > high:
+            raise serializers.ValidationError({"salary__lte": "Must be greater than or equal to salary__gte."})
+        if 'radius_km' in attrs and 'near' not in attrs:
+            raise serializers.ValidationError({"near": "Required with radius_km."})
+        if 'near' in attrs:
+            attrs.setdefault('radius_km', DEFAULT_RADIUS_KM)
+        return attrs
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Jobs within ``radius_km`` of a point. The grid cells the circle touches
+    narrow the rows through job_active_cell_idx; only those rows get the
+    exact haversine test, done as ``hav(d / R) <= hav(radius / R)``.
+    """
+    phi = math.radians(latitude)
+    haversine = (
+        Power(Sin((Radians('latitude') - phi) / 2), 2)
+        + math.cos(phi) * Cos(Radians('latitude')) * Power(Sin((Radians('longitude') - math.radians(longitude)) / 2), 2)
+    )
+    return queryset.filter(geo_cell__in=cells_within(latitude, longitude, radius_km)).alias(
+        haversine=haversine,
+    ).filter(haversine__lte=math.sin(radius_km / (2 * EARTH_RADIUS_KM)) ** 2)
+
+
+def filter_jobs(queryset, filters):
+    """Apply validated ``JobFilterSerializer`` data to a Job queryset."""
+    filters = dict(filters)
+    days = filters.pop('posted_within_days', None)
+    near, radius_km = filters.pop('near', None), filters.pop('radius_km', None)
+    queryset = queryset.filter(**filters)
+    if near is not None:
+        queryset = within_radius(queryset, *near, radius_km)
+    if days is not None:
+        queryset = queryset.filter(created_at__gte=timezone.now() - timedelta(days=days))
+    return queryset
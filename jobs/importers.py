@@ -0,0 +1,119 @@
+import csv
+import json
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .facets import invalidate_job_facets
+from .models import Job
+from .recommendations import index_new_jobs
+from .serializers import JobSerializer
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 50000
+MAX_REPORTED_ERRORS = 500
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(upload):
+    name = (upload.name or '').lower()
+    if name.endswith('.csv') or upload.content_type == 'text/csv':
+        return FORMAT_CSV
+    if name.endswith(('.ndjson', '.jsonl')) or upload.content_type in ('application/x-ndjson', 'application/jsonl'):
+        return FORMAT_NDJSON
+    raise ImportFormatError("Upload a .csv or .ndjson file.")
+
+
+def decode_lines(upload):
+    """Yield the lines of an uploaded file as text; ImportFormatError names the first one that is not UTF-8."""
+    for line_number, line in enumerate(upload.file, start=1):
+        try:
+            yield line.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            raise ImportFormatError(f"Line {line_number} is not valid UTF-8; save the file as UTF-8 and upload it again.")
+
+
+def iter_rows(upload, fmt):
+    """
+    Yield ``(line_number, row)`` pairs from an uploaded file without reading
+    it into memory; ``row`` is a dict, or an error message for unparsable lines.
+    """
+    text = decode_lines(upload)
+    if fmt == FORMAT_CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Empty cells mean "not provided", so optional fields keep their defaults.
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ''}
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        yield line_number, row if isinstance(row, dict) else "Each line must be a JSON object."
+
+
+def import_jobs(upload, employer_profile):
+    """
+    Validate every row with JobSerializer and insert valid ones with
+    bulk_create in chunks, in one transaction. Returns a report with
+    per-row errors.
+    """
+    fmt = detect_format(upload)
+    # One serializer validates every row, as ListSerializer does with its
+    # child, so the field set is built once rather than per row.
+    validator = JobSerializer()
+    created = failed = 0
+    errors = []
+    pending = []
+
+    def flush():
+        nonlocal created
+        Job.objects.bulk_create(pending)
+        index_new_jobs(pending)
+        created += len(pending)
+        pending.clear()
+
+    # A file that turns out not to be UTF-8 part way is rejected as a whole.
+    with transaction.atomic():
+        for index, (line_number, row) in enumerate(iter_rows(upload, fmt)):
+            if index >= MAX_IMPORT_ROWS:
+                message = f"Imports are limited to {MAX_IMPORT_ROWS} rows; the rest of the file was skipped."
+                errors.append({'line': line_number, 'errors': {'non_field_errors': [message]}})
+                break
+            try:
+                if isinstance(row, str):
+                    raise ValidationError({'non_field_errors': [row]})
+                validated_data = validator.run_validation(row)
+            except ValidationError as exc:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'line': line_number, 'errors': exc.detail})
+                continue
+
+            job = Job(
+                employer=employer_profile,
+                company_name=employer_profile.company_name,
+                **validated_data,
+            )
+            job.locate()
+            pending.append(job)
+            if len(pending) >= IMPORT_CHUNK_SIZE:
+                flush()
+        if pending:
+            flush()
+
+    if created:
+        # bulk_create sends no post_save signals.
+        invalidate_job_facets()
+    return {'created': created, 'failed': failed, 'errors': errors}
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from jobs.archive import ARCHIVE_AFTER_DAYS, archive_applications
+
+
+class Command(BaseCommand):
+    help = (
+        "Move applications of jobs closed long ago into the archive table, "
+        "streaming the archived rows out as JSON lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--closed-days", type=int, default=ARCHIVE_AFTER_DAYS,
+                            help="Archive applications of jobs closed at least this many days ago.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--output", default="-", help="File to append archived rows to; '-' for stdout.")
+
+    def handle(self, *args, **options):
+        output = self.stdout if options["output"] == "-" else open(options["output"], "a", encoding="utf-8")
+        total = 0
+        try:
+            for row in archive_applications(options["closed_days"], options["batch_size"]):
+                output.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                total += 1
+        finally:
+            if output is not self.stdout:
+                output.close()
+        # stdout carries the rows themselves.
+        self.stderr.write(f"Archived {total} application(s).")
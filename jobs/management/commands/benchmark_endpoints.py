@@ -0,0 +1,63 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from jobs.benchmark import BenchmarkDataMissing, compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every API endpoint against data from generate_synthetic_data and report "
+        "p50/p95/p99 latency, query counts and throughput, optionally diffed against a baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--only", nargs="*", help="Endpoint labels to run, e.g. job-list apply-job.")
+        parser.add_argument("--output", help="Write the results to this JSON file (e.g. to store a new baseline).")
+        parser.add_argument("--baseline", help="Compare against results previously written with --output.")
+        parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative p95 growth before flagging.")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        # Throttles would turn repeated requests into 429s.
+        with override_settings(
+            RATE_LIMIT_STORE={"BACKEND": "accounts.throttling.DummyRateLimitStore"},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "localhost"],
+        ):
+            try:
+                results = run_benchmarks(options["iterations"], options["warmup"], options["only"])
+            except BenchmarkDataMissing as exc:
+                raise CommandError(str(exc))
+
+        self.stdout.write(f"{'endpoint':32} {'status':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'req/s':>8}")
+        for label, row in results.items():
+            self.stdout.write(
+                f"{label:32} {','.join(map(str, row['status'])):>8} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                f"{row['p99_ms']:>9.2f} {row['max_queries']:>8} {row['throughput_rps']:>8.1f}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as handle:
+                baseline = json.load(handle)
+            regressions = []
+            self.stdout.write(f"\n{'endpoint':32} {'p95':>9} {'queries':>8}")
+            for row in compare(results, baseline, options["threshold"]):
+                if row["p95_change"] is None:
+                    self.stdout.write(f"{row['label']:32} {'new':>9}")
+                    continue
+                line = f"{row['label']:32} {row['p95_change']:>+9.1%} {row['query_change']:>+8}"
+                if row["regressed"]:
+                    regressions.append(row["label"])
+                    line = self.style.ERROR(line + "  REGRESSION")
+                self.stdout.write(line)
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"Regressions in: {', '.join(regressions)}")
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.expiry import expire_jobs
+
+
+class Command(BaseCommand):
+    help = "Deactivate jobs whose expires_at has passed, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for expired jobs.")
+        parser.add_argument("--interval", type=float, default=60.0, help="Seconds to sleep when nothing has expired.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            expired = expire_jobs(options["batch_size"])
+            total += expired
+            if expired:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Deactivated {total} expired job(s)."))
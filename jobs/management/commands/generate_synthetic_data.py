@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.synthetic import SYNTHETIC_PASSWORD, SyntheticDataGenerator, flush_synthetic_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate deterministic users, profiles, jobs and applications with bulk_create. "
+        "Synthetic users log in with --password; their match scores are left stale for refresh_match_scores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--employer-ratio", type=float, default=0.1)
+        parser.add_argument("--jobs-per-employer", type=int, default=5, help="Average number of jobs per employer.")
+        parser.add_argument("--applications-per-candidate", type=int, default=3, help="Average applications per candidate.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--password", default=SYNTHETIC_PASSWORD)
+        parser.add_argument("--flush", action="store_true", help="Delete previously generated data first.")
+
+    def handle(self, *args, **options):
+        if not 0 < options["employer_ratio"] < 1:
+            raise CommandError("--employer-ratio must be between 0 and 1.")
+        if options["flush"]:
+            self.stdout.write(f"Deleted {flush_synthetic_data()} synthetic rows.")
+
+        started = time.monotonic()
+        generator = SyntheticDataGenerator(
+            seed=options["seed"], batch_size=options["batch_size"], password=options["password"],
+            log=lambda message: self.stdout.write(message) if options["verbosity"] > 1 else None,
+        )
+        counts = generator.generate(
+            options["users"],
+            employer_ratio=options["employer_ratio"],
+            jobs_per_employer=options["jobs_per_employer"],
+            applications_per_candidate=options["applications_per_candidate"],
+        )
+        summary = ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary} in {time.monotonic() - started:.1f}s."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from jobs.stats import rebuild_job_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute employer dashboard statistics and applications_count from the Application table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", action="append", dest="jobs", help="Only rebuild this job id (repeatable).")
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.filter(pk__in=options["jobs"]) if options["jobs"] else None
+        rows = rebuild_job_stats(jobs)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} statistics rows."))
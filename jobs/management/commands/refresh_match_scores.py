@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import refresh_stale_match_scores
+
+
+class Command(BaseCommand):
+    help = "Recompute application match scores flagged stale by profile or job edits."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for stale scores.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when nothing is stale.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            refreshed = refresh_stale_match_scores(options["batch_size"])
+            total += refreshed
+            if refreshed:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total} match scores."))
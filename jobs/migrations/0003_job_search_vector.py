@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:27
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from jobs.search import install_sqlite_fts
+
+# Postgres keeps Job.search_vector current with a trigger so that every write
+# path (ORM saves, bulk_create, raw SQL) stays searchable, and ranks with a GIN
+# index. SQLite (local tests) gets an FTS5 table kept in sync the same way,
+# see jobs.search.install_sqlite_fts.
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.company_name, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.requirements, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER jobs_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, company_name, description, requirements
+    ON jobs_job FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update()
+    """,
+    "UPDATE jobs_job SET title = title",
+    "CREATE INDEX job_search_vector_idx ON jobs_job USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS job_search_vector_idx",
+    "DROP TRIGGER IF EXISTS jobs_job_search_vector_trigger ON jobs_job",
+    "DROP FUNCTION IF EXISTS jobs_job_search_vector_update()",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS jobs_job_fts_insert",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_update",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_delete",
+    "DROP TABLE IF EXISTS jobs_job_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+def install_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        install_sqlite_fts(schema_editor.connection)
+    else:
+        _run({'postgresql': POSTGRES_FORWARD})(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            install_search_index,
+            _run({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
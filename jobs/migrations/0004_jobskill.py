@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from jobs.skills import extract_job_tokens
+
+
+def index_existing_jobs(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    for job in Job.objects.only('id', 'title', 'requirements').iterator(chunk_size=1000):
+        JobSkill.objects.bulk_create([JobSkill(job=job, token=token) for token in extract_job_tokens(job)])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tokens', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'job'], name='jobskill_token_job_idx')],
+                'unique_together': {('job', 'token')},
+            },
+        ),
+        migrations.RunPython(index_existing_jobs, migrations.RunPython.noop),
+    ]
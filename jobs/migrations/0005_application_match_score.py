@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_stale(apps, schema_editor):
+    # Scored by the refresh_match_scores worker rather than inside the migration.
+    apps.get_model('jobs', 'Application').objects.update(match_score_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobskill'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='match_score_stale',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-match_score'], name='application_job_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('match_score_stale', True)), fields=['id'], name='application_stale_score_idx'),
+        ),
+        migrations.RunPython(mark_existing_stale, migrations.RunPython.noop),
+    ]
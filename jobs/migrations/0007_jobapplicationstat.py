@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_stats(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    JobApplicationStat = apps.get_model('jobs', 'JobApplicationStat')
+    grouped = (
+        Application.objects.annotate(day=TruncDate('applied_at'))
+        .order_by().values('job_id', 'status', 'day').annotate(total=Count('pk'))
+    )
+    JobApplicationStat.objects.bulk_create(
+        (JobApplicationStat(job_id=row['job_id'], status=row['status'], day=row['day'], count=row['total'])
+         for row in grouped.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_applications_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('reviewed', 'Reviewed'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_stats', to='jobs.job')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'status', 'day'), name='jobstat_job_status_day_uniq')],
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
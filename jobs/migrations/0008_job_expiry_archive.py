@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+from datetime import timedelta
+
+import jobs.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_expiry(apps, schema_editor):
+    # Existing jobs expire JOB_LIFETIME_DAYS after they were posted, not
+    # all at once JOB_LIFETIME_DAYS after this migration.
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.update(expires_at=models.F('created_at') + timedelta(days=settings.JOB_LIFETIME_DAYS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_uploadsession'),
+        ('jobs', '0007_jobapplicationstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('job_id', models.UUIDField(db_index=True)),
+                ('job_title', models.CharField(max_length=255)),
+                ('applicant_id', models.UUIDField(db_index=True)),
+                ('applicant_email', models.EmailField(max_length=254)),
+                ('cover_letter', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('reviewed', 'Reviewed'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('match_score', models.FloatField()),
+                ('applied_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-applied_at'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_created_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_expiry, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='job',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, default=jobs.models.default_job_expiry, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', 'id'], name='job_active_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['expires_at'], name='job_active_expiry_idx'),
+        ),
+    ]
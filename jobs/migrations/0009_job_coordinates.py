@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:04
+
+from django.db import migrations, models
+
+from accounts.geo import geocode, grid_cell
+
+
+def locate_jobs(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    # A handful of distinct locations covers most rows: one UPDATE each.
+    for location in Job.objects.order_by().values_list('location', flat=True).distinct():
+        point = geocode(location)
+        if point:
+            Job.objects.filter(location=location).update(
+                latitude=point[0], longitude=point[1], geo_cell=grid_cell(*point),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_jobseekerprofile_coordinates'),
+        ('jobs', '0008_job_expiry_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['geo_cell', '-created_at', 'id'], name='job_active_cell_idx'),
+        ),
+        migrations.RunPython(locate_jobs, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,17 @@
 import uuid
+from datetime import timedelta
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from accounts.geo import geocode, grid_cell
 from accounts.models import EmployerProfile
 
+
+def default_job_expiry():
+    return timezone.now() + timedelta(days=settings.JOB_LIFETIME_DAYS)
+
+
 class Job(models.Model):
     JOB_TYPE_FULL_TIME = 'full_time'
     JOB_TYPE_PART_TIME = 'part_time'
@@ -24,19 +33,94 @@ class Job(models.Model):
     description = models.TextField()
     requirements = models.TextField()
     location = models.CharField(max_length=255)
+    # Derived from location by locate(); null when the gazetteer does not know it.
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geo_cell = models.IntegerField(null=True, blank=True, editable=False)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, default=JOB_TYPE_FULL_TIME)
     salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     company_name = models.CharField(max_length=255, blank=True)
     is_active = models.BooleanField(default=True)
+    # When is_active last turned False (on save or by expire_jobs); null while open.
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # expire_jobs deactivates the job once this has passed; null never expires.
+    expires_at = models.DateTimeField(null=True, blank=True, default=default_job_expiry)
+    # Maintained by jobs.applications.
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger (see migration 0003); never written from Python.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # The fields jobs.recommendations.match_score reads.
+    MATCH_SCORE_FIELDS = ('title', 'requirements', 'location', 'salary')
+    # Their values as last loaded or saved, so signal handlers can tell
+    # whether applications need rescoring.
+    _loaded_match_values = None
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', 'id']
+        indexes = [
+            # Only active jobs are listed to candidates, so the feed index
+            # leaves out the (ever growing) closed ones.
+            models.Index(fields=['-created_at', 'id'], condition=models.Q(is_active=True), name='job_active_feed_idx'),
+            models.Index(fields=['expires_at'], condition=models.Q(is_active=True), name='job_active_expiry_idx'),
+            models.Index(fields=['geo_cell', '-created_at', 'id'], condition=models.Q(is_active=True), name='job_active_cell_idx'),
+            models.Index(fields=['employer', '-created_at', 'id'], name='job_employer_created_idx'),
+            models.Index(fields=['closed_at'], condition=models.Q(is_active=False), name='job_closed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_match_values = {
+            name: values[field_names.index(name)] for name in cls.MATCH_SCORE_FIELDS if name in field_names
+        }
+        return instance
+
+    def changed_match_fields(self):
+        """MATCH_SCORE_FIELDS that differ from the loaded values; all of them for instances not loaded from the database."""
+        loaded = self._loaded_match_values
+        if loaded is None:
+            return set(self.MATCH_SCORE_FIELDS)
+        # Deferred fields that were never assigned are not in __dict__ and cannot have changed.
+        return {
+            name for name in self.MATCH_SCORE_FIELDS
+            if name in self.__dict__ and (name not in loaded or self.__dict__[name] != loaded[name])
+        }
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            self.locate()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude', 'geo_cell'}
+        if update_fields is None or 'is_active' in update_fields:
+            if self.is_active:
+                self.closed_at = None
+            elif self.closed_at is None:
+                self.closed_at = timezone.now()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'closed_at'}
+        if update_fields is None and not self._state.adding:
+            # applications_count is only ever changed by UPDATEs in
+            # jobs.applications; writing back the loaded value would undo
+            # applications made since this instance was read.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'applications_count'
+            ]
+        super().save(*args, **kwargs)
+
+    def locate(self):
+        """Set coordinates and grid cell from location; bulk_create callers must call this themselves."""
+        point = geocode(self.location)
+        self.latitude, self.longitude = point or (None, None)
+        self.geo_cell = grid_cell(*point) if point else None
+
 class Application(models.Model):
     APPLICATION_STATUS_SUBMITTED = 'submitted'
     APPLICATION_STATUS_REVIEWED = 'reviewed'
@@ -50,17 +134,104 @@ class Application(models.Model):
         (APPLICATION_STATUS_REJECTED, 'Rejected'),
     ]
 
+    # Accepted and rejected are final.
+    ALLOWED_STATUS_TRANSITIONS = {
+        APPLICATION_STATUS_SUBMITTED: {APPLICATION_STATUS_REVIEWED, APPLICATION_STATUS_ACCEPTED, APPLICATION_STATUS_REJECTED},
+        APPLICATION_STATUS_REVIEWED: {APPLICATION_STATUS_ACCEPTED, APPLICATION_STATUS_REJECTED},
+        APPLICATION_STATUS_ACCEPTED: set(),
+        APPLICATION_STATUS_REJECTED: set(),
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="applications")
     applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="applications")
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES, default=APPLICATION_STATUS_SUBMITTED)
+    # Fit between the applicant's profile and the job, see jobs.recommendations.match_score.
+    match_score = models.FloatField(default=0.0)
+    # Set when the profile or job changed; refresh_match_scores recomputes these rows.
+    match_score_stale = models.BooleanField(default=False)
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Status as last loaded or saved, so signal handlers can see transitions.
+    _loaded_status = None
+
     class Meta:
         unique_together = ['job', 'applicant']
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['job', '-match_score'], name='application_job_score_idx'),
+            models.Index(fields=['id'], condition=models.Q(match_score_stale=True), name='application_stale_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.applicant.email} applied for {self.job.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'status' in field_names:
+            instance._loaded_status = values[field_names.index('status')]
+        return instance
+
+    @classmethod
+    def statuses_leading_to(cls, status):
+        """Statuses an application may move to ``status`` from."""
+        return [source for source, targets in cls.ALLOWED_STATUS_TRANSITIONS.items() if status in targets]
+
+
+class JobSkill(models.Model):
+    """Inverted index from skill token to job, kept in sync by jobs.recommendations.index_job_skills."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="skill_tokens")
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ['job', 'token']
+        indexes = [
+            models.Index(fields=['token', 'job'], name='jobskill_token_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.job_id}"
+
+
+class JobApplicationStat(models.Model):
+    """
+    Number of applications to a job per status, bucketed by the local day
+    they were submitted. Kept current by jobs.stats; rebuild_job_stats repairs drift.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="application_stats")
+    status = models.CharField(max_length=20, choices=Application.APPLICATION_STATUS_CHOICES)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'status', 'day'], name='jobstat_job_status_day_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} {self.status} {self.day}: {self.count}"
+
+
+class ApplicationArchive(models.Model):
+    """Applications of long-closed jobs, moved out of Application by jobs.archive."""
+    id = models.UUIDField(primary_key=True, editable=False)
+    # Plain ids rather than foreign keys: archived rows outlive their jobs and users.
+    job_id = models.UUIDField(db_index=True)
+    job_title = models.CharField(max_length=255)
+    applicant_id = models.UUIDField(db_index=True)
+    applicant_email = models.EmailField()
+    cover_letter = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Application.APPLICATION_STATUS_CHOICES)
+    match_score = models.FloatField()
+    applied_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-applied_at']
 
     def __str__(self):
-        return f"{self.applicant.email} applied for {self.job.title}"
\ No newline at end of file
+        return f"{self.applicant_email} applied for {self.job_title} (archived)"
@@ -0,0 +1,106 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class JobCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (-created_at, id); matches Job.Meta.ordering and
+    the composite indexes on Job, so every page is a bounded index range scan.
+
+    DRF's cursor only keeps the first ordering field and skips rows sharing
+    its value with an OFFSET. Here the cursor holds every ordering field, so
+    positions are unique and a page never starts with an offset, however
+    many rows share a created_at.
+    """
+    ordering = ('-created_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*(order[1:] if order.startswith('-') else '-' + order for order in self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.keyset_filter(queryset.model, current_position, reverse))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def keyset_filter(self, model, position, reverse):
+        """Rows after ``position`` in the ordering (before it when ``reverse``), as one OR of prefix matches."""
+        try:
+            values = [
+                model._meta.get_field(order.lstrip('-')).to_python(value)
+                for order, value in zip(self.ordering, json.loads(position), strict=True)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        for index, order in enumerate(self.ordering):
+            lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+            step = Q(**{f"{order.lstrip('-')}__{lookup}": values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                step &= Q(**{previous.lstrip('-'): value})
+            condition |= step
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[order.lstrip('-')] if isinstance(instance, dict) else getattr(instance, order.lstrip('-'))
+            for order in ordering
+        ]
+        return json.dumps([value.isoformat() if hasattr(value, 'isoformat') else str(value) for value in values])
+
+
+class JobSearchPagination(PageNumberPagination):
+    # Relevance-ranked results have no stable keyset, and users rarely page
+    # deep into search results, so plain page numbers are enough here.
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,8 +1,10 @@
 from rest_framework import permissions
 
+from accounts.authentication import employer_profile_id
+
 class IsJobOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        return obj.employer.user == request.user
\ No newline at end of file
+        return obj.employer_id == employer_profile_id(request.user)
@@ -0,0 +1,114 @@
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Cast
+
+from .models import Application, Job, JobSkill
+from accounts.skills import parse_skills
+from .skills import extract_job_tokens
+
+# Score weights; a perfect match on all three criteria scores 1.0.
+SKILL_WEIGHT = 0.6
+LOCATION_WEIGHT = 0.25
+SALARY_WEIGHT = 0.15
+UNKNOWN_SALARY_FIT = 0.5  # neither side of the comparison is known
+
+
+def index_job_skills(job):
+    """Bring the JobSkill rows for ``job`` in line with its current text, touching only the difference."""
+    wanted = set(extract_job_tokens(job))
+    existing = set(JobSkill.objects.filter(job=job).values_list('token', flat=True))
+    if existing - wanted:
+        JobSkill.objects.filter(job=job, token__in=existing - wanted).delete()
+    if wanted - existing:
+        JobSkill.objects.bulk_create([JobSkill(job=job, token=token) for token in wanted - existing])
+
+
+def index_new_jobs(jobs):
+    """Index freshly inserted jobs (e.g. from bulk_create) in one INSERT."""
+    JobSkill.objects.bulk_create(
+        [JobSkill(job=job, token=token) for job in jobs for token in extract_job_tokens(job)]
+    )
+
+
+def location_fit(preferred_location):
+    if not preferred_location:
+        return Value(0.0)
+    return Case(When(location__icontains=preferred_location, then=Value(1.0)), default=Value(0.0))
+
+
+def salary_fit(expected_salary):
+    if expected_salary is None:
+        return Value(UNKNOWN_SALARY_FIT)
+    return Case(
+        When(salary__isnull=True, then=Value(UNKNOWN_SALARY_FIT)),
+        When(salary__gte=expected_salary, then=Value(1.0)),
+        default=Value(0.0),
+    )
+
+
+def match_score(profile, job):
+    """
+    Score one profile against one job with the same weights recommend_jobs
+    applies in SQL.
+    """
+    if profile is None:
+        return 0.0
+    tokens = parse_skills(profile.skills)
+    skill = len(set(tokens) & set(extract_job_tokens(job))) / len(tokens) if tokens else 0.0
+
+    preferred = profile.preferred_location.strip().lower()
+    location = 1.0 if preferred and preferred in job.location.lower() else 0.0
+
+    if profile.expected_salary is None or job.salary is None:
+        salary = UNKNOWN_SALARY_FIT
+    else:
+        salary = 1.0 if job.salary >= profile.expected_salary else 0.0
+
+    return round(SKILL_WEIGHT * skill + LOCATION_WEIGHT * location + SALARY_WEIGHT * salary, 4)
+
+
+def refresh_stale_match_scores(batch_size=500):
+    """Recompute one batch of applications flagged stale; returns how many were refreshed."""
+    from accounts.models import JobSeekerProfile
+
+    batch = list(
+        Application.objects.filter(match_score_stale=True)
+        .select_related('job')
+        .only('id', 'applicant_id', 'job__title', 'job__requirements', 'job__location', 'job__salary')[:batch_size]
+    )
+    if not batch:
+        return 0
+    profiles = JobSeekerProfile.objects.in_bulk(
+        {application.applicant_id for application in batch}, field_name='user_id'
+    )
+    for application in batch:
+        application.match_score = match_score(profiles.get(application.applicant_id), application.job)
+        application.match_score_stale = False
+    Application.objects.bulk_update(batch, ['match_score', 'match_score_stale'])
+    return len(batch)
+
+
+def recommend_jobs(profile, limit=20):
+    """
+    Rank active jobs for a JobSeekerProfile in a single query.
+
+    The candidate set comes from the JobSkill inverted index (jobs sharing at
+    least one skill token), and the score is computed by the database over
+    that whole set, so no job rows are scored in Python.
+    """
+    tokens = parse_skills(profile.skills)
+    queryset = Job.objects.select_related('employer').filter(is_active=True)
+
+    if tokens:
+        queryset = queryset.filter(skill_tokens__token__in=tokens).annotate(
+            skill_fit=Cast(Count('skill_tokens'), FloatField()) / len(tokens)
+        )
+    elif profile.preferred_location:
+        queryset = queryset.filter(location__icontains=profile.preferred_location).annotate(skill_fit=Value(0.0))
+    else:
+        return Job.objects.none()
+
+    return queryset.annotate(
+        score=SKILL_WEIGHT * F('skill_fit')
+        + LOCATION_WEIGHT * location_fit(profile.preferred_location)
+        + SALARY_WEIGHT * salary_fit(profile.expected_salary)
+    ).order_by('-score', '-created_at', 'id')[:limit]
@@ -0,0 +1,89 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'english'
+
+# bm25() column weights for the SQLite fallback, in jobs_job_fts column order:
+# job_id, title, company_name, requirements, description.
+SQLITE_BM25_WEIGHTS = (0.0, 10.0, 5.0, 2.0, 1.0)
+
+
+SQLITE_FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_job_fts USING fts5(
+        job_id UNINDEXED, title, company_name, requirements, description,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_insert AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts (job_id, title, company_name, requirements, description)
+        VALUES (new.id, new.title, new.company_name, new.requirements, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_update
+    AFTER UPDATE OF title, company_name, requirements, description ON jobs_job BEGIN
+        DELETE FROM jobs_job_fts WHERE job_id = old.id;
+        INSERT INTO jobs_job_fts (job_id, title, company_name, requirements, description)
+        VALUES (new.id, new.title, new.company_name, new.requirements, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_delete AFTER DELETE ON jobs_job BEGIN
+        DELETE FROM jobs_job_fts WHERE job_id = old.id;
+    END
+    """,
+    """
+    INSERT INTO jobs_job_fts (job_id, title, company_name, requirements, description)
+    SELECT id, title, company_name, requirements, description FROM jobs_job
+    WHERE id NOT IN (SELECT job_id FROM jobs_job_fts)
+    """,
+]
+
+
+def install_sqlite_fts(connection):
+    """
+    Create the FTS5 fallback index and its sync triggers if missing.
+
+    SQLite drops triggers whenever a migration rebuilds ``jobs_job``, so this
+    also runs after every ``migrate`` (see JobsConfig.ready).
+    """
+    with connection.cursor() as cursor:
+        for sql in SQLITE_FTS_SCHEMA:
+            cursor.execute(sql)
+
+
+def search_jobs(queryset, q):
+    """
+    Restrict ``queryset`` to jobs matching the free-text query ``q`` and
+    annotate each row with a ``rank`` (higher is more relevant).
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        )
+    return _search_jobs_sqlite(queryset, q)
+
+
+def _search_jobs_sqlite(queryset, q):
+    terms = re.findall(r'\w+', q)
+    if not terms:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
+    # Quote every term so user input can never be parsed as FTS5 syntax.
+    match = ' '.join(f'"{term}"' for term in terms)
+    weights = ', '.join(str(w) for w in SQLITE_BM25_WEIGHTS)
+    return queryset.filter(
+        id__in=RawSQL('SELECT job_id FROM jobs_job_fts WHERE jobs_job_fts MATCH %s', [match])
+    ).annotate(
+        rank=RawSQL(
+            f'SELECT -bm25(jobs_job_fts, {weights}) FROM jobs_job_fts '
+            'WHERE jobs_job_fts MATCH %s AND jobs_job_fts.job_id = jobs_job.id',
+            [match],
+        )
+    )
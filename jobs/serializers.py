@@ -1,8 +1,10 @@
+from django.utils import timezone
 from rest_framework import serializers
+from .fieldsets import SparseFieldsetSerializerMixin
 from .models import Job, Application
 from accounts.profile_serializers import EmployerProfileSerializer
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source='employer.company_name', read_only=True)
     
     class Meta:
@@ -10,10 +12,30 @@ class JobSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'employer', 'title', 'description', 'requirements', 
             'location', 'job_type', 'salary', 'company_name', 'is_active', 
-            'created_at', 'updated_at'
+            'expires_at', 'created_at', 'updated_at'
         ]
         read_only_fields = ('id', 'employer', 'created_at', 'updated_at')
 
+    def validate_expires_at(self, value):
+        # A full update may resend a closed job's past expiry unchanged.
+        if self.instance is not None and value == self.instance.expires_at:
+            return value
+        if value is not None and value <= timezone.now():
+            raise serializers.ValidationError("Must be in the future.")
+        return value
+
+    def validate(self, attrs):
+        expires_at = attrs.get('expires_at', getattr(self.instance, 'expires_at', None))
+        if attrs.get('is_active') and expires_at is not None and expires_at <= timezone.now():
+            raise serializers.ValidationError({"expires_at": "Set a future expiry to reactivate an expired job."})
+        return attrs
+
+class JobRecommendationSerializer(JobSerializer):
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ['score']
+
 class JobDetailSerializer(JobSerializer):
     
     employer_details = EmployerProfileSerializer(source='employer', read_only=True)
@@ -22,7 +44,7 @@ class JobDetailSerializer(JobSerializer):
         
         fields = JobSerializer.Meta.fields + ['employer_details']
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     applicant_email = serializers.EmailField(source='applicant.email', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
 
@@ -32,6 +54,38 @@ class ApplicationSerializer(serializers.ModelSerializer):
         model = Application
         fields = [
             'id', 'job', 'job_id', 'applicant', 'applicant_email', 'job_title', 
-            'cover_letter', 'status', 'applied_at', 'updated_at'
+            'cover_letter', 'status', 'match_score', 'applied_at', 'updated_at'
         ]
-        read_only_fields = ('id', 'job', 'applicant', 'applied_at', 'updated_at')
\ No newline at end of file
+        read_only_fields = ('id', 'job', 'applicant', 'match_score', 'applied_at', 'updated_at')
+
+class BulkApplicationStatusSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=[
+        Application.APPLICATION_STATUS_REVIEWED,
+        Application.APPLICATION_STATUS_ACCEPTED,
+        Application.APPLICATION_STATUS_REJECTED,
+    ])
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False, max_length=10000)
+    job = serializers.UUIDField(required=False)
+    from_status = serializers.ChoiceField(choices=Application.APPLICATION_STATUS_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if 'ids' not in attrs and 'job' not in attrs:
+            raise serializers.ValidationError("Provide application ids or a job to select applications.")
+        from_status = attrs.get('from_status')
+        if from_status and from_status not in Application.statuses_leading_to(attrs['status']):
+            raise serializers.ValidationError(
+                {"from_status": f"Applications cannot move from '{from_status}' to '{attrs['status']}'."}
+            )
+        return attrs
+
+class DailyCountSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    count = serializers.IntegerField()
+
+class JobDashboardSerializer(serializers.ModelSerializer):
+    status_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    daily = DailyCountSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'is_active', 'applications_count', 'status_counts', 'daily']
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import EmployerProfile, JobSeekerProfile
+from .applications import adjust_applications_count
+from .detail_cache import invalidate_job_detail
+from .facets import invalidate_job_facets
+from .models import Application, Job
+from .recommendations import index_job_skills
+from .stats import apply_stat_deltas, record_status_changes, stat_day
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def job_changed(sender, instance, **kwargs):
+    invalidate_job_facets()
+    invalidate_job_detail(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, **kwargs):
+    changed = instance.changed_match_fields()
+    if created or changed & {'title', 'requirements'}:
+        index_job_skills(instance)
+    if not created and changed:
+        Application.objects.filter(job=instance).update(match_score_stale=True)
+    instance._loaded_match_values = {name: getattr(instance, name) for name in Job.MATCH_SCORE_FIELDS}
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+def jobseeker_profile_saved(sender, instance, created, **kwargs):
+    if not created:
+        Application.objects.filter(applicant_id=instance.user_id).update(match_score_stale=True)
+
+
+@receiver(post_save, sender=EmployerProfile)
+def employer_profile_changed(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_job_detail(*instance.jobs.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_applications_count(instance.job_id, 1)
+        apply_stat_deltas({(instance.job_id, instance.status, stat_day(instance.applied_at)): 1})
+    elif instance._loaded_status is not None and instance._loaded_status != instance.status:
+        record_status_changes(
+            [(instance.job_id, instance._loaded_status, stat_day(instance.applied_at), 1)], instance.status,
+        )
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    adjust_applications_count(instance.job_id, -1)
+    status = instance._loaded_status or instance.status
+    apply_stat_deltas({(instance.job_id, status, stat_day(instance.applied_at)): -1})
@@ -0,0 +1,34 @@
+import re
+
+from accounts.skills import skill_words
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "of", "on",
+    "or", "the", "to", "with", "we", "you", "our", "will", "your", "years", "year", "experience",
+}
+MAX_PHRASE_WORDS = 2
+MAX_TOKENS_PER_JOB = 300
+
+
+def extract_job_tokens(job):
+    """
+    Index terms for a job: single words and two-word phrases from its title
+    and requirements, so both "python" and "machine learning" can match a
+    candidate's skill list. Past MAX_TOKENS_PER_JOB, single words are kept
+    ahead of phrases and earlier terms ahead of later ones.
+    """
+    chunks = [
+        [word for word in skill_words(chunk) if word]
+        for text in (job.title, job.requirements)
+        # Commas and other punctuation break phrases: "python, django" is two skills.
+        for chunk in re.split(r"[,;/|()\n]", text or "")
+    ]
+    tokens = {}
+    for size in range(1, MAX_PHRASE_WORDS + 1):
+        for words in chunks:
+            for start in range(len(words) - size + 1):
+                phrase = words[start:start + size]
+                if phrase[0] in STOPWORDS or phrase[-1] in STOPWORDS:
+                    continue
+                tokens.setdefault(" ".join(phrase)[:100], None)
+    return list(tokens)[:MAX_TOKENS_PER_JOB]
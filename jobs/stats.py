@@ -0,0 +1,99 @@
+"""
+Per-job application statistics, maintained incrementally.
+
+Every create, status change and delete turns into a +1/-1 delta on a
+(job, status, day) row of JobApplicationStat, where ``day`` is the local
+date the application was submitted. The employer dashboard only ever reads
+those rows, so its cost does not grow with the number of applications.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .applications import recount_applications
+from .models import Application, Job, JobApplicationStat
+
+DASHBOARD_DEFAULT_DAYS = 30
+DASHBOARD_MAX_DAYS = 365
+
+
+def stat_day(applied_at):
+    return timezone.localdate(applied_at)
+
+
+def apply_stat_deltas(deltas):
+    """
+    Add ``{(job_id, status, day): delta}`` to the stats table. Rows are
+    touched in sorted order so concurrent writers cannot deadlock. A
+    negative delta for a missing row is dropped: its job is being deleted,
+    or the table has drifted and needs rebuild_job_stats anyway.
+    """
+    for (job_id, status, day), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1], item[0][2])):
+        if not delta:
+            continue
+        rows = JobApplicationStat.objects.filter(job_id=job_id, status=status, day=day)
+        if rows.update(count=F('count') + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                JobApplicationStat.objects.create(job_id=job_id, status=status, day=day, count=delta)
+        except IntegrityError:
+            # A concurrent writer created the row first.
+            rows.update(count=F('count') + delta)
+
+
+def record_status_changes(groups, new_status):
+    """Record moving ``(job_id, old_status, day, count)`` groups of applications to ``new_status``."""
+    deltas = Counter()
+    for job_id, old_status, day, count in groups:
+        if old_status != new_status:
+            deltas[(job_id, old_status, day)] -= count
+            deltas[(job_id, new_status, day)] += count
+    apply_stat_deltas(deltas)
+
+
+def rebuild_job_stats(jobs=None):
+    """Recompute stats rows and applications_count from the Application table."""
+    jobs = Job.objects.all() if jobs is None else jobs
+    with transaction.atomic():
+        JobApplicationStat.objects.filter(job__in=jobs).delete()
+        grouped = (
+            Application.objects.filter(job__in=jobs)
+            .annotate(day=TruncDate('applied_at'))
+            .order_by().values('job_id', 'status', 'day')
+            .annotate(total=Count('pk'))
+        )
+        created = JobApplicationStat.objects.bulk_create(
+            (JobApplicationStat(job_id=row['job_id'], status=row['status'], day=row['day'], count=row['total'])
+             for row in grouped.iterator()),
+            batch_size=1000,
+        )
+        recount_applications(jobs)
+    return len(created)
+
+
+def dashboard_stats(job_ids, days=DASHBOARD_DEFAULT_DAYS):
+    """
+    Status totals and a per-day trend of the last ``days`` days for each job,
+    as ``{job_id: {"status_counts": {...}, "daily": [...]}}``.
+    """
+    since = timezone.localdate() - timedelta(days=days - 1)
+    statuses = [status for status, _ in Application.APPLICATION_STATUS_CHOICES]
+    result = {job_id: {"status_counts": dict.fromkeys(statuses, 0), "daily": []} for job_id in job_ids}
+
+    rows = JobApplicationStat.objects.filter(job_id__in=job_ids).order_by()
+    for job_id, status, total in rows.values('job_id', 'status').annotate(total=Sum('count')).values_list('job_id', 'status', 'total'):
+        result[job_id]["status_counts"][status] = total
+
+    daily = (
+        rows.filter(day__gte=since).values('job_id', 'day').annotate(total=Sum('count'))
+        .order_by('job_id', 'day').values_list('job_id', 'day', 'total')
+    )
+    for job_id, day, total in daily:
+        if total:
+            result[job_id]["daily"].append({"day": day, "count": total})
+    return result
@@ -0,0 +1,200 @@
+"""
+Deterministic synthetic data for load testing and benchmarks.
+
+Everything is derived from one seeded ``random.Random`` (primary keys
+included), so the same options always produce the same rows. Rows are
+written with bulk_create in batches and only primary keys are kept in
+memory, so millions of rows are fine.
+"""
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.geo import geocode
+from accounts.models import EmployerProfile, JobSeekerProfile, User
+from .facets import invalidate_job_facets
+from .models import Application, Job
+from .recommendations import index_new_jobs
+from .stats import rebuild_job_stats
+
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.example"
+SYNTHETIC_PASSWORD = "synthetic-pass"
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Sara", "Kabir", "Anaya", "Vivaan", "Nisha", "Arjun", "Tara"]
+LAST_NAMES = ["Sharma", "Iyer", "Nair", "Khan", "Patel", "Reddy", "Menon", "Das", "Gupta", "Singh", "Joshi", "Rao"]
+LOCATIONS = ["Bengaluru", "Pune", "Hyderabad", "Chennai", "Mumbai", "Delhi", "Kochi", "Kolkata", "Noida", "Remote"]
+SKILLS = [
+    "python", "django", "react", "postgresql", "aws", "docker", "kubernetes", "java", "spring", "go",
+    "typescript", "node", "sql", "machine learning", "figma", "kotlin", "swift", "terraform", "redis", "graphql",
+]
+TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Engineer", "DevOps Engineer", "Full Stack Developer",
+    "QA Engineer", "Product Designer", "Data Scientist", "Mobile Developer", "Site Reliability Engineer",
+]
+SENIORITY = ["Junior ", "", "", "Senior ", "Lead "]
+INDUSTRIES = ["Fintech", "Healthcare", "E-commerce", "SaaS", "Logistics", "Edtech"]
+APPLICATION_STATUS_WEIGHTS = [
+    (Application.APPLICATION_STATUS_SUBMITTED, 60),
+    (Application.APPLICATION_STATUS_REVIEWED, 25),
+    (Application.APPLICATION_STATUS_REJECTED, 10),
+    (Application.APPLICATION_STATUS_ACCEPTED, 5),
+]
+HISTORY_DAYS = 180
+
+
+def synthetic_email(kind, index):
+    return f"{kind}{index}@{SYNTHETIC_EMAIL_DOMAIN}"
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create keep the generated values of auto_now/auto_now_add fields."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def flush_synthetic_data():
+    """Delete every synthetic user; profiles, jobs and applications cascade."""
+    deleted, _ = User.objects.filter(email__endswith=f"@{SYNTHETIC_EMAIL_DOMAIN}").delete()
+    invalidate_job_facets()
+    return deleted
+
+
+class SyntheticDataGenerator:
+    def __init__(self, seed=42, batch_size=5000, password=SYNTHETIC_PASSWORD, log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.password_hash = make_password(password)
+        self.now = timezone.now()
+        self.log = log or (lambda message: None)
+        self.counts = {"users": 0, "employer_profiles": 0, "jobseeker_profiles": 0, "jobs": 0, "applications": 0}
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past(self, days=HISTORY_DAYS):
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(start + self.batch_size, total))
+
+    def make_user(self, kind, index, user_type):
+        return User(
+            id=self.uuid(),
+            email=synthetic_email(kind, index),
+            password=self.password_hash,
+            first_name=self.rng.choice(FIRST_NAMES),
+            last_name=self.rng.choice(LAST_NAMES),
+            user_type=user_type,
+            date_joined=self.past(),
+        )
+
+    def make_job(self, employer_profile):
+        title = self.rng.choice(SENIORITY) + self.rng.choice(TITLES)
+        skills = self.rng.sample(SKILLS, self.rng.randint(2, 5))
+        created_at = self.past()
+        job = Job(
+            id=self.uuid(),
+            employer_id=employer_profile.pk,
+            title=title,
+            description=f"{employer_profile.company_name} is hiring a {title} to work with {', '.join(skills)}.",
+            requirements=", ".join(skill.title() for skill in skills),
+            location=self.rng.choice(LOCATIONS),
+            job_type=self.rng.choice(Job.JOB_TYPE_CHOICES)[0],
+            salary=None if self.rng.random() < 0.2 else Decimal(self.rng.randrange(300000, 5000000, 10000)),
+            company_name=employer_profile.company_name,
+            is_active=self.rng.random() < 0.9,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        job.closed_at = None if job.is_active else created_at
+        job.locate()
+        return job
+
+    def make_profile(self, user):
+        profile = JobSeekerProfile(
+            user=user,
+            skills=", ".join(self.rng.sample(SKILLS, self.rng.randint(1, 6))),
+            preferred_location=self.rng.choice(LOCATIONS),
+            expected_salary=None if self.rng.random() < 0.3 else Decimal(self.rng.randrange(300000, 5000000, 10000)),
+        )
+        # bulk_create skips JobSeekerProfile.save, which fills these in.
+        profile.preferred_latitude, profile.preferred_longitude = geocode(profile.preferred_location) or (None, None)
+        return profile
+
+    def generate(self, users, employer_ratio=0.1, jobs_per_employer=5, applications_per_candidate=3):
+        employers = max(1, int(users * employer_ratio)) if users else 0
+        candidates = users - employers
+        statuses, weights = zip(*APPLICATION_STATUS_WEIGHTS)
+
+        job_ids = []
+        with explicit_timestamps(User._meta.get_field("date_joined"),
+                                 Job._meta.get_field("created_at"), Job._meta.get_field("updated_at")):
+            for batch in self.batches(employers):
+                with transaction.atomic():
+                    employer_users = User.objects.bulk_create([self.make_user("employer", i, User.EMPLOYER) for i in batch])
+                    profiles = EmployerProfile.objects.bulk_create([
+                        EmployerProfile(
+                            user=user,
+                            company_name=f"{user.last_name} {self.rng.choice(INDUSTRIES)} {index}",
+                            industry=self.rng.choice(INDUSTRIES),
+                            company_size=self.rng.choice(["1-10", "11-50", "51-200", "201-1000", "1000+"]),
+                        )
+                        for index, user in zip(batch, employer_users)
+                    ])
+                    jobs = [
+                        self.make_job(profile)
+                        for profile in profiles
+                        for _ in range(self.rng.randint(1, max(1, 2 * jobs_per_employer - 1)))
+                    ]
+                    for start in range(0, len(jobs), self.batch_size):
+                        chunk = Job.objects.bulk_create(jobs[start:start + self.batch_size])
+                        index_new_jobs(chunk)
+                job_ids.extend(job.pk for job in jobs)
+                self.counts["users"] += len(employer_users)
+                self.counts["employer_profiles"] += len(profiles)
+                self.counts["jobs"] += len(jobs)
+                self.log(f"{self.counts['employer_profiles']} employers, {self.counts['jobs']} jobs")
+
+        with explicit_timestamps(User._meta.get_field("date_joined"),
+                                 Application._meta.get_field("applied_at"), Application._meta.get_field("updated_at")):
+            for batch in self.batches(candidates):
+                with transaction.atomic():
+                    candidate_users = User.objects.bulk_create([self.make_user("candidate", i, User.CANDIDATE) for i in batch])
+                    JobSeekerProfile.objects.bulk_create([self.make_profile(user) for user in candidate_users])
+                    applications = []
+                    for user in candidate_users:
+                        count = min(len(job_ids), self.rng.randint(0, 2 * applications_per_candidate))
+                        for job_id in self.rng.sample(job_ids, count):
+                            applied_at = self.past(60)
+                            applications.append(Application(
+                                id=self.uuid(),
+                                job_id=job_id,
+                                applicant=user,
+                                status=self.rng.choices(statuses, weights)[0],
+                                match_score_stale=True,
+                                applied_at=applied_at,
+                                updated_at=applied_at,
+                            ))
+                    Application.objects.bulk_create(applications, batch_size=self.batch_size)
+                self.counts["users"] += len(candidate_users)
+                self.counts["jobseeker_profiles"] += len(candidate_users)
+                self.counts["applications"] += len(applications)
+                self.log(f"{self.counts['jobseeker_profiles']} candidates, {self.counts['applications']} applications")
+
+        rebuild_job_stats(Job.objects.filter(employer__user__email__endswith=f"@{SYNTHETIC_EMAIL_DOMAIN}"))
+        invalidate_job_facets()
+        return self.counts
@@ -1,3 +1,1008 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from job_portal.middleware import ReplicaRoutingMiddleware
+from job_portal.replicas import ReplicaRouter, pin_cache, pin_cache_key
+
+from accounts.authentication import PortalRefreshToken, employer_profile_id
+from accounts.geo import cells_within, geocode, grid_cell, haversine_km
+from accounts.models import User, EmployerProfile, JobSeekerProfile, RateLimitBucket
+from accounts.throttling import get_rate_limit_store
+from .applications import recount_applications, submit_application
+from .models import Job, Application, ApplicationArchive, JobApplicationStat, JobSkill
+from .expiry import expire_jobs
+from .fastpath import compile_row_serializer
+from .pagination import JobCursorPagination
+from .renderers import FastJSONRenderer
+from .search import search_jobs
+from .skills import MAX_TOKENS_PER_JOB
+from .serializers import ApplicationSerializer, JobSerializer
+
+
+class PortalTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_rate_limit_store.cache_clear()
+        self.employer = User.objects.create_user(email="employer@example.com", password="pass1234", user_type=User.EMPLOYER)
+        self.employer_profile = EmployerProfile.objects.create(user=self.employer, company_name="Acme")
+        employer_profile_id(self.employer)
+        self.candidate = User.objects.create_user(email="candidate@example.com", password="pass1234")
+        JobSeekerProfile.objects.create(user=self.candidate, skills="python,django")
+
+    def client_for(self, user):
+        client = APIClient()
+        # Token-authenticated requests carry the employer profile id; mirror that.
+        employer_profile_id(user)
+        client.force_authenticate(user)
+        return client
+
+    def create_job(self, **kwargs):
+        fields = {
+            "employer": self.employer_profile,
+            "title": "Backend Engineer",
+            "description": "Build APIs",
+            "requirements": "Python, Django",
+            "location": "Pune",
+            "company_name": self.employer_profile.company_name,
+        }
+        fields.update(kwargs)
+        return Job.objects.create(**fields)
+
+    def create_applicant(self, index):
+        return User.objects.create_user(email=f"applicant{index}@example.com", password="pass1234")
+
+
+class QueryCountTests(PortalTestCase):
+    """Every list/detail endpoint must cost the same number of queries however many rows it returns."""
+
+    def count_queries(self, client, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, client, url, add_rows):
+        add_rows(1)
+        baseline = self.count_queries(client, url)
+        add_rows(15)
+        self.assertEqual(self.count_queries(client, url), baseline)
+
+    def add_jobs(self, count):
+        for _ in range(count):
+            self.create_job()
+
+    def add_applications(self, count):
+        job = self.create_job()
+        start = Application.objects.count()
+        for index in range(start, start + count):
+            Application.objects.create(job=job, applicant=self.create_applicant(index))
+
+    def test_job_list_for_candidate(self):
+        self.assertConstantQueries(self.client_for(self.candidate), reverse("job-list"), self.add_jobs)
+
+    def test_job_list_for_employer(self):
+        self.assertConstantQueries(self.client_for(self.employer), reverse("job-list"), self.add_jobs)
+
+    def test_job_search(self):
+        self.assertConstantQueries(self.client_for(self.candidate), reverse("job-list") + "?q=backend", self.add_jobs)
+
+    def test_job_detail(self):
+        job = self.create_job()
+        # One query for the validators, one for the job joined to its employer.
+        with self.assertNumQueries(2):
+            response = self.client_for(self.candidate).get(reverse("job-detail", args=[job.pk]))
+        self.assertEqual(response.data["employer_details"]["company_name"], "Acme")
+
+    def test_my_applications(self):
+        def add_rows(count):
+            for _ in range(count):
+                Application.objects.create(job=self.create_job(), applicant=self.candidate)
+
+        self.assertConstantQueries(self.client_for(self.candidate), reverse("my-applications"), add_rows)
+
+    def test_employer_applications(self):
+        self.assertConstantQueries(
+            self.client_for(self.employer), reverse("employer-applications"), self.add_applications
+        )
+
+    def test_job_update_by_owner(self):
+        job = self.create_job()
+        # Load, UPDATE, diff the skill index (read tokens, insert new ones),
+        # then flag the job's application match scores stale.
+        with self.assertNumQueries(5):
+            response = self.client_for(self.employer).patch(
+                reverse("job-detail", args=[job.pk]), {"title": "Senior Backend Engineer"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+
+class JobCursorPaginationTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(self.candidate)
+        now = timezone.now()
+        self.jobs = [self.create_job(title=f"Job {index}") for index in range(5)]
+        for index, job in enumerate(self.jobs):
+            Job.objects.filter(pk=job.pk).update(created_at=now - timedelta(hours=index))
+
+    def feed_order(self):
+        return [str(pk) for pk in Job.objects.order_by("-created_at", "id").values_list("pk", flat=True)]
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        return ids
+
+    def test_next_and_previous_are_stable_across_inserts(self):
+        first = self.client.get(reverse("job-list") + "?page_size=2").data
+        second = self.client.get(first["next"]).data
+        # A job posted meanwhile lands before the cursor and shifts nothing.
+        self.create_job(title="Newest")
+        rest = self.walk(second["next"])
+        ids = [row["id"] for row in first["results"] + second["results"]] + rest
+        self.assertEqual(ids, [str(job.pk) for job in self.jobs])
+
+        previous = self.client.get(self.client.get(second["next"]).data["previous"]).data
+        self.assertEqual(previous["results"], second["results"])
+
+    def test_equal_created_at_is_broken_by_id(self):
+        Job.objects.update(created_at=timezone.now())
+        with CaptureQueriesContext(connection) as ctx:
+            ids = self.walk(reverse("job-list") + "?page_size=2")
+        self.assertEqual(ids, self.feed_order())
+        self.assertEqual(len(set(ids)), len(self.jobs))
+        # The cursor holds (created_at, id), so ties never turn into an OFFSET.
+        self.assertFalse([q for q in ctx.captured_queries if "OFFSET" in q["sql"]])
+
+        second = self.client.get(self.client.get(reverse("job-list") + "?page_size=2").data["next"]).data
+        previous = self.client.get(second["previous"]).data
+        self.assertEqual([row["id"] for row in previous["results"]], ids[:2])
+
+    def test_malformed_position_is_not_found(self):
+        for position in ("2026-01-01T00:00:00+00:00", '["yesterday", "x"]', '["2026-01-01T00:00:00+00:00"]'):
+            cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+            self.assertEqual(self.client.get(reverse("job-list"), {"cursor": cursor}).status_code, 404, position)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(JobCursorPagination, "max_page_size", 3):
+            response = self.client.get(reverse("job-list") + "?page_size=50")
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNotNone(response.data["next"])
+
+
+class JobSearchTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(self.candidate)
+
+    def search(self, q):
+        response = self.client.get(reverse("job-list"), {"q": q})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["title"] for row in response.data["results"]]
+
+    def test_title_matches_outrank_description_matches(self):
+        self.create_job(title="Platform Engineer", description="Kubernetes and Python everywhere")
+        self.create_job(title="Python Developer", description="Build APIs")
+        self.create_job(title="Designer", description="Figma", requirements="Sketch")
+        self.assertEqual(self.search("python"), ["Python Developer", "Platform Engineer"])
+
+    def test_query_syntax_in_user_input_is_quoted(self):
+        self.create_job(title="Python Developer")
+        for q in ('python"', "python*", "(python", "^python", "python -"):
+            self.assertEqual(self.search(q), ["Python Developer"], q)
+        # Operators and column filters are plain words that must all match.
+        for q in ("python OR rust", "title:python", "NEAR(python developer)"):
+            self.assertEqual(self.search(q), [], q)
+        self.assertEqual(self.search("developer python"), ["Python Developer"])
+
+    def test_blank_and_punctuation_only_queries(self):
+        self.create_job(title="Python Developer")
+        # A blank q is no search at all; punctuation alone matches nothing.
+        self.assertEqual(self.search("   "), ["Python Developer"])
+        self.assertEqual(self.search("?!*"), [])
+        self.assertFalse(search_jobs(Job.objects.all(), "--").exists())
+
+    def test_index_follows_updates_and_deletes(self):
+        job = self.create_job(title="Python Developer", requirements="Systems")
+        job.title = "Rust Developer"
+        job.save()
+        self.assertEqual(self.search("python"), [])
+        self.assertEqual(self.search("rust"), ["Rust Developer"])
+        job.delete()
+        self.assertEqual(self.search("rust"), [])
+
+
+class JobFilterFacetTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(self.candidate)
+
+    def get(self, query=""):
+        return self.client.get(reverse("job-list") + query)
+
+    def test_salary_range_is_validated(self):
+        self.create_job(title="Cheap", salary=Decimal("100"))
+        self.create_job(title="Dear", salary=Decimal("900"))
+        response = self.get("?salary__gte=500&salary__lte=100")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("salary__lte", response.data)
+        titles = [row["title"] for row in self.get("?salary__gte=50&salary__lte=500").data["results"]]
+        self.assertEqual(titles, ["Cheap"])
+
+    def test_posted_within_days(self):
+        old = self.create_job(title="Old")
+        self.create_job(title="New")
+        Job.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+        self.assertEqual([row["title"] for row in self.get("?posted_within_days=7").data["results"]], ["New"])
+        self.assertEqual(len(self.get("?posted_within_days=30").data["results"]), 2)
+        self.assertEqual(self.get("?posted_within_days=0").status_code, 400)
+
+    def test_facets_follow_creates_and_deactivation(self):
+        job = self.create_job(location="Pune")
+        self.assertEqual(self.get().data["facets"], {"job_type": {"full_time": 1}, "location": {"Pune": 1}})
+
+        self.create_job(location="Delhi", job_type=Job.JOB_TYPE_CONTRACT)
+        facets = self.get().data["facets"]
+        self.assertEqual(facets["job_type"], {"full_time": 1, "contract": 1})
+        self.assertEqual(facets["location"], {"Pune": 1, "Delhi": 1})
+
+        job.is_active = False
+        job.save()
+        self.assertEqual(self.get().data["facets"], {"job_type": {"contract": 1}, "location": {"Delhi": 1}})
+        # Facets are counted over the filtered jobs.
+        self.assertEqual(self.get("?location=Pune").data["facets"], {"job_type": {}, "location": {}})
+
+
+class JobDetailConditionalGetTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.url = reverse("job-detail", args=[self.job.pk])
+        self.client = self.client_for(self.candidate)
+
+    def test_validators_and_payload_are_cached(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"])
+        self.assertTrue(first["Last-Modified"])
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_job_save_invalidates(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.job.title = "Staff Engineer"
+        self.job.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["title"], "Staff Engineer")
+
+    def test_employer_profile_save_invalidates(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.employer_profile.company_name = "Acme Labs"
+        self.employer_profile.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["employer_details"]["company_name"], "Acme Labs")
+
+    def test_deleted_job_is_not_served_from_cache(self):
+        self.client.get(self.url)
+        self.job.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class JobBulkImportTests(PortalTestCase):
+    def upload(self, name, content, user=None):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client_for(user or self.employer).post(reverse("job-import"), {"file": upload}, format="multipart")
+
+    def test_csv_import_reports_bad_rows(self):
+        content = (
+            "title,description,requirements,location,job_type,salary\n"
+            "Engineer,Build,Python,Pune,full_time,50000\n"
+            "Designer,Draw,Figma,Delhi,,\n"
+            ",Missing title,None,Delhi,contract,\n"
+            "Analyst,Numbers,SQL,Pune,freelance,10\n"
+        )
+        with mock.patch("jobs.importers.IMPORT_CHUNK_SIZE", 1):
+            response = self.upload("jobs.csv", content)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [4, 5])
+        self.assertIn("title", response.data["errors"][0]["errors"])
+        self.assertEqual(
+            set(Job.objects.filter(employer=self.employer_profile).values_list("company_name", flat=True)), {"Acme"}
+        )
+
+    def test_ndjson_import(self):
+        content = (
+            '{"title": "Engineer", "description": "Build", "requirements": "Python", "location": "Pune"}\n'
+            "\n"
+            "not json\n"
+            "[1, 2]\n"
+        )
+        response = self.upload("jobs.ndjson", content)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [3, 4])
+
+    def test_imported_jobs_are_searchable_and_counted(self):
+        self.client_for(self.candidate).get(reverse("job-list"))  # warm the facet cache
+        self.upload("jobs.csv", "title,description,requirements,location\nPlumber,Fix,Pipes,Pune\n")
+        response = self.client_for(self.candidate).get(reverse("job-list") + "?q=plumber")
+        self.assertEqual([job["title"] for job in response.data["results"]], ["Plumber"])
+        self.assertEqual(response.data["facets"]["location"], {"Pune": 1})
+
+    def test_non_utf8_file_is_rejected_with_its_line(self):
+        content = "title,description,requirements,location\nEngineer,Build,Python,Pune\nBarista,Café,Coffee,Pune\n"
+        upload = SimpleUploadedFile("jobs.csv", content.encode("latin-1"))
+        with mock.patch("jobs.importers.IMPORT_CHUNK_SIZE", 1):
+            response = self.client_for(self.employer).post(reverse("job-import"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Line 3", response.data["file"][0])
+        self.assertFalse(Job.objects.exists())
+
+        upload = SimpleUploadedFile("jobs.ndjson", '{"title": "Café"}\n'.encode("latin-1"))
+        response = self.client_for(self.employer).post(reverse("job-import"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Line 1", response.data["file"][0])
+
+    def test_rejects_unknown_format_and_candidates(self):
+        self.assertEqual(self.upload("jobs.xlsx", "x").status_code, 400)
+        self.assertEqual(self.upload("jobs.csv", "title\nx\n", user=self.candidate).status_code, 403)
+
+
+class BulkApplicationStatusTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.applications = [
+            Application.objects.create(job=self.job, applicant=self.create_applicant(index)) for index in range(4)
+        ]
+        other_employer = User.objects.create_user(email="other@example.com", password="pass1234", user_type=User.EMPLOYER)
+        other_job = self.create_job(employer=EmployerProfile.objects.create(user=other_employer))
+        self.foreign = Application.objects.create(job=other_job, applicant=self.candidate)
+        self.url = reverse("employer-applications-status")
+
+    def post(self, data):
+        return self.client_for(self.employer).post(self.url, data, format="json")
+
+    def statuses(self):
+        return sorted(Application.objects.filter(job=self.job).values_list("status", flat=True))
+
+    def test_update_by_ids_moves_stats(self):
+        ids = [str(app.pk) for app in self.applications[:2]] + [str(self.foreign.pk)]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post({"status": "reviewed", "ids": ids})
+        self.assertEqual(response.data, {"updated": 2, "skipped": 1})
+        # Applications are counted and moved by one statement each, not read row by row.
+        self.assertEqual(
+            [q["sql"].split()[0] for q in ctx.captured_queries if '"jobs_application"' in q["sql"].split("WHERE")[0]],
+            ["SELECT", "UPDATE"],
+        )
+        self.assertEqual(self.statuses(), ["reviewed", "reviewed", "submitted", "submitted"])
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.status, "submitted")
+        self.assertEqual(
+            dict(JobApplicationStat.objects.filter(job=self.job).values_list("status", "count")),
+            {"submitted": 2, "reviewed": 2},
+        )
+
+    def test_update_by_job_filter(self):
+        Application.objects.filter(pk=self.applications[0].pk).update(status="rejected")
+        response = self.post({"status": "accepted", "job": str(self.job.pk), "from_status": "submitted"})
+        self.assertEqual(response.data, {"updated": 3})
+        self.assertEqual(self.statuses(), ["accepted", "accepted", "accepted", "rejected"])
+
+    def test_final_statuses_are_not_reopened(self):
+        self.post({"status": "rejected", "job": str(self.job.pk)})
+        response = self.post({"status": "reviewed", "job": str(self.job.pk)})
+        self.assertEqual(response.data, {"updated": 0})
+        self.assertEqual(self.post({"status": "reviewed", "job": str(self.job.pk), "from_status": "accepted"}).status_code, 400)
+
+    def test_requires_a_selection(self):
+        self.assertEqual(self.post({"status": "reviewed"}).status_code, 400)
+        response = self.client_for(self.candidate).post(self.url, {"status": "reviewed", "ids": [str(self.foreign.pk)]}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+class JobRecommendationTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        profile = self.candidate.jobseeker_profile
+        profile.skills = "Python, Machine Learning, SQL"
+        profile.preferred_location = "Pune"
+        profile.expected_salary = 50000
+        profile.save()
+        self.url = reverse("job-recommendations")
+
+    def titles(self):
+        response = self.client_for(self.candidate).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [job["title"] for job in response.data]
+
+    def test_ranks_by_skills_location_and_salary(self):
+        self.create_job(title="ML Engineer", requirements="Python, machine learning, SQL", location="Pune", salary=60000)
+        self.create_job(title="Data Analyst", requirements="SQL, Excel", location="Pune", salary=40000)
+        self.create_job(title="Remote ML", requirements="Python, machine learning", location="Berlin", salary=90000)
+        self.create_job(title="Chef", requirements="Cooking", location="Pune", salary=90000)
+        self.create_job(title="Closed ML", requirements="Python, machine learning, SQL", is_active=False)
+        self.assertEqual(self.titles(), ["ML Engineer", "Remote ML", "Data Analyst"])
+
+    def test_index_follows_job_edits(self):
+        job = self.create_job(title="Engineer", requirements="Java")
+        self.assertEqual(self.titles(), [])
+        job.requirements = "Python and Java"
+        job.save()
+        self.assertEqual(self.titles(), ["Engineer"])
+        self.assertEqual(set(JobSkill.objects.filter(job=job).values_list("token", flat=True)), {"engineer", "java", "python"})
+
+    def test_long_requirements_keep_their_skills(self):
+        prose = " ".join(f"duty{index}" for index in range(200))
+        job = self.create_job(title="Engineer", requirements=f"{prose}, python, sql, typescript")
+        tokens = set(JobSkill.objects.filter(job=job).values_list("token", flat=True))
+        self.assertLessEqual(len(tokens), MAX_TOKENS_PER_JOB)
+        self.assertTrue({"python", "sql", "typescript"} <= tokens)
+        self.assertEqual(self.titles(), ["Engineer"])
+
+    def test_only_candidates(self):
+        self.assertEqual(self.client_for(self.employer).get(self.url).status_code, 403)
+
+
+class ApplicationMatchScoreTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job(requirements="Python, Django", location="Pune")
+
+    def apply(self, user):
+        response = self.client_for(user).post(reverse("apply-job", args=[self.job.pk]), {"cover_letter": "Hi"})
+        self.assertEqual(response.status_code, 201, response.content)
+        return Application.objects.get(pk=response.data["id"])
+
+    def add_candidate(self, index, **profile):
+        user = self.create_applicant(index)
+        JobSeekerProfile.objects.create(user=user, **profile)
+        return user
+
+    def test_scored_on_apply_and_ranked(self):
+        weak = self.apply(self.add_candidate(1, skills="java"))
+        strong = self.apply(self.add_candidate(2, skills="python,django", preferred_location="pune"))
+        self.assertGreater(strong.match_score, weak.match_score)
+
+        response = self.client_for(self.employer).get(reverse("employer-applications") + "?ordering=-match_score")
+        self.assertEqual([row["id"] for row in response.data], [str(strong.pk), str(weak.pk)])
+
+    def test_profile_edit_marks_stale_until_refreshed(self):
+        user = self.add_candidate(1, skills="java")
+        application = self.apply(user)
+        profile = user.jobseeker_profile
+        profile.skills = "python, django"
+        profile.save()
+
+        application.refresh_from_db()
+        self.assertTrue(application.match_score_stale)
+        old_score = application.match_score
+
+        call_command("refresh_match_scores", stdout=mock.MagicMock())
+        application.refresh_from_db()
+        self.assertFalse(application.match_score_stale)
+        self.assertGreater(application.match_score, old_score)
+
+    def test_job_edit_marks_stale(self):
+        application = self.apply(self.add_candidate(1, skills="python"))
+        self.job.requirements = "Go"
+        self.job.save()
+        application.refresh_from_db()
+        self.assertTrue(application.match_score_stale)
+
+    def test_edits_that_do_not_affect_the_score_keep_it_fresh(self):
+        application = self.apply(self.add_candidate(1, skills="python"))
+        job = Job.objects.get(pk=self.job.pk)
+        job.description = "Build and run APIs"
+        job.is_active = False
+        job.expires_at = None
+        job.save()
+        job.location = "Pune"
+        job.save(update_fields=["location"])
+        application.refresh_from_db()
+        self.assertFalse(application.match_score_stale)
+
+        response = self.client_for(self.employer).patch(
+            reverse("job-detail", args=[self.job.pk]), {"salary": "90000"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        application.refresh_from_db()
+        self.assertTrue(application.match_score_stale)
+
+
+class SyntheticDataTests(TestCase):
+    def generate(self):
+        call_command("generate_synthetic_data", "--users", "40", "--seed", "7", "--flush", stdout=mock.MagicMock())
+        return sorted(Application.objects.values_list("id", "job_id", "applicant_id", "status"))
+
+    def test_generation_is_deterministic(self):
+        first = self.generate()
+        self.assertTrue(first)
+        self.assertEqual(User.objects.filter(user_type=User.EMPLOYER).count(), 4)
+        self.assertEqual(JobSkill.objects.values("job").distinct().count(), Job.objects.count())
+        self.assertEqual(self.generate(), first)
+
+    def test_benchmark_covers_endpoints_without_writing(self):
+        self.generate()
+        before = (Job.objects.count(), Application.objects.count(), User.objects.count())
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            call_command("benchmark_endpoints", "--iterations", "2", "--warmup", "0",
+                         "--output", output.name, stdout=mock.MagicMock())
+            results = json.load(output)
+        self.assertIn("apply-job", results)
+        for label, row in results.items():
+            self.assertTrue(all(code < 400 for code in row["status"]), (label, row))
+        self.assertEqual((Job.objects.count(), Application.objects.count(), User.objects.count()), before)
+
+
+class RequestMetricsTests(PortalTestCase):
+    def test_server_timing_and_metrics(self):
+        self.create_job()
+        response = self.client_for(self.candidate).get(reverse("job-list"))
+        timing = dict(entry.split(";", 1) for entry in response["Server-Timing"].split(", "))
+        self.assertEqual(set(timing), {"db", "view", "serialize", "render", "total"})
+        durations = {name: float(value.split("dur=")[1].split(";")[0]) for name, value in timing.items()}
+        # The phases leave out the SQL they ran and each other, so the parts fit in the total.
+        parts = ("db", "view", "serialize", "render")
+        self.assertLessEqual(sum(durations[name] for name in parts), durations["total"] + 0.05)
+        self.assertRegex(timing["db"], r'desc="\d+ queries"')
+
+        with self.settings(METRICS_TOKEN="s3cret"):
+            metrics = APIClient().get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret").content.decode()
+        self.assertIn('http_request_duration_seconds_count{url_name="job-list",method="GET"}', metrics)
+        self.assertIn('http_responses_total{url_name="job-list",method="GET",status="200"}', metrics)
+        for phase in ("view", "serialize", "render"):
+            self.assertIn(
+                f'http_request_phase_duration_seconds_count{{url_name="job-list",method="GET",phase="{phase}"}}', metrics,
+            )
+        self.assertIn("outbound_email_queue_depth 0", metrics)
+
+    def test_slow_requests_are_logged_with_sql(self):
+        with self.settings(SLOW_REQUEST_THRESHOLD_MS=0), self.assertLogs("job_portal.slow_requests") as logs:
+            self.client_for(self.candidate).get(reverse("job-list"))
+        self.assertIn("(job-list)", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    def test_metrics_token(self):
+        # Without a token the endpoint is only open in DEBUG.
+        self.assertEqual(APIClient().get(reverse("metrics")).status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(APIClient().get(reverse("metrics")).status_code, 200)
+        with self.settings(METRICS_TOKEN="s3cret"):
+            self.assertEqual(APIClient().get(reverse("metrics")).status_code, 403)
+            response = APIClient().get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+            self.assertEqual(response.status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(PortalTestCase):
+    """The 'replica' test database stays empty, like a replica lagging behind every write."""
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        super().setUp()
+        # Pins need a cache shared by workers but not served by the database.
+        pins_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pins_dir)
+        pins = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": pins_dir}
+        override = self.settings(CACHES={**settings.CACHES, "pins": pins})
+        override.enable()
+        self.addCleanup(override.disable)
+        self.job = self.create_job()
+
+    def token_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {PortalRefreshToken.for_user(user).access_token}")
+        return client
+
+    def job_titles(self, client):
+        response = client.get(reverse("job-list"))
+        self.assertEqual(response.status_code, 200)
+        return [row["title"] for row in response.data["results"]]
+
+    def test_safe_reads_go_to_the_replica(self):
+        self.assertEqual(self.job_titles(self.token_client(self.candidate)), [])
+        # Outside requests everything stays on the primary.
+        self.assertEqual(ReplicaRouter().db_for_read(Job), "default")
+
+    def test_writers_read_their_writes(self):
+        client = self.token_client(self.employer)
+        response = client.patch(reverse("job-detail", args=[self.job.pk]), {"title": "Staff Engineer"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db_primary", response.cookies)
+
+        # Pinned by the cookie, and by user id for clients that drop cookies.
+        self.assertEqual(self.job_titles(client), ["Staff Engineer"])
+        self.assertEqual(self.job_titles(self.token_client(self.employer)), ["Staff Engineer"])
+        self.assertEqual(self.job_titles(self.token_client(self.candidate)), [])
+
+        # Any worker sees the pin: it lives in the shared cache, not this process's.
+        cache.clear()
+        self.assertEqual(self.job_titles(self.token_client(self.employer)), ["Staff Engineer"])
+
+        pin_cache().delete(pin_cache_key(self.employer.pk))
+        self.assertEqual(self.job_titles(self.token_client(self.employer)), [])
+
+    @override_settings(RATE_LIMIT_STORE={"BACKEND": "accounts.throttling.DatabaseRateLimitStore"})
+    def test_counting_requests_does_not_pin(self):
+        client = self.token_client(self.candidate)
+        self.assertEqual(self.job_titles(client), [])
+        self.assertEqual(self.job_titles(client), [])
+        self.assertTrue(RateLimitBucket.objects.filter(key__contains=str(self.candidate.pk)).exists())
+
+    def test_process_local_or_database_pin_cache_is_refused(self):
+        for alias in ("default", "shared"):
+            with self.settings(REPLICA_PIN_CACHE=alias), self.assertRaises(ImproperlyConfigured):
+                ReplicaRoutingMiddleware(lambda request: None)
+
+
+class ApplicationSubmitTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.url = reverse("apply-job", args=[self.job.pk])
+
+    def test_duplicate_is_a_conflict_not_an_error(self):
+        client = self.client_for(self.candidate)
+        self.assertEqual(client.post(self.url, {"cover_letter": "Hi"}).status_code, 201)
+        # No pre-check: the unique constraint rejects the second insert.
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post(self.url, {"cover_letter": "Again"})
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith('SELECT') and '"jobs_application"' in q["sql"]])
+        self.assertEqual(Application.objects.filter(job=self.job).count(), 1)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+
+    def test_counter_follows_creates_and_deletes(self):
+        for index in range(3):
+            self.client_for(self.create_applicant(index)).post(self.url, {})
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 3)
+
+        Application.objects.filter(job=self.job).first().delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 2)
+
+        Job.objects.filter(pk=self.job.pk).update(applications_count=40)
+        recount_applications()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 2)
+
+    def test_saving_a_stale_job_keeps_the_counter(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        self.client_for(self.candidate).post(self.url, {})
+        stale.title = "Staff Engineer"
+        stale.save()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, "Staff Engineer")
+        self.assertEqual(self.job.applications_count, 1)
+
+    def test_apply_leaves_cached_job_detail_alone(self):
+        client = self.client_for(self.candidate)
+        detail_url = reverse("job-detail", args=[self.job.pk])
+        response = client.get(detail_url)
+        self.assertNotIn("applications_count", response.data)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(self.url, {})
+        # The count is only shown to the employer, so applying keeps the ETag.
+        self.assertEqual(client.get(detail_url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.assertEqual(self.client_for(self.employer).get(reverse("employer-dashboard")).data["results"][0]["applications_count"], 1)
+
+    def test_other_integrity_errors_are_not_duplicates(self):
+        serializer = mock.Mock()
+        serializer.save.side_effect = IntegrityError("FOREIGN KEY constraint failed")
+        with self.assertRaises(IntegrityError):
+            submit_application(serializer, self.job, self.candidate)
+
+
+class EmployerDashboardTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.applications = [
+            Application.objects.create(job=self.job, applicant=self.create_applicant(index)) for index in range(3)
+        ]
+
+    def stats(self):
+        return sorted(JobApplicationStat.objects.filter(job=self.job).values_list("status", "count"))
+
+    def test_stats_follow_creates_status_changes_and_deletes(self):
+        self.assertEqual(self.stats(), [("submitted", 3)])
+        application = Application.objects.get(pk=self.applications[0].pk)
+        application.status = "reviewed"
+        application.save()
+        self.applications[1].delete()
+        self.assertEqual(self.stats(), [("reviewed", 1), ("submitted", 1)])
+
+        JobApplicationStat.objects.all().delete()
+        call_command("rebuild_job_stats", stdout=mock.MagicMock())
+        self.assertEqual(self.stats(), [("reviewed", 1), ("submitted", 1)])
+
+    def test_dashboard_reads_the_stats_table(self):
+        other_job = self.create_job(title="Designer")
+        client = self.client_for(self.employer)
+        with self.assertNumQueries(3):  # page of jobs, status totals, daily trend
+            response = client.get(reverse("employer-dashboard"))
+        rows = {row["id"]: row for row in response.data["results"]}
+        self.assertEqual(rows[str(self.job.pk)]["applications_count"], 3)
+        self.assertEqual(rows[str(self.job.pk)]["status_counts"],
+                         {"submitted": 3, "reviewed": 0, "accepted": 0, "rejected": 0})
+        self.assertEqual(rows[str(self.job.pk)]["daily"], [{"day": str(timezone.localdate()), "count": 3}])
+        self.assertEqual(rows[str(other_job.pk)]["daily"], [])
+        self.assertEqual(self.client_for(self.candidate).get(reverse("employer-dashboard")).status_code, 403)
+
+
+class SparseFieldsetTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        for _ in range(5):
+            self.create_job(description="Long description. " * 500)
+
+    def get_jobs(self, query):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_for(self.candidate).get(reverse("job-list") + query)
+        sql = " ".join(q["sql"] for q in ctx.captured_queries if '"jobs_job"' in q["sql"])
+        return response, sql
+
+    def test_compact_view_skips_description(self):
+        full, full_sql = self.get_jobs("")
+        compact, compact_sql = self.get_jobs("?view=compact")
+        self.assertEqual(compact.status_code, 200)
+        self.assertEqual(set(compact.data["results"][0]),
+                         {"id", "title", "company_name", "location", "job_type", "salary", "is_active", "created_at"})
+        self.assertGreater(len(full.content), 5 * len(compact.content))
+        self.assertIn('"description"', full_sql)
+        self.assertNotIn('"description"', compact_sql)
+        self.assertNotIn('"search_vector"', full_sql)
+
+    def test_fields_param(self):
+        response, _ = self.get_jobs("?fields=id,title")
+        self.assertEqual([set(row) for row in response.data["results"]], [{"id", "title"}] * 5)
+        self.assertIn("next", response.data)
+
+        response, _ = self.get_jobs("?fields=id,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.data)
+
+        for query, param in (("?fields=", "fields"), ("?fields=,", "fields"), ("?view=bogus", "view")):
+            response, _ = self.get_jobs(query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn(param, response.data)
+
+    def test_compact_applications(self):
+        job = self.create_job()
+        Application.objects.create(job=job, applicant=self.candidate, cover_letter="Hi")
+        response = self.client_for(self.candidate).get(reverse("my-applications") + "?view=compact")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["job_title"], "Backend Engineer")
+        self.assertNotIn("cover_letter", response.data[0])
+
+
+class ValuesFastPathTests(PortalTestCase):
+    """The values_list() path and FastJSONRenderer must produce exactly the serializer's bytes."""
+
+    def setUp(self):
+        super().setUp()
+        jobs = [
+            self.create_job(title="Ingénieur \u2028 Backend", salary=Decimal("1200000.5")),
+            self.create_job(title="Designer", salary=None),
+            self.create_job(title="Data \u2029 Engineer", salary=Decimal("99.99"), location="München"),
+        ]
+        for index, job in enumerate(jobs):
+            for applicant_index in range(3):
+                applicant = self.candidate if applicant_index == 0 else self.create_applicant(10 * index + applicant_index)
+                Application.objects.create(job=job, applicant=applicant, cover_letter="Привет",
+                                           match_score=[0.0, 0.1234, 1.0][applicant_index])
+
+    def assertSameBytes(self, user, url):
+        client = self.client_for(user)
+        fast = client.get(url)
+        with mock.patch("jobs.fastpath.ValuesListMixin.values_fast_path", False), \
+                mock.patch("jobs.fastpath.ValuesListMixin.renderer_classes", [JSONRenderer]):
+            slow = client.get(url)
+        self.assertEqual(fast.status_code, 200, fast.content)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_job_list(self):
+        for query in ("", "?view=compact", "?fields=salary,company_name,employer", "?page_size=2", "?location=München",
+                      "?q=engineer", "?near=18.52,73.86&page_size=2"):
+            self.assertSameBytes(self.candidate, reverse("job-list") + query)
+        self.assertSameBytes(self.employer, reverse("job-list"))
+
+    def test_application_lists(self):
+        self.assertSameBytes(self.candidate, reverse("my-applications"))
+        self.assertSameBytes(self.candidate, reverse("my-applications") + "?view=compact")
+        self.assertSameBytes(self.employer, reverse("employer-applications") + "?ordering=-match_score")
+        self.assertSameBytes(self.employer, reverse("employer-applications") + "?fields=applicant_email,job_id,job_title")
+
+    def test_reads_rows_without_instances(self):
+        self.assertIsNotNone(compile_row_serializer(JobSerializer))
+        self.assertIsNotNone(compile_row_serializer(ApplicationSerializer))
+        with mock.patch("jobs.serializers.JobSerializer.to_representation") as to_representation, \
+                CaptureQueriesContext(connection) as ctx:
+            response = self.client_for(self.candidate).get(reverse("job-list") + "?view=compact")
+        self.assertEqual(len(response.data["results"]), 3)
+        to_representation.assert_not_called()
+        self.assertFalse(any('"description"' in query["sql"] for query in ctx.captured_queries))
+
+    def test_renderer_matches_json_renderer(self):
+        data = {
+            "text": "a\u2028b\u2029c ünï", "id": uuid.uuid4(), "amount": Decimal("10.50"),
+            "when": timezone.now(), "day": timezone.localdate(), "items": [1, 2.5, None, True],
+            "lazy": gettext_lazy("Hello"),
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(data, "application/json; indent=4"),
+                         JSONRenderer().render(data, "application/json; indent=4"))
+
+
+class JobExpiryTests(PortalTestCase):
+    def test_sweeper_deactivates_expired_jobs_in_batches(self):
+        past = timezone.now() - timedelta(minutes=1)
+        expired = [self.create_job(expires_at=past) for _ in range(3)]
+        current = self.create_job()
+        forever = self.create_job(expires_at=None)
+        client = self.client_for(self.candidate)
+        self.assertEqual(len(client.get(reverse("job-list")).data["results"]), 5)
+        self.assertEqual(client.post(reverse("apply-job", args=[expired[0].pk]), {}, format="json").status_code, 404)
+
+        self.assertEqual(expire_jobs(batch_size=2), 2)
+        call_command("expire_jobs", batch_size=2, stdout=mock.MagicMock())
+        self.assertEqual(expire_jobs(), 0)
+        self.assertEqual(set(Job.objects.filter(is_active=True)), {current, forever})
+        self.assertFalse(Job.objects.filter(is_active=False, closed_at__isnull=True).exists())
+        results = client.get(reverse("job-list")).data["results"]
+        self.assertEqual({row["id"] for row in results}, {str(current.pk), str(forever.pk)})
+
+    def test_expired_jobs_need_a_new_expiry_to_reopen(self):
+        job = self.create_job()
+        Job.objects.filter(pk=job.pk).update(is_active=False, expires_at=timezone.now() - timedelta(days=1))
+        client = self.client_for(self.employer)
+        url = reverse("job-detail", args=[job.pk])
+        self.assertEqual(client.patch(url, {"is_active": True}, format="json").status_code, 400)
+        expires_at = (timezone.now() + timedelta(days=30)).isoformat()
+        response = client.patch(url, {"is_active": True, "expires_at": expires_at}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_full_update_may_resend_a_past_expiry(self):
+        job = self.create_job()
+        Job.objects.filter(pk=job.pk).update(is_active=False, expires_at=timezone.now() - timedelta(days=1))
+        client = self.client_for(self.employer)
+        url = reverse("job-detail", args=[job.pk])
+        payload = {key: value for key, value in client.get(url).data.items() if value is not None}
+        payload["title"] = "Closed role"
+        response = client.put(url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        payload["expires_at"] = (timezone.now() - timedelta(days=2)).isoformat()
+        self.assertEqual(client.put(url, payload, format="json").status_code, 400)
+
+
+class ApplicationArchiveTests(PortalTestCase):
+    def test_archives_applications_of_long_closed_jobs(self):
+        old_job, recent_job, open_job = self.create_job(), self.create_job(), self.create_job()
+        for index, job in enumerate([old_job, old_job, recent_job, open_job]):
+            Application.objects.create(job=job, applicant=self.create_applicant(index), cover_letter="Hi")
+        Job.objects.filter(pk=old_job.pk).update(is_active=False, closed_at=timezone.now() - timedelta(days=200))
+        recent_job.is_active = False
+        recent_job.save()
+
+        output = io.StringIO()
+        call_command("archive_applications", batch_size=1, stdout=output, stderr=io.StringIO())
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual({row["job_id"] for row in rows}, {str(old_job.pk)})
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["cover_letter"], "Hi")
+
+        self.assertEqual(ApplicationArchive.objects.count(), 2)
+        self.assertFalse(Application.objects.filter(job=old_job).exists())
+        self.assertEqual(Application.objects.count(), 2)
+        old_job.refresh_from_db()
+        self.assertEqual(old_job.applications_count, 0)
+        self.assertFalse(JobApplicationStat.objects.filter(job=old_job).exists())
+
+    def test_closed_at_follows_is_active(self):
+        job = self.create_job()
+        self.assertIsNone(job.closed_at)
+        url = reverse("job-detail", args=[job.pk])
+        client = self.client_for(self.employer)
+        client.patch(url, {"is_active": False}, format="json")
+        job.refresh_from_db()
+        closed_at = job.closed_at
+        self.assertIsNotNone(closed_at)
+
+        # Editing a closed job does not postpone its archival.
+        client.patch(url, {"title": "Closed role"}, format="json")
+        job.refresh_from_db()
+        self.assertEqual(job.closed_at, closed_at)
+        self.assertGreater(job.updated_at, closed_at)
+
+        client.patch(url, {"is_active": True}, format="json")
+        job.refresh_from_db()
+        self.assertIsNone(job.closed_at)
+
+
+class GeoRadiusSearchTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jobs = {location: self.create_job(location=location)
+                     for location in ["Pune", "Mumbai", "Navi Mumbai", "Bangalore (Hybrid)", "Remote"]}
+
+    def nearby(self, query):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_for(self.candidate).get(reverse("job-list") + query)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(any("geo_cell" in query["sql"] for query in ctx.captured_queries))
+        return {row["location"] for row in response.data["results"]}
+
+    def test_locations_are_geocoded_on_save(self):
+        self.assertEqual(geocode("Pune, Maharashtra"), geocode("pune"))
+        job = self.jobs["Bangalore (Hybrid)"]
+        self.assertEqual((job.latitude, job.longitude), geocode("Bengaluru"))
+        self.assertEqual(job.geo_cell, grid_cell(job.latitude, job.longitude))
+        self.assertIsNone(self.jobs["Remote"].geo_cell)
+
+        profile = self.candidate.jobseeker_profile
+        profile.preferred_location = "Bombay"
+        profile.save(update_fields=["preferred_location"])
+        profile.refresh_from_db()
+        self.assertEqual((profile.preferred_latitude, profile.preferred_longitude), geocode("Mumbai"))
+
+    def test_radius_uses_exact_distances(self):
+        mumbai = geocode("Mumbai")
+        navi_mumbai_km = haversine_km(*mumbai, *geocode("Navi Mumbai"))
+        self.assertTrue(10 < navi_mumbai_km < 20)
+        self.assertEqual(self.nearby("?near=%s,%s&radius_km=10" % mumbai), {"Mumbai"})
+        self.assertEqual(self.nearby("?near=%s,%s&radius_km=20" % mumbai), {"Mumbai", "Navi Mumbai"})
+        self.assertEqual(self.nearby("?near=%s,%s&radius_km=150" % mumbai), {"Mumbai", "Navi Mumbai", "Pune"})
+        self.assertEqual(self.nearby("?near=18.52,73.86"), {"Pune"})
+
+    def test_invalid_parameters(self):
+        client = self.client_for(self.candidate)
+        for query in ("?near=north", "?near=95,10", "?radius_km=10", "?near=18.5,73.8&radius_km=5000"):
+            self.assertEqual(client.get(reverse("job-list") + query).status_code, 400, query)
+
+    def test_grid_wraps_around_the_antimeridian(self):
+        cells = cells_within(0.0, 179.9, 50)
+        self.assertIn(grid_cell(0.0, -179.9), cells)
+        self.assertIn(grid_cell(0.0, 179.9), cells)
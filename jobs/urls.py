@@ -3,8 +3,12 @@ from . import views
 
 urlpatterns = [
     path('', views.JobListCreateView.as_view(), name='job-list'),
+    path('import/', views.JobBulkImportView.as_view(), name='job-import'),
+    path('recommended/', views.JobRecommendationView.as_view(), name='job-recommendations'),
     path('<uuid:pk>/', views.JobDetailView.as_view(), name='job-detail'),
     path('<uuid:job_id>/apply/', views.ApplicationCreateView.as_view(), name='apply-job'),
     path('my-applications/', views.UserApplicationListView.as_view(), name='my-applications'),
     path('employer/applications/', views.EmployerApplicationListView.as_view(), name='employer-applications'),
+    path('employer/dashboard/', views.EmployerDashboardView.as_view(), name='employer-dashboard'),
+    path('employer/applications/status/', views.EmployerApplicationBulkStatusView.as_view(), name='employer-applications-status'),
 ]
\ No newline at end of file
@@ -1,65 +1,280 @@
+import uuid
 from rest_framework import generics, permissions, status, serializers
+from rest_framework.exceptions import APIException
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.http import http_date
 from .models import Job, Application
+from .applications import DuplicateApplication, submit_application
+from .detail_cache import JOB_DETAIL_CACHE_TIMEOUT, get_job_validators, job_detail_payload_key
+from .facets import get_job_facets
+from .fastpath import ValuesListMixin
+from .filters import JobFilterSerializer, filter_jobs
+from .importers import ImportFormatError, import_jobs
+from .pagination import JobCursorPagination, JobSearchPagination
 from .permissions import IsJobOwnerOrReadOnly
-from .serializers import JobSerializer, JobDetailSerializer, ApplicationSerializer
-from accounts.models import EmployerProfile
-
-class IsEmployer(permissions.BasePermission):
-    def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.user_type == 'employer'
+from .search import search_jobs
+from .stats import DASHBOARD_DEFAULT_DAYS, DASHBOARD_MAX_DAYS, dashboard_stats, rebuild_job_stats, record_status_changes
+from .recommendations import match_score, recommend_jobs
+from .serializers import (
+    JobSerializer, JobDetailSerializer, JobRecommendationSerializer, ApplicationSerializer,
+    BulkApplicationStatusSerializer, JobDashboardSerializer,
+)
+from accounts.authentication import employer_profile_id
+from accounts.permissions import IsCandidate, IsEmployer
+from accounts.models import EmployerProfile, JobSeekerProfile
+from job_portal.metrics import timed
+from job_portal.replicas import primary_reads
 
 class IsJobOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.employer.user == request.user
+        return obj.employer_id == employer_profile_id(request.user)
 
 
-class JobListCreateView(generics.ListCreateAPIView):
+class JobListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = JobCursorPagination
+    compact_fields = ['id', 'title', 'company_name', 'location', 'job_type', 'salary', 'is_active', 'created_at']
+    always_loaded = ('id', 'created_at')
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.search_query:
+                self._paginator = JobSearchPagination()
+            else:
+                self._paginator = JobCursorPagination()
+        return self._paginator
+
+    @property
+    def search_query(self):
+        return self.request.query_params.get('q', '').strip()
+
+    def paginate_keys_first(self):
+        return bool(self.search_query) or 'near' in self.get_filters()
+
+    def get_filters(self):
+        if not hasattr(self, '_filters'):
+            serializer = JobFilterSerializer(data=self.request.query_params)
+            serializer.is_valid(raise_exception=True)
+            self._filters = serializer.validated_data
+        return self._filters
 
     def get_queryset(self):
         if self.request.user.user_type == 'employer':
-            employer_profile = get_object_or_404(EmployerProfile, user=self.request.user)
-            return Job.objects.filter(employer=employer_profile)
+            employer_id = employer_profile_id(self.request.user)
+            if employer_id is None:
+                raise Http404
+            queryset = Job.objects.select_related('employer').defer('search_vector').filter(employer_id=employer_id)
+            self.facet_scope = f"employer:{employer_id}"
         else:
-            return Job.objects.filter(is_active=True)
+            queryset = Job.objects.select_related('employer').defer('search_vector').filter(is_active=True)
+            self.facet_scope = "active"
+
+        queryset = filter_jobs(queryset, self.get_filters())
+        if self.search_query:
+            queryset = search_jobs(queryset, self.search_query).order_by('-rank', '-created_at', 'id')
+        return self.sparse_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        response = self.serialize_list(queryset)
+
+        params = {**self.get_filters(), 'q': self.search_query}
+        response.data['facets'] = get_job_facets(queryset, self.facet_scope, params)
+        return response
 
     def perform_create(self, serializer):
-        employer_profile = get_object_or_404(EmployerProfile, user=self.request.user)
+        employer_profile = get_object_or_404(EmployerProfile, pk=employer_profile_id(self.request.user))
         serializer.save(employer=employer_profile, company_name=employer_profile.company_name)
 
+class JobRecommendationView(generics.ListAPIView):
+    serializer_class = JobRecommendationSerializer
+    permission_classes = [permissions.IsAuthenticated, IsCandidate]
+    default_limit = 20
+    max_limit = 100
+
+    def get_queryset(self):
+        profile = get_object_or_404(JobSeekerProfile, user=self.request.user)
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return recommend_jobs(profile, limit=min(max(limit, 1), self.max_limit))
+
+class JobBulkImportView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"file": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        employer_profile = get_object_or_404(EmployerProfile, pk=employer_profile_id(request.user))
+        try:
+            report = import_jobs(upload, employer_profile)
+        except ImportFormatError as exc:
+            return Response({"file": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=response_status)
+
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Job.objects.all()
+    queryset = Job.objects.select_related('employer')
     serializer_class = JobDetailSerializer
     permission_classes = [permissions.IsAuthenticated, IsJobOwnerOrReadOnly]
 
+    def retrieve(self, request, *args, **kwargs):
+        # Reads are answered from cached validators and payloads; object
+        # permissions only restrict writes, so skipping get_object() is safe.
+        validators = get_job_validators(kwargs['pk'])
+        if validators is None:
+            raise Http404
+        etag, last_modified = validators
+        last_modified = int(last_modified.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache_key = job_detail_payload_key(kwargs['pk'], etag, request.get_host())
+            data = cache.get(cache_key)
+            if data is None:
+                # Must match the primary's ETag above, so no replica reads.
+                with primary_reads():
+                    job = self.get_object()
+                    with timed("serialize"):
+                        data = self.get_serializer(job).data
+                cache.set(cache_key, data, JOB_DETAIL_CACHE_TIMEOUT)
+            response = Response(data)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     def perform_update(self, serializer):
         serializer.save()
 
+class AlreadyApplied(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "You have already applied for this job."
+    default_code = 'already_applied'
+
 class ApplicationCreateView(generics.CreateAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
         job_id = self.kwargs.get('job_id')
-        job = get_object_or_404(Job, id=job_id, is_active=True)
-        if Application.objects.filter(job=job, applicant=self.request.user).exists():
-            raise serializers.ValidationError("You have already applied for this job.")
-        serializer.save(job=job, applicant=self.request.user)
+        # Expired jobs stay active until the next expire_jobs sweep.
+        open_jobs = Job.objects.filter(Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now()))
+        job = get_object_or_404(open_jobs, id=job_id, is_active=True)
+        profile = JobSeekerProfile.objects.filter(user=self.request.user).first()
+        try:
+            submit_application(serializer, job, self.request.user, match_score=match_score(profile, job))
+        except DuplicateApplication:
+            raise AlreadyApplied
 
-class UserApplicationListView(generics.ListAPIView):
+class UserApplicationListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compact_fields = ['id', 'job_id', 'job_title', 'status', 'match_score', 'applied_at']
 
     def get_queryset(self):
-        return Application.objects.filter(applicant=self.request.user)
+        queryset = Application.objects.select_related('job', 'applicant').filter(applicant=self.request.user)
+        return self.sparse_queryset(queryset)
 
-class EmployerApplicationListView(generics.ListAPIView):
+class EmployerApplicationListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated, IsEmployer]
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['match_score', 'applied_at']
+    ordering = ['-applied_at']
+    compact_fields = ['id', 'job_id', 'job_title', 'applicant_email', 'status', 'match_score', 'applied_at']
 
     def get_queryset(self):
-        employer_profile = get_object_or_404(EmployerProfile, user=self.request.user)
-        return Application.objects.filter(job__employer=employer_profile)
\ No newline at end of file
+        queryset = Application.objects.select_related('job', 'applicant').filter(job__employer_id=employer_profile_id(self.request.user))
+        job_id = self.request.query_params.get('job')
+        if job_id:
+            try:
+                queryset = queryset.filter(job_id=uuid.UUID(job_id))
+            except ValueError:
+                raise serializers.ValidationError({"job": "Must be a valid UUID."})
+        return self.sparse_queryset(queryset)
+
+class EmployerApplicationBulkStatusView(generics.GenericAPIView):
+    serializer_class = BulkApplicationStatusSerializer
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        new_status = data['status']
+
+        # Ownership and the allowed transitions are part of the WHERE clause.
+        jobs = Job.objects.filter(employer_id=employer_profile_id(request.user))
+        queryset = Application.objects.filter(job__in=jobs, status__in=Application.statuses_leading_to(new_status))
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
+        if 'job' in data:
+            jobs = jobs.filter(pk=data['job'])
+            queryset = queryset.filter(job_id=data['job'])
+        if 'from_status' in data:
+            queryset = queryset.filter(status=data['from_status'])
+
+        # One grouped count of the matching rows gives the dashboard stats
+        # deltas, then one UPDATE with the same WHERE moves them.
+        with transaction.atomic():
+            groups = list(
+                queryset.annotate(day=TruncDate('applied_at')).order_by()
+                .values('job_id', 'status', 'day').annotate(total=Count('pk'))
+                .values_list('job_id', 'status', 'day', 'total')
+            )
+            updated = queryset.update(status=new_status, updated_at=timezone.now())
+            if updated == sum(group[-1] for group in groups):
+                record_status_changes(groups, new_status)
+            else:
+                # Applications changed between the two statements; recount instead.
+                rebuild_job_stats(jobs)
+        result = {"updated": updated}
+        if 'ids' in data:
+            result["skipped"] = len(set(data['ids'])) - updated
+        return Response(result, status=status.HTTP_200_OK)
+
+class EmployerDashboardView(generics.ListAPIView):
+    """Per-job application counts by status and a daily trend, read from the JobApplicationStat table."""
+    serializer_class = JobDashboardSerializer
+    permission_classes = [permissions.IsAuthenticated, IsEmployer]
+    pagination_class = JobCursorPagination
+
+    def get_queryset(self):
+        return Job.objects.filter(employer_id=employer_profile_id(self.request.user)).only(
+            'id', 'title', 'is_active', 'applications_count', 'created_at'
+        )
+
+    def get_days(self):
+        try:
+            days = int(self.request.query_params.get('days', DASHBOARD_DEFAULT_DAYS))
+        except ValueError:
+            raise serializers.ValidationError({"days": "Must be an integer."})
+        return min(max(days, 1), DASHBOARD_MAX_DAYS)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        stats = dashboard_stats([job.pk for job in page], days=self.get_days())
+        for job in page:
+            job.status_counts = stats[job.pk]["status_counts"]
+            job.daily = stats[job.pk]["daily"]
+        with timed("serialize"):
+            data = self.get_serializer(page, many=True).data
+        return self.get_paginated_response(data)